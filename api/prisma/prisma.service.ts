@@ -1,19 +1,181 @@
-import { Injectable, OnModuleInit, OnModuleDestroy } from '@nestjs/common';
-import { PrismaClient } from '@prisma/client';
+import { Injectable, Logger, OnModuleInit, OnModuleDestroy } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { Prisma, PrismaClient } from '@prisma/client';
+
+export enum DatabaseRole {
+    WRITER = 'writer',
+    READER = 'reader',
+}
+
+interface PoolOptions {
+    poolSize: number;
+    poolTimeoutSeconds: number;
+    statementTimeoutMs: number;
+}
+
+const LOG_LEVELS: Prisma.LogLevel[] = ['query', 'info', 'warn', 'error'];
+const MAX_TRACKED_SCOPES = 10000;
 
 @Injectable()
 export class PrismaService extends PrismaClient implements OnModuleInit, OnModuleDestroy {
-    constructor() {
+    private readonly logger = new Logger(PrismaService.name);
+    readonly reader: PrismaClient;
+    private readonly replica: boolean;
+    private readonly pools: Record<DatabaseRole, PoolOptions>;
+    private readonly readAfterWrite: number;
+    private readonly maxLag: number;
+    private readonly healthInterval: number;
+    private readonly recentWrites = new Map<number | string, number>();
+    private healthTimer: NodeJS.Timeout | null = null;
+    private replicaHealthy = false;
+    private replicaLagMs: number | null = null;
+    private readerReads = 0;
+    private writerReads = 0;
+    private readYourWrites = 0;
+
+    constructor(private configService: ConfigService) {
+        const pools = {
+            [DatabaseRole.WRITER]: poolOptions(configService, 'WRITE', 10, 60000),
+            [DatabaseRole.READER]: poolOptions(configService, 'READ', 5, 15000),
+        };
+        const primaryUrl = configService.get<string>('DATABASE_URL');
+        const readUrl = configService.get<string>('DATABASE_READ_URL', '');
         super({
-            log: ['query', 'info', 'warn', 'error'],
+            log: LOG_LEVELS,
+            datasources: primaryUrl ? { db: { url: withPool(primaryUrl, pools[DatabaseRole.WRITER]) } } : undefined,
         });
+        this.pools = pools;
+        this.replica = !!readUrl;
+        this.reader = readUrl || primaryUrl
+            ? new PrismaClient({
+                log: LOG_LEVELS,
+                datasources: { db: { url: withPool(readUrl || primaryUrl!, pools[DatabaseRole.READER]) } },
+            })
+            : this;
+        this.readAfterWrite = Number(this.configService.get<string>('DATABASE_READ_AFTER_WRITE_MS', '5000')) || 0;
+        this.maxLag = Number(this.configService.get<string>('DATABASE_READ_MAX_LAG_MS', '5000')) || 5000;
+        this.healthInterval = Number(this.configService.get<string>('DATABASE_READ_HEALTH_MS', '5000')) || 5000;
     }
 
     async onModuleInit() {
         await this.$connect();
+        if (!this.replica) {
+            return;
+        }
+        await this.checkReplica();
+        this.healthTimer = setInterval(() => void this.checkReplica(), this.healthInterval);
+        this.healthTimer.unref();
     }
 
     async onModuleDestroy() {
+        if (this.healthTimer) {
+            clearInterval(this.healthTimer);
+            this.healthTimer = null;
+        }
+        if (this.reader !== this) {
+            await this.reader.$disconnect();
+        }
         await this.$disconnect();
     }
+
+    read(scope?: number | string): PrismaClient {
+        if (this.replica && !this.replicaHealthy) {
+            this.writerReads++;
+            return this;
+        }
+        if (this.replica && scope !== undefined && this.wroteRecently(scope)) {
+            this.readYourWrites++;
+            this.writerReads++;
+            return this;
+        }
+        this.readerReads++;
+        return this.reader;
+    }
+
+    staleness(client: PrismaClient): number {
+        return this.replica && client === this.reader ? this.maxLag : 0;
+    }
+
+    recordWrite(scope: number | string | null | undefined) {
+        if (!this.replica || this.readAfterWrite <= 0 || scope === null || scope === undefined) {
+            return;
+        }
+        const now = Date.now();
+        this.recentWrites.delete(scope);
+        this.recentWrites.set(scope, now);
+        for (const [tracked, writtenAt] of this.recentWrites) {
+            if (this.recentWrites.size <= MAX_TRACKED_SCOPES && writtenAt >= now - this.readAfterWrite) {
+                break;
+            }
+            this.recentWrites.delete(tracked);
+        }
+    }
+
+    getStats() {
+        return {
+            replica: this.replica,
+            replicaHealthy: this.replica ? this.replicaHealthy : null,
+            replicaLagMs: this.replicaLagMs,
+            maxLagMs: this.maxLag,
+            readAfterWriteMs: this.readAfterWrite,
+            pools: this.pools,
+            readerReads: this.readerReads,
+            writerReads: this.writerReads,
+            readYourWrites: this.readYourWrites,
+            trackedScopes: this.recentWrites.size,
+        };
+    }
+
+    private wroteRecently(scope: number | string) {
+        const writtenAt = this.recentWrites.get(scope);
+        return writtenAt !== undefined && writtenAt >= Date.now() - this.readAfterWrite;
+    }
+
+    private async checkReplica() {
+        let healthy = false;
+        try {
+            const [row] = await this.reader.$queryRaw<{ lagMs: number }[]>`
+                SELECT CASE
+                    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE COALESCE(EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp()) * 1000, 0)
+                END::float8 AS "lagMs"
+            `;
+            this.replicaLagMs = Math.round(row.lagMs);
+            healthy = this.replicaLagMs <= this.maxLag;
+        } catch (error: any) {
+            this.replicaLagMs = null;
+            if (this.replicaHealthy) {
+                this.logger.error(`Read replica unreachable: ${error.message}`);
+            }
+        }
+        if (healthy !== this.replicaHealthy) {
+            this.logger.warn(healthy
+                ? 'Routing reads to the read replica'
+                : `Routing reads to the primary (replica lag ${this.replicaLagMs ?? 'unknown'} ms)`);
+        }
+        this.replicaHealthy = healthy;
+    }
+}
+
+function poolOptions(configService: ConfigService, role: string, poolSize: number, statementTimeoutMs: number): PoolOptions {
+    return {
+        poolSize: Number(configService.get<string>(`DATABASE_${role}_POOL_SIZE`, String(poolSize))) || poolSize,
+        poolTimeoutSeconds: Number(configService.get<string>('DATABASE_POOL_TIMEOUT_S', '10')) || 10,
+        statementTimeoutMs: Number(configService.get<string>(`DATABASE_${role}_STATEMENT_TIMEOUT_MS`, String(statementTimeoutMs))) || 0,
+    };
+}
+
+function withPool(url: string, pool: PoolOptions): string {
+    const parsed = new URL(url);
+    const params: [string, string | null][] = [
+        ['connection_limit', String(pool.poolSize)],
+        ['pool_timeout', String(pool.poolTimeoutSeconds)],
+        ['options', pool.statementTimeoutMs > 0 ? `-c statement_timeout=${pool.statementTimeoutMs}` : null],
+    ];
+    for (const [name, value] of params) {
+        if (value !== null && !parsed.searchParams.has(name)) {
+            parsed.searchParams.set(name, value);
+        }
+    }
+    return parsed.toString();
 }
@@ -1,12 +1,11 @@
 import { Module } from '@nestjs/common';
 import { ApiKeyController } from './apikey.controller';
 import { ApiKeyService } from './apikey.service';
-import { PrismaService } from '../../prisma/prisma.service';
 import { AuthService } from 'src/auth/auth.service';
 
 @Module({
     controllers: [ApiKeyController],
-    providers: [ApiKeyService, AuthService, PrismaService],
+    providers: [ApiKeyService, AuthService],
     exports: [ApiKeyService],
 })
 export class ApiKeyModule {}
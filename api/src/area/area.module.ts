@@ -5,7 +5,6 @@ import { AreaController } from './area.controller';
 import { AreaService } from './area.service';
 import { AuthService } from '../auth/auth.service';
 import { CredentialsService } from '../credentials/credentials.service';
-import { PrismaService } from '../../prisma/prisma.service';
 
 @Module({
     imports: [
@@ -20,6 +19,6 @@ import { PrismaService } from '../../prisma/prisma.service';
         }),
     ],
     controllers: [AreaController],
-    providers: [AreaService, AuthService, CredentialsService, PrismaService],
+    providers: [AreaService, AuthService, CredentialsService],
 })
 export class AreaModule {}
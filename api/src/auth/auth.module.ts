@@ -4,8 +4,8 @@ import { AuthController } from './auth.controller';
 import { AuthService } from './auth.service';
 import { ServiceAuthController } from './service-auth.controller';
 import { ServiceAuthService } from './service-auth.service';
-import { PrismaService } from '../../prisma/prisma.service';
 import { HttpModule } from '@nestjs/axios';
+import { ExecutionModule } from '../execution/execution.module';
 
 @Module({
     imports: [
@@ -14,10 +14,11 @@ import { HttpModule } from '@nestjs/axios';
             secret: process.env.JWT_SECRET,
             signOptions: { expiresIn: '1d' },
         }),
-        HttpModule
+        HttpModule,
+        ExecutionModule,
     ],
     controllers: [AuthController, ServiceAuthController],
-    providers: [AuthService, ServiceAuthService, PrismaService],
+    providers: [AuthService, ServiceAuthService],
     exports: [AuthService, ServiceAuthService],
 })
 export class AuthModule {}
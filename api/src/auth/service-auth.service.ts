@@ -5,6 +5,7 @@ import * as bcrypt from 'bcrypt';
 import { PrismaService } from '../../prisma/prisma.service';
 import { ServiceLoginDto } from './dto/service-auth.dto';
 import { firstValueFrom } from 'rxjs';
+import { ExecutionPlanService } from '../execution/execution-plan.service';
 
 @Injectable()
 export class ServiceAuthService {
@@ -14,6 +15,7 @@ export class ServiceAuthService {
         private prisma: PrismaService,
         private jwtService: JwtService,
         private httpService: HttpService,
+        private executionPlans: ExecutionPlanService,
     ) { }
 
     async login(loginDto: ServiceLoginDto) {
@@ -50,6 +52,7 @@ export class ServiceAuthService {
                     isActive: true,
                 }
             });
+            this.executionPlans.invalidateAll();
         } else {
             service = await this.prisma.service.create({
                 data: {
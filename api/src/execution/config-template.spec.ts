@@ -0,0 +1,46 @@
+import { compileTemplate } from './config-template';
+
+describe('compileTemplate', () => {
+  const input = { author: { name: 'Ada', id: 7 }, text: 'hello "world"', count: 3, tags: ['a'] };
+
+  it('returns static configs by reference', () => {
+    const conf = { channel: 'general', options: { silent: true } };
+    const template = compileTemplate(conf);
+    expect(template.dynamic).toBe(false);
+    expect(template.render(input)).toBe(conf);
+    expect(compileTemplate(null).render(input)).toBe(null);
+  });
+
+  it('renders flat and nested placeholders', () => {
+    const template = compileTemplate({
+      message: '${text} from ${author.name}',
+      userId: '${input.author.id}',
+      count: '${count}',
+      tags: '${tags}',
+    });
+    expect(template.render(input)).toEqual({
+      message: 'hello "world" from Ada',
+      userId: '7',
+      count: '3',
+      tags: '["a"]',
+    });
+  });
+
+  it('keeps unresolved placeholders as written', () => {
+    expect(compileTemplate('Hi ${missing.name}!').render(input)).toBe('Hi ${missing.name}!');
+  });
+
+  it('copies only containers that hold placeholders', () => {
+    const conf = { static: { deep: [1, 2] }, rows: [['${author.name}'], ['fixed']] };
+    const rendered = compileTemplate(conf).render(input);
+    expect(rendered.static).toBe(conf.static);
+    expect(rendered.rows[1]).toBe(conf.rows[1]);
+    expect(rendered.rows[0]).toEqual(['Ada']);
+    expect(conf.rows[0]).toEqual(['${author.name}']);
+  });
+
+  it('does not read inherited properties', () => {
+    expect(compileTemplate('${constructor}').render({})).toBe('${constructor}');
+    expect(compileTemplate('${toString}').render({})).toBe('${toString}');
+  });
+});
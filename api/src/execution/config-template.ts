@@ -0,0 +1,129 @@
+export interface ConfigTemplate {
+    readonly dynamic: boolean;
+    render(input: any): any;
+}
+
+type Slot = (input: any) => string | undefined;
+
+const PLACEHOLDER = /\$\{([^}]+)\}/g;
+const FORBIDDEN_KEYS = new Set(['__proto__', 'prototype', 'constructor']);
+
+const staticTemplate = (value: any): ConfigTemplate => ({
+    dynamic: false,
+    render: () => value,
+});
+
+function readOwn(target: any, key: string): any {
+    if (target === null || target === undefined || FORBIDDEN_KEYS.has(key)) {
+        return undefined;
+    }
+    if (typeof target !== 'object' && typeof target !== 'string') {
+        return undefined;
+    }
+    return Object.prototype.hasOwnProperty.call(target, key) ? target[key] : undefined;
+}
+
+function stringify(value: any): string {
+    if (typeof value === 'string') {
+        return value;
+    }
+    if (value !== null && typeof value === 'object') {
+        return JSON.stringify(value);
+    }
+    return String(value);
+}
+
+function compileSlot(expression: string): Slot {
+    const key = expression.trim();
+    const segments = key.split('.').map(segment => segment.trim());
+    const nested = segments[0] === 'input' && segments.length > 1 ? segments.slice(1) : null;
+    return input => {
+        let value = readOwn(input, key);
+        if (value === undefined && segments.length > 1) {
+            value = input;
+            for (const segment of segments) {
+                value = readOwn(value, segment);
+            }
+            if (value === undefined && nested && readOwn(input, 'input') === undefined) {
+                value = input;
+                for (const segment of nested) {
+                    value = readOwn(value, segment);
+                }
+            }
+        }
+        return value === undefined ? undefined : stringify(value);
+    };
+}
+
+function compileString(source: string): ConfigTemplate {
+    if (!source.includes('${')) {
+        return staticTemplate(source);
+    }
+    const literals: string[] = [];
+    const slots: Slot[] = [];
+    const raw: string[] = [];
+    let last = 0;
+    for (const match of source.matchAll(PLACEHOLDER)) {
+        literals.push(source.slice(last, match.index));
+        slots.push(compileSlot(match[1]));
+        raw.push(match[0]);
+        last = match.index! + match[0].length;
+    }
+    if (slots.length === 0) {
+        return staticTemplate(source);
+    }
+    literals.push(source.slice(last));
+    return {
+        dynamic: true,
+        render: input => {
+            let rendered = literals[0];
+            for (let i = 0; i < slots.length; i++) {
+                rendered += (slots[i](input) ?? raw[i]) + literals[i + 1];
+            }
+            return rendered;
+        },
+    };
+}
+
+export function compileTemplate(config: any): ConfigTemplate {
+    if (typeof config === 'string') {
+        return compileString(config);
+    }
+    if (Array.isArray(config)) {
+        const items = config
+            .map((value, index) => [index, compileTemplate(value)] as const)
+            .filter(([, template]) => template.dynamic);
+        if (items.length === 0) {
+            return staticTemplate(config);
+        }
+        return {
+            dynamic: true,
+            render: input => {
+                const rendered = config.slice();
+                for (const [index, template] of items) {
+                    rendered[index] = template.render(input);
+                }
+                return rendered;
+            },
+        };
+    }
+    if (config !== null && typeof config === 'object') {
+        const fields = Object.entries(config)
+            .map(([key, value]) => [key, compileTemplate(value)] as const)
+            .filter(([, template]) => template.dynamic);
+        if (fields.length === 0) {
+            return staticTemplate(config);
+        }
+        return {
+            dynamic: true,
+            render: input => {
+                const rendered = { ...config };
+                for (const [key, template] of fields) {
+                    rendered[key] = template.render(input);
+                }
+                return rendered;
+            },
+        };
+    }
+    return staticTemplate(config);
+}
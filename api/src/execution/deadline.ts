@@ -0,0 +1,29 @@
+export interface Deadline {
+    signal: AbortSignal;
+    clear: () => void;
+}
+
+export function abortReason(signal: AbortSignal): string {
+    const reason = signal.reason;
+    return reason instanceof Error ? reason.message : String(reason ?? 'Execution aborted');
+}
+
+export function withDeadline(parent: AbortSignal | undefined, ms: number, message: string): Deadline {
+    const controller = new AbortController();
+    if (parent?.aborted) {
+        controller.abort(parent.reason);
+        return { signal: controller.signal, clear: () => undefined };
+    }
+    const onParentAbort = () => controller.abort(parent!.reason);
+    parent?.addEventListener('abort', onParentAbort, { once: true });
+    const timer = ms > 0 ? setTimeout(() => controller.abort(new Error(message)), ms) : null;
+    return {
+        signal: controller.signal,
+        clear: () => {
+            if (timer) {
+                clearTimeout(timer);
+            }
+            parent?.removeEventListener('abort', onParentAbort);
+        },
+    };
+}
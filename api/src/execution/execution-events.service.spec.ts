@@ -0,0 +1,51 @@
+import { ConfigService } from '@nestjs/config';
+import { ExecutionEvent, ExecutionEventsService } from './execution-events.service';
+
+describe('ExecutionEventsService', () => {
+  const config = (buffer: string) => ({
+    get: (key: string, fallback: string) => (key === 'EXECUTION_STREAM_BUFFER' ? buffer : fallback),
+  } as unknown as ConfigService);
+
+  const event = (executionId: number, nodeId: number): ExecutionEvent => ({
+    type: 'node.started',
+    executionId,
+    nodeId,
+    at: new Date(0).toISOString(),
+  });
+
+  it('delivers events only to subscribers of the same execution', async () => {
+    const service = new ExecutionEventsService(config('10'));
+    const first = service.subscribe(1);
+    const second = service.subscribe(2);
+    service.publish(event(1, 10));
+    service.publish(event(2, 20));
+    service.publish(event(3, 30));
+    expect((await first.next())!.events.map(e => e.nodeId)).toEqual([10]);
+    expect((await second.next())!.events.map(e => e.nodeId)).toEqual([20]);
+    expect(service.getStats()).toMatchObject({ streamedExecutions: 2, subscriptions: 2, published: 2 });
+  });
+
+  it('drops the oldest events when a subscriber falls behind', async () => {
+    const service = new ExecutionEventsService(config('3'));
+    const subscription = service.subscribe(1);
+    for (let nodeId = 1; nodeId <= 5; nodeId++) {
+      service.publish(event(1, nodeId));
+    }
+    const batch = await subscription.next();
+    expect(batch!.dropped).toBe(2);
+    expect(batch!.events.map(e => e.nodeId)).toEqual([3, 4, 5]);
+    expect(service.getStats().dropped).toBe(2);
+  });
+
+  it('wakes a waiting subscriber and ends the stream once closed', async () => {
+    const service = new ExecutionEventsService(config('10'));
+    const subscription = service.subscribe(1);
+    const pending = subscription.next();
+    service.publish(event(1, 7));
+    expect((await pending)!.events.map(e => e.nodeId)).toEqual([7]);
+    const ended = subscription.next();
+    subscription.close();
+    expect(await ended).toBe(null);
+    expect(service.getStats()).toMatchObject({ streamedExecutions: 0, subscriptions: 0 });
+  });
+});
@@ -0,0 +1,136 @@
+import { Injectable } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+
+export type ExecutionEventType = 'run.started' | 'node.started' | 'node.finished' | 'run.finished';
+
+export interface ExecutionEvent {
+    type: ExecutionEventType;
+    executionId: number;
+    at: string;
+    nodeId?: number;
+    status?: string;
+    channel?: string | null;
+    errorMessage?: string;
+    durationMs?: number | null;
+}
+
+export interface ExecutionEventBatch {
+    events: ExecutionEvent[];
+    dropped: number;
+}
+
+export class ExecutionEventSubscription {
+    private buffer: ExecutionEvent[] = [];
+    private dropped = 0;
+    private waiter: (() => void) | null = null;
+    private closed = false;
+
+    constructor(
+        readonly executionId: number,
+        private readonly limit: number,
+        private readonly onClose: (subscription: ExecutionEventSubscription) => void,
+        private readonly onDrop: () => void,
+    ) { }
+
+    push(event: ExecutionEvent) {
+        if (this.closed) {
+            return;
+        }
+        if (this.buffer.length >= this.limit) {
+            this.buffer.shift();
+            this.dropped++;
+            this.onDrop();
+        }
+        this.buffer.push(event);
+        this.wake();
+    }
+
+    async next(): Promise<ExecutionEventBatch | null> {
+        while (this.buffer.length === 0 && !this.closed) {
+            await new Promise<void>(resolve => {
+                this.waiter = resolve;
+            });
+        }
+        if (this.buffer.length === 0) {
+            return null;
+        }
+        const batch = { events: this.buffer, dropped: this.dropped };
+        this.buffer = [];
+        this.dropped = 0;
+        return batch;
+    }
+
+    close() {
+        if (this.closed) {
+            return;
+        }
+        this.closed = true;
+        this.onClose(this);
+        this.wake();
+    }
+
+    private wake() {
+        const waiter = this.waiter;
+        this.waiter = null;
+        waiter?.();
+    }
+}
+
+@Injectable()
+export class ExecutionEventsService {
+    private readonly subscribers = new Map<number, Set<ExecutionEventSubscription>>();
+    private readonly bufferSize: number;
+    readonly heartbeatMs: number;
+    private published = 0;
+    private dropped = 0;
+
+    constructor(private configService: ConfigService) {
+        this.bufferSize = Number(this.configService.get<string>('EXECUTION_STREAM_BUFFER', '256')) || 256;
+        this.heartbeatMs = Number(this.configService.get<string>('EXECUTION_STREAM_HEARTBEAT_MS', '15000')) || 15000;
+    }
+
+    publish(event: ExecutionEvent) {
+        const subscriptions = this.subscribers.get(event.executionId);
+        if (!subscriptions) {
+            return;
+        }
+        this.published++;
+        for (const subscription of subscriptions) {
+            subscription.push(event);
+        }
+    }
+
+    subscribe(executionId: number): ExecutionEventSubscription {
+        const subscription = new ExecutionEventSubscription(
+            executionId,
+            this.bufferSize,
+            closed => {
+                const subscriptions = this.subscribers.get(executionId);
+                subscriptions?.delete(closed);
+                if (subscriptions?.size === 0) {
+                    this.subscribers.delete(executionId);
+                }
+            },
+            () => this.dropped++,
+        );
+        const subscriptions = this.subscribers.get(executionId) ?? new Set();
+        subscriptions.add(subscription);
+        this.subscribers.set(executionId, subscriptions);
+        return subscription;
+    }
+
+    getStats() {
+        let subscriptions = 0;
+        for (const set of this.subscribers.values()) {
+            subscriptions += set.size;
+        }
+        return {
+            bufferSize: this.bufferSize,
+            heartbeatMs: this.heartbeatMs,
+            streamedExecutions: this.subscribers.size,
+            subscriptions,
+            published: this.published,
+            dropped: this.dropped,
+        };
+    }
+}
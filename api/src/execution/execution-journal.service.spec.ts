@@ -0,0 +1,74 @@
+import { ConfigService } from '@nestjs/config';
+import { PrismaService } from '../../prisma/prisma.service';
+import { ExecutionStatus } from '../nodes/dto/node.dto';
+import { ExecutionEventsService } from './execution-events.service';
+import { ExecutionJournalService } from './execution-journal.service';
+import { ReplicaService } from './replica.service';
+
+describe('ExecutionJournalService', () => {
+  const config = { get: (_key: string, fallback: string) => fallback } as unknown as ConfigService;
+  const events = { publish: () => undefined } as unknown as ExecutionEventsService;
+  const replica = { id: 'replica-1' } as unknown as ReplicaService;
+
+  it('keeps unflushed history when a flush transaction fails', async () => {
+    const transactions: any[][] = [];
+    let failures = 1;
+    const prisma = {
+      nodeExecution: { createMany: (args: any) => ({ op: 'nodeExecution.createMany', args }) },
+      node: { updateMany: (args: any) => ({ op: 'node.updateMany', args }) },
+      workflowExecution: { updateMany: (args: any) => ({ op: 'workflowExecution.updateMany', args }) },
+      $transaction: async (operations: any[]) => {
+        transactions.push(operations);
+        if (failures-- > 0) {
+          throw new Error('connection reset');
+        }
+        return operations.map(() => ({ count: 1 }));
+      },
+    } as unknown as PrismaService;
+    const journal = new ExecutionJournalService(prisma, config, events, replica);
+
+    const run = journal.attach(7, 3);
+    run.startedAt = new Date();
+    const entry = journal.startNode(run, 11);
+    await journal.completeNode(run, entry, { status: ExecutionStatus.SUCCESS, output: { ok: true }, logs: '', executionChannel: 'success' }, true);
+    await journal.complete(run, ExecutionStatus.SUCCESS);
+    await journal.release(run);
+
+    expect(transactions.length).toBe(1);
+    expect(journal.attach(7, 3)).toBe(run);
+    await journal.release(run);
+
+    expect(transactions.length).toBe(2);
+    const [rows, stats, execution] = transactions[1];
+    expect(rows.op).toBe('nodeExecution.createMany');
+    expect(rows.args.data.map((row: any) => row.nodeId)).toEqual([11]);
+    expect(stats.op).toBe('node.updateMany');
+    expect(stats.args.data.executionCount).toEqual({ increment: 1 });
+    expect(execution.op).toBe('workflowExecution.updateMany');
+    expect(execution.args.data.status).toBe(ExecutionStatus.SUCCESS);
+  });
+
+  it('only checkpoints in-flight reactions eagerly in node durability', async () => {
+    let transactions = 0;
+    const prisma = {
+      workflowExecution: { updateMany: (args: any) => args },
+      $transaction: async (operations: any[]) => {
+        transactions++;
+        return operations.map(() => ({ count: 1 }));
+      },
+    } as unknown as PrismaService;
+    const nodeConfig = { get: (key: string, fallback: string) => (key === 'EXECUTION_JOURNAL_DURABILITY' ? 'node' : fallback) } as unknown as ConfigService;
+
+    for (const [settings, expected] of [[config, 0], [nodeConfig, 1]] as const) {
+      transactions = 0;
+      const journal = new ExecutionJournalService(prisma, settings, events, replica);
+      const run = journal.attach(9, 3);
+      const segment = journal.beginSegment(run, 11, { snapshot: () => [] } as any);
+      const [item] = journal.schedule(run, segment, [{ nodeId: 11, input: {}, depth: 0 }]);
+      await journal.markInFlight(run, item);
+      expect(item.inFlight).toBe(true);
+      expect(run.checkpointDirty).toBe(expected === 0);
+      expect(transactions).toBe(expected);
+    }
+  });
+});
@@ -0,0 +1,716 @@
+import { Injectable, Logger, OnModuleInit, OnModuleDestroy, OnApplicationBootstrap } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { Prisma } from '@prisma/client';
+import { PrismaService } from '../../prisma/prisma.service';
+import { ExecutionStatus } from '../nodes/dto/node.dto';
+import { ExecutionEventsService } from './execution-events.service';
+import { BarrierNodeSnapshot, JoinBarrier, JoinInput } from './join-barrier';
+import { ReplicaService } from './replica.service';
+
+export enum JournalDurability {
+    NODE = 'node',
+    RUN = 'run',
+}
+
+export interface JournalNodeEntry {
+    nodeId: number;
+    executionId: number;
+    status: ExecutionStatus;
+    startedAt: Date;
+    completedAt: Date | null;
+    output: any;
+    logs: string | null;
+    executionChannel: string | null;
+}
+
+export interface CheckpointItem {
+    key: number;
+    nodeId: number;
+    input: any;
+    joinInputs?: JoinInput[];
+    depth: number;
+    inFlight?: boolean;
+    interrupted?: boolean;
+}
+
+export interface JournalSegment {
+    id: number;
+    rootNodeId: number;
+    barrier: JoinBarrier;
+    frontier: Map<number, CheckpointItem>;
+    steps: number;
+}
+
+export interface ExecutionCheckpoint {
+    segments: {
+        rootNodeId: number;
+        steps: number;
+        barrier: BarrierNodeSnapshot[];
+        frontier: CheckpointItem[];
+    }[];
+}
+
+export interface ResumableExecution {
+    executionId: number;
+    workflowId: number;
+    startedAt: Date;
+    checkpoint: ExecutionCheckpoint;
+}
+
+type ResumeListener = (execution: ResumableExecution) => Promise<unknown>;
+
+export interface JournalRun {
+    executionId: number;
+    workflowId: number;
+    entries: JournalNodeEntry[];
+    unflushed: JournalNodeEntry[];
+    nodeStats: Map<number, { count: number; lastExecuted: Date }>;
+    completion: { status: ExecutionStatus; completedAt: Date; durationMs: number | null; errorMessage?: string } | null;
+    startedAt: Date | null;
+    pending: number;
+    pendingDirty: boolean;
+    finalized: boolean;
+    refs: number;
+    abort: AbortController;
+    segments: Map<number, JournalSegment>;
+    nextKey: number;
+    checkpointDirty: boolean;
+    flushing: Promise<boolean>;
+    owned: boolean;
+    fenced: boolean;
+}
+
+export const CANCELLED_MESSAGE = 'Execution cancelled';
+export const LEASE_LOST_MESSAGE = 'Execution was taken over by another replica';
+
+@Injectable()
+export class ExecutionJournalService implements OnModuleInit, OnApplicationBootstrap, OnModuleDestroy {
+    private readonly logger = new Logger(ExecutionJournalService.name);
+    private readonly runs = new Map<number, JournalRun>();
+    private readonly durability: JournalDurability;
+    private readonly flushInterval: number;
+    private readonly staleAfter: number;
+    private readonly cancelPollInterval: number;
+    private readonly heartbeatInterval: number;
+    private readonly resumeAfter: number;
+    private readonly maxResumes: number;
+    private resumeListener: ResumeListener | null = null;
+    private flushTimer: NodeJS.Timeout | null = null;
+    private recoveryTimer: NodeJS.Timeout | null = null;
+    private cancelTimer: NodeJS.Timeout | null = null;
+    private heartbeatTimer: NodeJS.Timeout | null = null;
+    private flushedRows = 0;
+    private flushes = 0;
+    private completedRuns = 0;
+    private recoveredRuns = 0;
+    private cancelledRuns = 0;
+    private resumedRuns = 0;
+    private lastRecoveryMs: number | null = null;
+    private maxRecoveryMs = 0;
+    private totalRecoveryMs = 0;
+    private lostLeases = 0;
+
+    constructor(
+        private prisma: PrismaService,
+        private configService: ConfigService,
+        private events: ExecutionEventsService,
+        private replica: ReplicaService,
+    ) {
+        const durability = this.configService.get<string>('EXECUTION_JOURNAL_DURABILITY', JournalDurability.RUN);
+        this.durability = durability === JournalDurability.NODE ? JournalDurability.NODE : JournalDurability.RUN;
+        this.flushInterval = Number(this.configService.get<string>('EXECUTION_JOURNAL_FLUSH_MS', '1000')) || 1000;
+        this.staleAfter = Number(this.configService.get<string>('EXECUTION_STALE_MS', '900000')) || 900000;
+        this.cancelPollInterval = Number(this.configService.get<string>('EXECUTION_CANCEL_POLL_MS', '1000')) || 1000;
+        this.heartbeatInterval = Number(this.configService.get<string>('EXECUTION_HEARTBEAT_MS', '10000')) || 10000;
+        this.resumeAfter = Math.max(
+            Number(this.configService.get<string>('EXECUTION_RESUME_AFTER_MS', '30000')) || 30000,
+            2 * this.heartbeatInterval,
+        );
+        this.maxResumes = Number(this.configService.get<string>('EXECUTION_MAX_RESUMES', '3')) || 0;
+    }
+
+    onModuleInit() {
+        this.flushTimer = setInterval(() => {
+            this.flushAll().catch((error: any) => {
+                this.logger.error(`Journal flush failed: ${error.message}`);
+            });
+        }, this.flushInterval);
+        this.flushTimer.unref();
+    }
+
+    onApplicationBootstrap() {
+        const recover = () => {
+            this.recoverStale().catch((error: any) => {
+                this.logger.error(`Stale execution recovery failed: ${error.message}`);
+            });
+        };
+        recover();
+        this.recoveryTimer = setInterval(recover, Math.min(this.resumeAfter, Math.max(60000, Math.floor(this.staleAfter / 2))));
+        this.recoveryTimer.unref();
+        this.cancelTimer = setInterval(() => {
+            this.pollCancellations().catch((error: any) => {
+                this.logger.error(`Cancellation poll failed: ${error.message}`);
+            });
+        }, this.cancelPollInterval);
+        this.cancelTimer.unref();
+        this.heartbeatTimer = setInterval(() => {
+            this.heartbeat().catch((error: any) => {
+                this.logger.error(`Execution heartbeat failed: ${error.message}`);
+            });
+        }, this.heartbeatInterval);
+        this.heartbeatTimer.unref();
+    }
+
+    async onModuleDestroy() {
+        if (this.flushTimer) {
+            clearInterval(this.flushTimer);
+            this.flushTimer = null;
+        }
+        if (this.recoveryTimer) {
+            clearInterval(this.recoveryTimer);
+            this.recoveryTimer = null;
+        }
+        if (this.cancelTimer) {
+            clearInterval(this.cancelTimer);
+            this.cancelTimer = null;
+        }
+        if (this.heartbeatTimer) {
+            clearInterval(this.heartbeatTimer);
+            this.heartbeatTimer = null;
+        }
+        await this.flushAll();
+    }
+
+    async open(workflowId: number, triggerNodeId: number, triggerJobId?: number): Promise<JournalRun> {
+        const workflowExecution = await this.prisma.workflowExecution.create({
+            data: {
+                workflowId,
+                triggeredBy: triggerNodeId,
+                status: ExecutionStatus.RUNNING,
+                pendingWork: 1,
+                heartbeatAt: new Date(),
+                triggerJobId,
+                ownerId: this.replica.id,
+            },
+        });
+        const run = this.attach(workflowExecution.id, workflowId, true);
+        run.startedAt = workflowExecution.startedAt;
+        this.events.publish({
+            type: 'run.started',
+            executionId: run.executionId,
+            at: workflowExecution.startedAt.toISOString(),
+        });
+        return run;
+    }
+
+    attach(executionId: number, workflowId: number, owned = false): JournalRun {
+        let run = this.runs.get(executionId);
+        if (!run) {
+            run = {
+                executionId,
+                workflowId,
+                entries: [],
+                unflushed: [],
+                nodeStats: new Map(),
+                completion: null,
+                startedAt: null,
+                pending: 0,
+                pendingDirty: false,
+                finalized: false,
+                refs: 0,
+                abort: new AbortController(),
+                segments: new Map(),
+                nextKey: 0,
+                checkpointDirty: false,
+                flushing: Promise.resolve(true),
+                owned,
+                fenced: false,
+            };
+            this.runs.set(executionId, run);
+        }
+        run.owned ||= owned;
+        run.refs++;
+        return run;
+    }
+
+    async startedByJob(triggerJobId: number): Promise<Map<number, number>> {
+        const executions = await this.prisma.workflowExecution.findMany({
+            where: { triggerJobId },
+            select: { id: true, triggeredBy: true },
+        });
+        return new Map(executions.map(execution => [execution.triggeredBy, execution.id]));
+    }
+
+    onResume(listener: ResumeListener) {
+        this.resumeListener = listener;
+    }
+
+    beginSegment(run: JournalRun, rootNodeId: number, barrier: JoinBarrier, steps = 0): JournalSegment {
+        const segment: JournalSegment = { id: run.nextKey++, rootNodeId, barrier, frontier: new Map(), steps };
+        run.segments.set(segment.id, segment);
+        return segment;
+    }
+
+    endSegment(run: JournalRun, segment: JournalSegment) {
+        run.segments.delete(segment.id);
+        run.checkpointDirty = true;
+    }
+
+    schedule(run: JournalRun, segment: JournalSegment, items: Omit<CheckpointItem, 'key'>[]): CheckpointItem[] {
+        run.checkpointDirty = true;
+        return items.map(item => {
+            const scheduled = { ...item, key: run.nextKey++ };
+            segment.frontier.set(scheduled.key, scheduled);
+            return scheduled;
+        });
+    }
+
+    advance(run: JournalRun, segment: JournalSegment, item: CheckpointItem, next: Omit<CheckpointItem, 'key' | 'depth'>[]): CheckpointItem[] {
+        this.settle(run, segment, item);
+        segment.steps++;
+        return this.schedule(run, segment, next.map(entry => ({ ...entry, depth: item.depth + 1 })));
+    }
+
+    settle(run: JournalRun, segment: JournalSegment, item: CheckpointItem) {
+        segment.frontier.delete(item.key);
+        run.checkpointDirty = true;
+    }
+
+    async markInFlight(run: JournalRun, item: CheckpointItem) {
+        item.inFlight = true;
+        run.checkpointDirty = true;
+        if (this.durability === JournalDurability.NODE) {
+            await this.flush(run);
+        }
+    }
+
+    startNode(run: JournalRun, nodeId: number): JournalNodeEntry {
+        const entry: JournalNodeEntry = {
+            nodeId,
+            executionId: run.executionId,
+            status: ExecutionStatus.RUNNING,
+            startedAt: new Date(),
+            completedAt: null,
+            output: null,
+            logs: null,
+            executionChannel: null,
+        };
+        run.entries.push(entry);
+        this.events.publish({
+            type: 'node.started',
+            executionId: run.executionId,
+            at: entry.startedAt.toISOString(),
+            nodeId,
+        });
+        return entry;
+    }
+
+    async completeNode(
+        run: JournalRun,
+        entry: JournalNodeEntry,
+        result: { status: ExecutionStatus; output: any; logs: string; executionChannel: string },
+        countExecution: boolean,
+    ): Promise<JournalNodeEntry> {
+        entry.status = result.status;
+        entry.completedAt = new Date();
+        entry.output = result.output;
+        entry.logs = result.logs;
+        entry.executionChannel = result.executionChannel;
+        run.unflushed.push(entry);
+        this.events.publish({
+            type: 'node.finished',
+            executionId: run.executionId,
+            at: entry.completedAt.toISOString(),
+            nodeId: entry.nodeId,
+            status: entry.status,
+            channel: entry.executionChannel,
+            durationMs: entry.completedAt.getTime() - entry.startedAt.getTime(),
+        });
+        if (countExecution) {
+            const stats = run.nodeStats.get(entry.nodeId);
+            if (stats) {
+                stats.count++;
+                stats.lastExecuted = entry.completedAt;
+            } else {
+                run.nodeStats.set(entry.nodeId, { count: 1, lastExecuted: entry.completedAt });
+            }
+        }
+        if (this.durability === JournalDurability.NODE) {
+            await this.flush(run);
+        }
+        return entry;
+    }
+
+    findLatest(run: JournalRun, nodeId: number): JournalNodeEntry | undefined {
+        for (let i = run.entries.length - 1; i >= 0; i--) {
+            const entry = run.entries[i];
+            if (entry.nodeId === nodeId && entry.completedAt) {
+                return entry;
+            }
+        }
+        return undefined;
+    }
+
+    addWork(run: JournalRun, count: number) {
+        if (count > 0) {
+            run.pending += count;
+            run.pendingDirty = true;
+        }
+    }
+
+    async finishWork(run: JournalRun) {
+        run.pending--;
+        run.pendingDirty = true;
+        if (run.pending <= 0) {
+            await this.complete(run, ExecutionStatus.SUCCESS);
+        }
+    }
+
+    async complete(run: JournalRun, status: ExecutionStatus, errorMessage?: string) {
+        if (run.finalized) {
+            return;
+        }
+        run.finalized = true;
+        if (!run.startedAt) {
+            const execution = await this.prisma.workflowExecution.findUnique({
+                where: { id: run.executionId },
+                select: { startedAt: true },
+            });
+            run.startedAt = execution?.startedAt ?? null;
+        }
+        const completedAt = new Date();
+        run.completion = {
+            status,
+            completedAt,
+            durationMs: run.startedAt ? completedAt.getTime() - run.startedAt.getTime() : null,
+            errorMessage,
+        };
+        this.completedRuns++;
+        this.events.publish({
+            type: 'run.finished',
+            executionId: run.executionId,
+            at: completedAt.toISOString(),
+            status,
+            errorMessage,
+            durationMs: run.completion.durationMs,
+        });
+        if (this.durability === JournalDurability.NODE) {
+            await this.flush(run);
+        }
+    }
+
+    async release(run: JournalRun) {
+        run.refs--;
+        await this.flushAndForget(run);
+    }
+
+    async cancel(executionId: number): Promise<boolean> {
+        const { count } = await this.prisma.workflowExecution.updateMany({
+            where: { id: executionId, completedAt: null },
+            data: { cancelRequestedAt: new Date() },
+        });
+        const run = this.runs.get(executionId);
+        if (run && !run.abort.signal.aborted) {
+            run.abort.abort(new Error(CANCELLED_MESSAGE));
+            this.cancelledRuns++;
+        }
+        return count > 0;
+    }
+
+    getStats() {
+        return {
+            durability: this.durability,
+            flushIntervalMs: this.flushInterval,
+            openRuns: this.runs.size,
+            bufferedRows: [...this.runs.values()].reduce((acc, run) => acc + run.unflushed.length, 0),
+            flushedRows: this.flushedRows,
+            flushes: this.flushes,
+            completedRuns: this.completedRuns,
+            recoveredRuns: this.recoveredRuns,
+            cancelledRuns: this.cancelledRuns,
+            resumedRuns: this.resumedRuns,
+            lastRecoveryMs: this.lastRecoveryMs,
+            maxRecoveryMs: this.maxRecoveryMs,
+            averageRecoveryMs: this.resumedRuns > 0 ? this.totalRecoveryMs / this.resumedRuns : 0,
+            lostLeases: this.lostLeases,
+        };
+    }
+
+    private async pollCancellations() {
+        const live = [...this.runs.values()].filter(run => !run.abort.signal.aborted && !run.finalized);
+        if (live.length === 0) {
+            return;
+        }
+        const cancelled = await this.prisma.workflowExecution.findMany({
+            where: {
+                id: { in: live.map(run => run.executionId) },
+                cancelRequestedAt: { not: null },
+            },
+            select: { id: true },
+        });
+        for (const { id } of cancelled) {
+            const run = this.runs.get(id);
+            if (run && !run.abort.signal.aborted) {
+                run.abort.abort(new Error(CANCELLED_MESSAGE));
+                this.cancelledRuns++;
+            }
+        }
+    }
+
+    private async heartbeat() {
+        const owned = [...this.runs.values()].filter(run => run.owned && !run.finalized && !run.fenced);
+        if (owned.length === 0) {
+            return;
+        }
+        const renewed = await this.prisma.$queryRaw<{ id: number }[]>`
+            UPDATE "WorkflowExecution"
+            SET "heartbeatAt" = NOW()
+            WHERE "id" IN (${Prisma.join(owned.map(run => run.executionId))})
+              AND "ownerId" = ${this.replica.id}
+              AND "completedAt" IS NULL
+            RETURNING "id"
+        `;
+        const alive = new Set(renewed.map(row => row.id));
+        for (const run of owned) {
+            if (!alive.has(run.executionId) && !run.finalized) {
+                run.fenced = true;
+                run.abort.abort(new Error(LEASE_LOST_MESSAGE));
+                this.lostLeases++;
+                this.logger.warn(`Lost the lease on execution ${run.executionId}, stopping it locally`);
+            }
+        }
+    }
+
+    private async claim(executionId: number): Promise<boolean> {
+        const claimed = await this.prisma.$queryRaw<{ id: number }[]>`
+            UPDATE "WorkflowExecution"
+            SET "ownerId" = ${this.replica.id},
+                "heartbeatAt" = NOW(),
+                "resumeCount" = "resumeCount" + 1
+            WHERE "id" = ${executionId}
+              AND "completedAt" IS NULL
+              AND ("heartbeatAt" IS NULL OR "heartbeatAt" < NOW() - make_interval(secs => ${this.resumeAfter / 1000}))
+            RETURNING "id"
+        `;
+        return claimed.length > 0;
+    }
+
+    private resume(execution: { id: number; workflowId: number; startedAt: Date; heartbeatAt: Date | null; checkpoint: Prisma.JsonValue }) {
+        if (!this.resumeListener) {
+            return;
+        }
+        const recoveryMs = Date.now() - (execution.heartbeatAt ?? execution.startedAt).getTime();
+        this.resumedRuns++;
+        this.lastRecoveryMs = recoveryMs;
+        this.maxRecoveryMs = Math.max(this.maxRecoveryMs, recoveryMs);
+        this.totalRecoveryMs += recoveryMs;
+        this.logger.warn(`Resuming execution ${execution.id} from its checkpoint, ${recoveryMs}ms after it was interrupted`);
+        this.resumeListener({
+            executionId: execution.id,
+            workflowId: execution.workflowId,
+            startedAt: execution.startedAt,
+            checkpoint: execution.checkpoint as unknown as ExecutionCheckpoint,
+        }).catch((error: any) => {
+            this.logger.error(`Failed to resume execution ${execution.id}: ${error.message}`);
+        });
+    }
+
+    private async recoverStale() {
+        const now = Date.now();
+        const stale = await this.prisma.workflowExecution.findMany({
+            where: {
+                status: ExecutionStatus.RUNNING,
+                completedAt: null,
+                OR: [
+                    { startedAt: { lt: new Date(now - this.staleAfter) } },
+                    { cancelRequestedAt: { lt: new Date(now - 10 * this.cancelPollInterval) } },
+                    { heartbeatAt: { lt: new Date(now - this.resumeAfter) } },
+                ],
+            },
+            select: {
+                id: true,
+                workflowId: true,
+                startedAt: true,
+                pendingWork: true,
+                cancelRequestedAt: true,
+                heartbeatAt: true,
+                checkpoint: true,
+                resumeCount: true,
+            },
+            take: 500,
+        });
+        let failed = 0;
+        for (const execution of stale) {
+            if (this.runs.has(execution.id)) {
+                continue;
+            }
+            const resumable = !!execution.checkpoint && !execution.cancelRequestedAt
+                && execution.resumeCount < this.maxResumes && !!this.resumeListener;
+            if (!(await this.claim(execution.id))) {
+                continue;
+            }
+            if (resumable) {
+                this.resume(execution);
+                continue;
+            }
+            const lastNode = await this.prisma.nodeExecution.findFirst({
+                where: { executionId: execution.id },
+                orderBy: { completedAt: 'desc' },
+                select: { completedAt: true },
+            });
+            const finished = execution.pendingWork === 0 && !!lastNode;
+            const completedAt = lastNode?.completedAt ?? new Date();
+            const { count } = await this.prisma.workflowExecution.updateMany({
+                where: { id: execution.id, completedAt: null },
+                data: {
+                    status: finished ? ExecutionStatus.SUCCESS : ExecutionStatus.FAILED,
+                    completedAt,
+                    durationMs: completedAt.getTime() - execution.startedAt.getTime(),
+                    errorMessage: finished
+                        ? undefined
+                        : execution.cancelRequestedAt ? CANCELLED_MESSAGE : 'Execution interrupted before completion',
+                    pendingWork: 0,
+                    checkpoint: Prisma.DbNull,
+                },
+            });
+            this.recoveredRuns += count;
+            failed += count;
+        }
+        if (failed > 0) {
+            this.logger.warn(`Recovered ${failed} stale execution(s)`);
+        }
+    }
+
+    private async flushAll() {
+        await Promise.all([...this.runs.values()].map(run => this.flushAndForget(run)));
+    }
+
+    private async flushAndForget(run: JournalRun) {
+        const flushed = await this.flush(run);
+        if (flushed && run.refs <= 0 && this.runs.get(run.executionId) === run) {
+            this.runs.delete(run.executionId);
+        }
+    }
+
+    private flush(run: JournalRun): Promise<boolean> {
+        run.flushing = run.flushing.then(() => this.write(run));
+        return run.flushing;
+    }
+
+    private async write(run: JournalRun): Promise<boolean> {
+        if (run.fenced) {
+            run.unflushed.length = 0;
+            run.nodeStats.clear();
+            run.completion = null;
+            run.pendingDirty = false;
+            run.checkpointDirty = false;
+            return false;
+        }
+        if (run.unflushed.length === 0 && run.nodeStats.size === 0 && !run.completion && !run.pendingDirty && !run.checkpointDirty) {
+            return true;
+        }
+        const rows = run.unflushed.splice(0);
+        const stats = [...run.nodeStats.entries()];
+        run.nodeStats.clear();
+        const completion = run.completion;
+        run.completion = null;
+        const pendingWork = run.pendingDirty ? Math.max(run.pending, 0) : null;
+        run.pendingDirty = false;
+        const checkpoint = run.checkpointDirty ? this.checkpoint(run) : null;
+        run.checkpointDirty = false;
+        const operations: Prisma.PrismaPromise<any>[] = [];
+        if (rows.length > 0) {
+            operations.push(this.prisma.nodeExecution.createMany({
+                data: rows.map(row => ({
+                    nodeId: row.nodeId,
+                    executionId: row.executionId,
+                    status: row.status,
+                    startedAt: row.startedAt,
+                    completedAt: row.completedAt,
+                    output: row.output ?? Prisma.JsonNull,
+                    logs: row.logs,
+                    executionChannel: row.executionChannel,
+                })),
+            }));
+        }
+        for (const [nodeId, { count, lastExecuted }] of stats) {
+            operations.push(this.prisma.node.updateMany({
+                where: { id: nodeId },
+                data: {
+                    lastExecuted,
+                    executionCount: {
+                        increment: count,
+                    },
+                },
+            }));
+        }
+        const owner = run.owned ? { ownerId: this.replica.id } : {};
+        const updatesExecution = !!completion || pendingWork !== null || !!checkpoint;
+        if (completion) {
+            operations.push(this.prisma.workflowExecution.updateMany({
+                where: { id: run.executionId, completedAt: null, ...owner },
+                data: { ...completion, pendingWork: 0, checkpoint: Prisma.DbNull },
+            }));
+        } else if (updatesExecution) {
+            operations.push(this.prisma.workflowExecution.updateMany({
+                where: { id: run.executionId, completedAt: null, ...owner },
+                data: {
+                    ...(pendingWork !== null ? { pendingWork } : {}),
+                    ...(checkpoint ? { checkpoint } : {}),
+                },
+            }));
+        }
+        try {
+            const results = await this.prisma.$transaction(operations);
+            this.flushedRows += rows.length;
+            this.flushes++;
+            if (run.owned && updatesExecution && results[results.length - 1].count === 0 && !run.finalized) {
+                run.fenced = true;
+                run.abort.abort(new Error(LEASE_LOST_MESSAGE));
+                this.lostLeases++;
+                this.logger.warn(`Execution ${run.executionId} is owned by another replica, stopping it locally`);
+                return false;
+            }
+            return true;
+        } catch (error: any) {
+            this.logger.error(`Failed to flush journal for execution ${run.executionId}: ${error.message}`);
+            this.restore(run, rows, stats, completion, pendingWork !== null, !!checkpoint);
+            return false;
+        }
+    }
+
+    private restore(
+        run: JournalRun,
+        rows: JournalNodeEntry[],
+        stats: [number, { count: number; lastExecuted: Date }][],
+        completion: JournalRun['completion'],
+        pendingDirty: boolean,
+        checkpointDirty: boolean,
+    ) {
+        run.unflushed.unshift(...rows);
+        for (const [nodeId, { count, lastExecuted }] of stats) {
+            const current = run.nodeStats.get(nodeId);
+            if (current) {
+                current.count += count;
+                current.lastExecuted = current.lastExecuted > lastExecuted ? current.lastExecuted : lastExecuted;
+            } else {
+                run.nodeStats.set(nodeId, { count, lastExecuted });
+            }
+        }
+        run.completion ??= completion;
+        run.pendingDirty ||= pendingDirty;
+        run.checkpointDirty ||= checkpointDirty;
+    }
+
+    private checkpoint(run: JournalRun): Prisma.InputJsonValue {
+        const checkpoint: ExecutionCheckpoint = {
+            segments: [...run.segments.values()].map(segment => ({
+                rootNodeId: segment.rootNodeId,
+                steps: segment.steps,
+                barrier: segment.barrier.snapshot(),
+                frontier: [...segment.frontier.values()],
+            })),
+        };
+        return checkpoint as unknown as Prisma.InputJsonValue;
+    }
+}
@@ -0,0 +1,42 @@
+import { ExecutionLog } from './execution-log.service';
+
+describe('ExecutionLog', () => {
+  const stats = () => ({ entries: 0, skipped: 0, truncated: 0, bytes: 0 });
+  const parse = (log: ExecutionLog) => log.toString().split('\n').map(line => JSON.parse(line));
+
+  it('skips entries below the threshold without building their payload', () => {
+    const counters = stats();
+    const log = new ExecutionLog(20, 2048, counters);
+    let built = false;
+    log.debug('Input', () => {
+      built = true;
+      return { large: true };
+    });
+    log.info('Executing node: A');
+    expect(built).toBe(false);
+    expect(counters.skipped).toBe(1);
+    expect(parse(log).map(entry => entry.msg)).toEqual(['Executing node: A']);
+  });
+
+  it('keeps small payloads and caps large ones with a hash', () => {
+    const counters = stats();
+    const log = new ExecutionLog(10, 64, counters);
+    log.debug('Small', () => ({ id: 1 }));
+    log.debug('Large', () => ({ body: 'x'.repeat(500) }));
+    const [small, large] = parse(log);
+    expect(small.data).toEqual({ id: 1 });
+    expect(large.data.truncated).toBe(true);
+    expect(large.data.bytes).toBe(511);
+    expect(large.data.sha256.length).toBe(64);
+    expect(large.data.preview.length).toBe(64);
+    expect(counters.truncated).toBe(1);
+  });
+
+  it('serializes each payload once', () => {
+    const log = new ExecutionLog(10, 2048, stats());
+    let serialized = 0;
+    log.debug('Payload', () => ({ toJSON: () => (serialized++, { id: 1 }) }));
+    expect(parse(log)[0].data).toEqual({ id: 1 });
+    expect(serialized).toBe(1);
+  });
+});
@@ -0,0 +1,110 @@
+import { Injectable } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { createHash } from 'crypto';
+
+export enum ExecutionLogLevel {
+    DEBUG = 'debug',
+    INFO = 'info',
+    WARN = 'warn',
+    ERROR = 'error',
+}
+
+const LEVEL_ORDER: Record<ExecutionLogLevel, number> = {
+    [ExecutionLogLevel.DEBUG]: 10,
+    [ExecutionLogLevel.INFO]: 20,
+    [ExecutionLogLevel.WARN]: 30,
+    [ExecutionLogLevel.ERROR]: 40,
+};
+
+interface ExecutionLogStats {
+    entries: number;
+    skipped: number;
+    truncated: number;
+    bytes: number;
+}
+
+export class ExecutionLog {
+    private readonly lines: string[] = [];
+    private readonly startedAt = Date.now();
+
+    constructor(
+        private readonly threshold: number,
+        private readonly maxPayloadBytes: number,
+        private readonly stats: ExecutionLogStats,
+    ) { }
+
+    debug(message: string, payload?: () => any) {
+        this.write(ExecutionLogLevel.DEBUG, message, payload);
+    }
+
+    info(message: string, payload?: () => any) {
+        this.write(ExecutionLogLevel.INFO, message, payload);
+    }
+
+    warn(message: string, payload?: () => any) {
+        this.write(ExecutionLogLevel.WARN, message, payload);
+    }
+
+    error(message: string, payload?: () => any) {
+        this.write(ExecutionLogLevel.ERROR, message, payload);
+    }
+
+    isEnabled(level: ExecutionLogLevel) {
+        return LEVEL_ORDER[level] >= this.threshold;
+    }
+
+    toString(): string {
+        const serialized = this.lines.join('\n');
+        this.stats.bytes += serialized.length;
+        return serialized;
+    }
+
+    private write(level: ExecutionLogLevel, message: string, payload?: () => any) {
+        if (!this.isEnabled(level)) {
+            this.stats.skipped++;
+            return;
+        }
+        const line = JSON.stringify({ t: Date.now() - this.startedAt, level, msg: message });
+        this.lines.push(payload ? `${line.slice(0, -1)},"data":${this.serializePayload(payload())}}` : line);
+        this.stats.entries++;
+    }
+
+    private serializePayload(value: any): string {
+        const serialized = JSON.stringify(value) ?? 'null';
+        const bytes = Buffer.byteLength(serialized);
+        if (bytes <= this.maxPayloadBytes) {
+            return serialized;
+        }
+        this.stats.truncated++;
+        return JSON.stringify({
+            truncated: true,
+            bytes,
+            sha256: createHash('sha256').update(serialized).digest('hex'),
+            preview: serialized.slice(0, Math.min(256, this.maxPayloadBytes)),
+        });
+    }
+}
+
+@Injectable()
+export class ExecutionLogService {
+    private readonly threshold: number;
+    private readonly maxPayloadBytes: number;
+    private readonly stats: ExecutionLogStats = { entries: 0, skipped: 0, truncated: 0, bytes: 0 };
+
+    constructor(private configService: ConfigService) {
+        const level = this.configService.get<string>('EXECUTION_LOG_LEVEL', ExecutionLogLevel.INFO).toLowerCase();
+        this.threshold = LEVEL_ORDER[level as ExecutionLogLevel] ?? LEVEL_ORDER[ExecutionLogLevel.INFO];
+        this.maxPayloadBytes = Number(this.configService.get<string>('EXECUTION_LOG_MAX_PAYLOAD_BYTES', '2048')) || 2048;
+    }
+
+    create(): ExecutionLog {
+        return new ExecutionLog(this.threshold, this.maxPayloadBytes, this.stats);
+    }
+
+    getStats() {
+        return {
+            ...this.stats,
+            maxPayloadBytes: this.maxPayloadBytes,
+        };
+    }
+}
@@ -0,0 +1,325 @@
+import { Injectable, Logger, OnApplicationBootstrap, OnModuleDestroy } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { PrismaService } from '../../prisma/prisma.service';
+import { ReplicaService } from './replica.service';
+import { LogicType } from '../nodes/dto/node.dto';
+import { ConfigTemplate, compileTemplate } from './config-template';
+
+export interface PlanNode {
+    id: number;
+    name: string | null;
+    actionId: number | null;
+    reactionId: number | null;
+    logicType: LogicType | null;
+    conf: any;
+    template: ConfigTemplate;
+    isTriggered: boolean;
+    action: {
+        id: number;
+        name: string;
+        serviceId: number;
+    } | null;
+    reaction: {
+        id: number;
+        name: string;
+        serviceId: number;
+        serviceName: string;
+        serviceUrl: string | null;
+    } | null;
+}
+
+export interface PlanEdge {
+    id: number;
+    sourceNodeId: number;
+    targetNodeId: number;
+    channel: string;
+}
+
+export interface ExecutionPlan {
+    workflowId: number;
+    userId: number;
+    name: string;
+    isActive: boolean;
+    version: number;
+    builtAt: Date;
+    nodes: ReadonlyMap<number, PlanNode>;
+    outgoing: ReadonlyMap<number, ReadonlyMap<string, readonly number[]>>;
+    outgoingEdges: ReadonlyMap<number, readonly PlanEdge[]>;
+    incoming: ReadonlyMap<number, readonly PlanEdge[]>;
+}
+
+const SYNC_OVERLAP = 20;
+const SYNC_BATCH = 1000;
+const INVALIDATION_RETENTION_MS = 3600000;
+
+@Injectable()
+export class ExecutionPlanService implements OnApplicationBootstrap, OnModuleDestroy {
+    private readonly logger = new Logger(ExecutionPlanService.name);
+    private readonly plans = new Map<number, ExecutionPlan>();
+    private readonly pending = new Map<number, Promise<ExecutionPlan | null>>();
+    private readonly versions = new Map<number, number>();
+    private readonly listeners: ((workflowId: number) => void)[] = [];
+    private readonly applied = new Set<number>();
+    private readonly syncInterval: number;
+    private syncTimer: NodeJS.Timeout | null = null;
+    private syncCursor: number | null = null;
+    private syncs = 0;
+    private remoteInvalidations = 0;
+    private hits = 0;
+    private misses = 0;
+
+    constructor(
+        private prisma: PrismaService,
+        private configService: ConfigService,
+        private replica: ReplicaService,
+    ) {
+        this.syncInterval = Number(this.configService.get<string>('PLAN_SYNC_MS', '1000')) || 0;
+    }
+
+    onApplicationBootstrap() {
+        if (this.syncInterval <= 0) {
+            return;
+        }
+        this.syncTimer = setInterval(() => {
+            this.sync().catch((error: any) => {
+                this.logger.error(`Plan invalidation sync failed: ${error.message}`);
+            });
+        }, this.syncInterval);
+        this.syncTimer.unref();
+    }
+
+    onModuleDestroy() {
+        if (this.syncTimer) {
+            clearInterval(this.syncTimer);
+            this.syncTimer = null;
+        }
+    }
+
+    async getPlan(workflowId: number): Promise<ExecutionPlan | null> {
+        const cached = this.plans.get(workflowId);
+        if (cached) {
+            this.hits++;
+            return cached;
+        }
+        this.misses++;
+        const inFlight = this.pending.get(workflowId);
+        if (inFlight) {
+            return inFlight;
+        }
+        const building = this.build(workflowId).finally(() => {
+            if (this.pending.get(workflowId) === building) {
+                this.pending.delete(workflowId);
+            }
+        });
+        this.pending.set(workflowId, building);
+        return building;
+    }
+
+    invalidate(workflowId: number) {
+        this.apply(workflowId);
+        this.publish(workflowId);
+    }
+
+    onInvalidate(listener: (workflowId: number) => void) {
+        this.listeners.push(listener);
+    }
+
+    invalidateAll() {
+        this.applyAll();
+        this.publish(null);
+    }
+
+    getStats() {
+        return {
+            cachedPlans: this.plans.size,
+            hits: this.hits,
+            misses: this.misses,
+            syncIntervalMs: this.syncInterval,
+            syncs: this.syncs,
+            remoteInvalidations: this.remoteInvalidations,
+        };
+    }
+
+    private apply(workflowId: number) {
+        this.drop(workflowId);
+        for (const listener of this.listeners) {
+            listener(workflowId);
+        }
+    }
+
+    private applyAll() {
+        for (const workflowId of new Set([...this.plans.keys(), ...this.pending.keys()])) {
+            this.drop(workflowId);
+        }
+    }
+
+    private publish(workflowId: number | null) {
+        if (this.syncInterval <= 0) {
+            return;
+        }
+        this.prisma.planInvalidation.create({
+            data: { workflowId, origin: this.replica.id },
+        }).catch((error: any) => {
+            this.logger.error(`Failed to publish plan invalidation: ${error.message}`);
+        });
+    }
+
+    private async sync() {
+        if (this.syncCursor === null) {
+            const latest = await this.prisma.planInvalidation.findFirst({
+                orderBy: { id: 'desc' },
+                select: { id: true },
+            });
+            this.syncCursor = latest?.id ?? 0;
+            return;
+        }
+        const rows = await this.prisma.planInvalidation.findMany({
+            where: { id: { gt: Math.max(this.syncCursor - SYNC_OVERLAP, 0) } },
+            orderBy: { id: 'asc' },
+            select: { id: true, workflowId: true, origin: true },
+            take: SYNC_BATCH,
+        });
+        for (const row of rows) {
+            this.syncCursor = Math.max(this.syncCursor, row.id);
+            if (this.applied.has(row.id)) {
+                continue;
+            }
+            this.applied.add(row.id);
+            if (row.origin === this.replica.id) {
+                continue;
+            }
+            this.remoteInvalidations++;
+            if (row.workflowId === null) {
+                this.applyAll();
+            } else {
+                this.apply(row.workflowId);
+            }
+        }
+        for (const id of this.applied) {
+            if (id <= this.syncCursor - SYNC_OVERLAP) {
+                this.applied.delete(id);
+            }
+        }
+        this.syncs++;
+        if (this.syncs % 600 === 0) {
+            await this.prisma.planInvalidation.deleteMany({
+                where: { createdAt: { lt: new Date(Date.now() - INVALIDATION_RETENTION_MS) } },
+            });
+        }
+    }
+
+    private drop(workflowId: number) {
+        this.versions.set(workflowId, (this.versions.get(workflowId) ?? 0) + 1);
+        this.plans.delete(workflowId);
+        this.pending.delete(workflowId);
+    }
+
+    private async build(workflowId: number): Promise<ExecutionPlan | null> {
+        const version = this.versions.get(workflowId) ?? 0;
+        const workflow = await this.prisma.workflow.findUnique({
+            where: { id: workflowId },
+            select: {
+                id: true,
+                name: true,
+                userId: true,
+                isActive: true,
+                nodes: {
+                    include: {
+                        action: {
+                            select: { id: true, name: true, serviceId: true },
+                        },
+                        reaction: {
+                            include: {
+                                service: {
+                                    select: { name: true, microServiceUrl: true },
+                                },
+                            },
+                        },
+                    },
+                    orderBy: { id: 'asc' },
+                },
+                nodeConnections: {
+                    select: {
+                        id: true,
+                        sourceNodeId: true,
+                        targetNodeId: true,
+                        channel: true,
+                    },
+                    orderBy: { id: 'asc' },
+                },
+            },
+        });
+        if (!workflow) {
+            return null;
+        }
+        const nodes = new Map<number, PlanNode>();
+        for (const node of workflow.nodes) {
+            nodes.set(node.id, Object.freeze({
+                id: node.id,
+                name: node.name,
+                actionId: node.actionId,
+                reactionId: node.reactionId,
+                logicType: node.logicType as LogicType | null,
+                conf: node.conf,
+                template: compileTemplate(node.conf),
+                isTriggered: node.isTriggered,
+                action: node.action ? Object.freeze({ ...node.action }) : null,
+                reaction: node.reaction
+                    ? Object.freeze({
+                        id: node.reaction.id,
+                        name: node.reaction.name,
+                        serviceId: node.reaction.serviceId,
+                        serviceName: node.reaction.service.name,
+                        serviceUrl: node.reaction.service.microServiceUrl || null,
+                    })
+                    : null,
+            }));
+        }
+        const outgoing = new Map<number, Map<string, number[]>>();
+        const outgoingEdges = new Map<number, PlanEdge[]>();
+        const incoming = new Map<number, PlanEdge[]>();
+        for (const connection of workflow.nodeConnections) {
+            const edge: PlanEdge = Object.freeze({ ...connection });
+            let channels = outgoing.get(edge.sourceNodeId);
+            if (!channels) {
+                channels = new Map();
+                outgoing.set(edge.sourceNodeId, channels);
+            }
+            const targets = channels.get(edge.channel) ?? [];
+            targets.push(edge.targetNodeId);
+            channels.set(edge.channel, targets);
+            const edges = outgoingEdges.get(edge.sourceNodeId) ?? [];
+            edges.push(edge);
+            outgoingEdges.set(edge.sourceNodeId, edges);
+            const sources = incoming.get(edge.targetNodeId) ?? [];
+            sources.push(edge);
+            incoming.set(edge.targetNodeId, sources);
+        }
+        for (const channels of outgoing.values()) {
+            for (const targets of channels.values()) {
+                Object.freeze(targets);
+            }
+        }
+        for (const edges of [...outgoingEdges.values(), ...incoming.values()]) {
+            Object.freeze(edges);
+        }
+        const plan: ExecutionPlan = Object.freeze({
+            workflowId: workflow.id,
+            userId: workflow.userId,
+            name: workflow.name,
+            isActive: workflow.isActive,
+            version,
+            builtAt: new Date(),
+            nodes,
+            outgoing,
+            outgoingEdges,
+            incoming,
+        });
+        if ((this.versions.get(workflowId) ?? 0) === version) {
+            this.plans.set(workflowId, plan);
+        } else {
+            this.logger.debug(`Plan for workflow ${workflowId} invalidated while building, not cached`);
+        }
+        return plan;
+    }
+}
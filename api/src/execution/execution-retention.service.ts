@@ -0,0 +1,144 @@
+import { Injectable, Logger, OnApplicationBootstrap, OnModuleDestroy } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { PrismaService } from '../../prisma/prisma.service';
+
+export interface PruneReport {
+    executions: number;
+    nodeExecutions: number;
+    bytes: number;
+    tombstones: number;
+    batches: number;
+    durationMs: number;
+    finishedAt: Date;
+}
+
+interface PruneBatchRow {
+    executions: number;
+    nodeExecutions: number;
+    bytes: bigint | number | null;
+}
+
+@Injectable()
+export class ExecutionRetentionService implements OnApplicationBootstrap, OnModuleDestroy {
+    private readonly logger = new Logger(ExecutionRetentionService.name);
+    private readonly retentionDays: number;
+    private readonly batchSize: number;
+    private readonly interval: number;
+    private readonly tombstoneDays: number;
+    private pruneTimer: NodeJS.Timeout | null = null;
+    private running: Promise<PruneReport> | null = null;
+    private lastRun: PruneReport | null = null;
+    private runs = 0;
+    private totals = { executions: 0, nodeExecutions: 0, bytes: 0, tombstones: 0 };
+
+    constructor(
+        private prisma: PrismaService,
+        private configService: ConfigService,
+    ) {
+        this.retentionDays = Math.max(0, Number(this.configService.get<string>('EXECUTION_RETENTION_DAYS', '30')) || 0);
+        this.batchSize = Number(this.configService.get<string>('EXECUTION_PRUNE_BATCH', '500')) || 500;
+        this.interval = Number(this.configService.get<string>('EXECUTION_PRUNE_INTERVAL_MS', '3600000')) || 0;
+        this.tombstoneDays = Number(this.configService.get<string>('WORKFLOW_TOMBSTONE_DAYS', '30')) || 30;
+    }
+
+    onApplicationBootstrap() {
+        if (this.interval <= 0) {
+            return;
+        }
+        this.pruneTimer = setInterval(() => {
+            this.prune().catch((error: any) => {
+                this.logger.error(`Execution history pruning failed: ${error.message}`);
+            });
+        }, this.interval);
+        this.pruneTimer.unref();
+    }
+
+    onModuleDestroy() {
+        if (this.pruneTimer) {
+            clearInterval(this.pruneTimer);
+            this.pruneTimer = null;
+        }
+    }
+
+    prune(): Promise<PruneReport> {
+        if (!this.running) {
+            this.running = this.pruneExpired().finally(() => {
+                this.running = null;
+            });
+        }
+        return this.running;
+    }
+
+    getStats() {
+        return {
+            retentionDays: this.retentionDays,
+            batchSize: this.batchSize,
+            intervalMs: this.interval,
+            runs: this.runs,
+            pruning: this.running !== null,
+            lastRun: this.lastRun,
+            totals: { ...this.totals },
+        };
+    }
+
+    private async pruneExpired(): Promise<PruneReport> {
+        const startedAt = Date.now();
+        const report = { executions: 0, nodeExecutions: 0, bytes: 0, batches: 0 };
+        const globalDays = this.retentionDays > 0 ? this.retentionDays : null;
+        while (true) {
+            const [batch] = await this.prisma.$queryRaw<PruneBatchRow[]>`
+                WITH doomed AS (
+                    SELECT e."id" FROM "WorkflowExecution" e
+                    JOIN "Workflow" w ON w."id" = e."workflowId"
+                    JOIN "User" u ON u."id" = w."userId"
+                    WHERE e."completedAt" IS NOT NULL
+                      AND e."startedAt" < NOW() - make_interval(days => COALESCE(u."executionRetentionDays", ${globalDays}::int))
+                    ORDER BY e."startedAt"
+                    LIMIT ${this.batchSize}
+                    FOR UPDATE OF e SKIP LOCKED
+                ), removed_nodes AS (
+                    DELETE FROM "NodeExecution" n USING doomed d
+                    WHERE n."executionId" = d."id"
+                    RETURNING pg_column_size(n.*) AS size
+                ), removed_runs AS (
+                    DELETE FROM "WorkflowExecution" e USING doomed d
+                    WHERE e."id" = d."id"
+                    RETURNING pg_column_size(e.*) AS size
+                )
+                SELECT
+                    (SELECT COUNT(*) FROM removed_runs)::int AS "executions",
+                    (SELECT COUNT(*) FROM removed_nodes)::int AS "nodeExecutions",
+                    (COALESCE((SELECT SUM(size) FROM removed_runs), 0)
+                        + COALESCE((SELECT SUM(size) FROM removed_nodes), 0))::bigint AS "bytes"
+            `;
+            const executions = batch?.executions ?? 0;
+            if (executions === 0) {
+                break;
+            }
+            report.batches++;
+            report.executions += executions;
+            report.nodeExecutions += batch.nodeExecutions;
+            report.bytes += Number(batch.bytes ?? 0);
+            if (executions < this.batchSize) {
+                break;
+            }
+        }
+        const { count: tombstones } = await this.prisma.workflowTombstone.deleteMany({
+            where: { deletedAt: { lt: new Date(Date.now() - this.tombstoneDays * 24 * 60 * 60 * 1000) } },
+        });
+        const finished: PruneReport = { ...report, tombstones, durationMs: Date.now() - startedAt, finishedAt: new Date() };
+        this.runs++;
+        this.lastRun = finished;
+        this.totals.executions += report.executions;
+        this.totals.nodeExecutions += report.nodeExecutions;
+        this.totals.bytes += report.bytes;
+        this.totals.tombstones += tombstones;
+        if (report.executions > 0) {
+            this.logger.log(
+                `Pruned ${report.executions} execution(s) and ${report.nodeExecutions} node execution(s), ` +
+                `~${report.bytes} bytes reclaimed in ${finished.durationMs}ms`
+            );
+        }
+        return finished;
+    }
+}
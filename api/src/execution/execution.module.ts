@@ -0,0 +1,20 @@
+import { Module } from '@nestjs/common';
+import { PrismaModule } from '../../prisma/prisma.module';
+import { ExecutionPlanService } from './execution-plan.service';
+import { ExecutionJournalService } from './execution-journal.service';
+import { FanOutService } from './fan-out.service';
+import { TriggerIndexService } from './trigger-index.service';
+import { ExecutionLogService } from './execution-log.service';
+import { ExecutionRetentionService } from './execution-retention.service';
+import { ReactionDispatcherService } from './reaction-dispatcher.service';
+import { ReactionBatcherService } from './reaction-batcher.service';
+import { TriggerWindowService } from './trigger-window.service';
+import { ExecutionEventsService } from './execution-events.service';
+import { ReplicaService } from './replica.service';
+
+@Module({
+    imports: [PrismaModule],
+    providers: [ExecutionPlanService, ExecutionJournalService, FanOutService, TriggerIndexService, ExecutionLogService, ExecutionRetentionService, ReactionDispatcherService, ReactionBatcherService, TriggerWindowService, ExecutionEventsService, ReplicaService],
+    exports: [ExecutionPlanService, ExecutionJournalService, FanOutService, TriggerIndexService, ExecutionLogService, ExecutionRetentionService, ReactionDispatcherService, ReactionBatcherService, TriggerWindowService, ExecutionEventsService, ReplicaService],
+})
+export class ExecutionModule { }
@@ -0,0 +1,77 @@
+import { Injectable } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+
+@Injectable()
+export class FanOutService {
+    private readonly globalLimit: number;
+    private readonly perTriggerLimit: number;
+    private readonly waiters: (() => void)[] = [];
+    private running = 0;
+    private peak = 0;
+    private started = 0;
+
+    constructor(private configService: ConfigService) {
+        this.globalLimit = Math.max(1, Number(this.configService.get<string>('EXECUTION_GLOBAL_CONCURRENCY', '32')) || 32);
+        this.perTriggerLimit = Math.max(1, Number(this.configService.get<string>('EXECUTION_TRIGGER_CONCURRENCY', '8')) || 8);
+    }
+
+    async run<T, R>(
+        items: readonly T[],
+        groupBy: (item: T) => number | string,
+        task: (item: T) => Promise<R>,
+    ): Promise<R[]> {
+        const groups = new Map<number | string, number[]>();
+        items.forEach((item, index) => {
+            const key = groupBy(item);
+            const indexes = groups.get(key);
+            if (indexes) {
+                indexes.push(index);
+            } else {
+                groups.set(key, [index]);
+            }
+        });
+        const queue = [...groups.values()];
+        const results: R[] = new Array(items.length);
+        const lane = async () => {
+            for (let indexes = queue.shift(); indexes; indexes = queue.shift()) {
+                for (const index of indexes) {
+                    results[index] = await this.withSlot(() => task(items[index]));
+                }
+            }
+        };
+        const lanes = Math.min(this.perTriggerLimit, queue.length);
+        await Promise.all(Array.from({ length: lanes }, lane));
+        return results;
+    }
+
+    getStats() {
+        return {
+            globalLimit: this.globalLimit,
+            perTriggerLimit: this.perTriggerLimit,
+            running: this.running,
+            waiting: this.waiters.length,
+            peak: this.peak,
+            started: this.started,
+        };
+    }
+
+    private async withSlot<R>(task: () => Promise<R>): Promise<R> {
+        if (this.running >= this.globalLimit) {
+            await new Promise<void>(resolve => this.waiters.push(resolve));
+        } else {
+            this.running++;
+        }
+        this.started++;
+        this.peak = Math.max(this.peak, this.running);
+        try {
+            return await task();
+        } finally {
+            const next = this.waiters.shift();
+            if (next) {
+                next();
+            } else {
+                this.running--;
+            }
+        }
+    }
+}
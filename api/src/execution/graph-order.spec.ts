@@ -0,0 +1,34 @@
+import { topologicalOrder, wouldCreateCycle } from './graph-order';
+import { ExecutionPlan, PlanEdge } from './execution-plan.service';
+
+describe('graph order', () => {
+  const planOf = (nodeIds: number[], edges: PlanEdge[]) => {
+    const outgoingEdges = new Map<number, PlanEdge[]>();
+    for (const edge of edges) {
+      outgoingEdges.set(edge.sourceNodeId, [...(outgoingEdges.get(edge.sourceNodeId) ?? []), edge]);
+    }
+    return { nodes: new Map(nodeIds.map(id => [id, {}])), outgoingEdges } as unknown as ExecutionPlan;
+  };
+  const edge = (id: number, sourceNodeId: number, targetNodeId: number): PlanEdge => ({ id, sourceNodeId, targetNodeId, channel: 'success' });
+
+  it('orders acyclic graphs and rejects cyclic ones', () => {
+    const order = topologicalOrder([1, 2, 3], [edge(1, 1, 2), edge(2, 2, 3)])!;
+    expect(order.get(1)! < order.get(2)!).toBe(true);
+    expect(order.get(2)! < order.get(3)!).toBe(true);
+    expect(topologicalOrder([1, 2], [edge(1, 1, 2), edge(2, 2, 1)])).toBe(null);
+  });
+
+  it('detects connections that would close a cycle', () => {
+    const plan = planOf([1, 2, 3, 4], [edge(1, 1, 2), edge(2, 2, 3)]);
+    expect(wouldCreateCycle(plan, 3, 1)).toBe(true);
+    expect(wouldCreateCycle(plan, 1, 3)).toBe(false);
+    expect(wouldCreateCycle(plan, 4, 1)).toBe(false);
+    expect(wouldCreateCycle(plan, 2, 2)).toBe(true);
+  });
+
+  it('ignores the connection being rewired', () => {
+    const plan = planOf([1, 2], [edge(1, 1, 2)]);
+    expect(wouldCreateCycle(plan, 2, 1)).toBe(true);
+    expect(wouldCreateCycle(plan, 2, 1, 1)).toBe(false);
+  });
+});
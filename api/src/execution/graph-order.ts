@@ -0,0 +1,80 @@
+import { ExecutionPlan } from './execution-plan.service';
+
+export interface GraphEdge {
+    id?: number;
+    sourceNodeId: number;
+    targetNodeId: number;
+}
+
+const orders = new WeakMap<ExecutionPlan, ReadonlyMap<number, number> | null>();
+
+export function topologicalOrder(nodeIds: Iterable<number>, edges: Iterable<GraphEdge>): Map<number, number> | null {
+    const inDegree = new Map<number, number>();
+    const successors = new Map<number, number[]>();
+    for (const nodeId of nodeIds) {
+        inDegree.set(nodeId, 0);
+    }
+    for (const edge of edges) {
+        inDegree.set(edge.targetNodeId, (inDegree.get(edge.targetNodeId) ?? 0) + 1);
+        if (!inDegree.has(edge.sourceNodeId)) {
+            inDegree.set(edge.sourceNodeId, 0);
+        }
+        const list = successors.get(edge.sourceNodeId) ?? [];
+        list.push(edge.targetNodeId);
+        successors.set(edge.sourceNodeId, list);
+    }
+    const ready = [...inDegree].filter(([, degree]) => degree === 0).map(([nodeId]) => nodeId);
+    const order = new Map<number, number>();
+    while (ready.length > 0) {
+        const nodeId = ready.pop()!;
+        order.set(nodeId, order.size);
+        for (const targetId of successors.get(nodeId) ?? []) {
+            const degree = inDegree.get(targetId)! - 1;
+            inDegree.set(targetId, degree);
+            if (degree === 0) {
+                ready.push(targetId);
+            }
+        }
+    }
+    return order.size === inDegree.size ? order : null;
+}
+
+export function getTopologicalOrder(plan: ExecutionPlan): ReadonlyMap<number, number> | null {
+    if (!orders.has(plan)) {
+        const edges: GraphEdge[] = [];
+        for (const outgoing of plan.outgoingEdges.values()) {
+            edges.push(...outgoing);
+        }
+        orders.set(plan, topologicalOrder(plan.nodes.keys(), edges));
+    }
+    return orders.get(plan)!;
+}
+
+export function wouldCreateCycle(plan: ExecutionPlan, sourceNodeId: number, targetNodeId: number, ignoreEdgeId?: number): boolean {
+    if (sourceNodeId === targetNodeId) {
+        return true;
+    }
+    const order = getTopologicalOrder(plan);
+    const sourceRank = order?.get(sourceNodeId);
+    const targetRank = order?.get(targetNodeId);
+    if (sourceRank !== undefined && targetRank !== undefined && sourceRank < targetRank) {
+        return false;
+    }
+    const visited = new Set<number>([targetNodeId]);
+    const stack = [targetNodeId];
+    while (stack.length > 0) {
+        for (const edge of plan.outgoingEdges.get(stack.pop()!) ?? []) {
+            if (edge.id === ignoreEdgeId) {
+                continue;
+            }
+            if (edge.targetNodeId === sourceNodeId) {
+                return true;
+            }
+            if (!visited.has(edge.targetNodeId)) {
+                visited.add(edge.targetNodeId);
+                stack.push(edge.targetNodeId);
+            }
+        }
+    }
+    return false;
+}
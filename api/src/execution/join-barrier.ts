@@ -0,0 +1,237 @@
+import { ExecutionStatus, LogicType } from '../nodes/dto/node.dto';
+import { ExecutionPlan, PlanEdge } from './execution-plan.service';
+
+export interface JoinInput {
+    status: string;
+    output: any;
+    executionChannel: string;
+}
+
+export interface JoinFiring {
+    nodeId: number;
+    input: any;
+    incomingNodes: JoinInput[];
+}
+
+interface JoinTopology {
+    expected: ReadonlyMap<number, ReadonlySet<number>>;
+}
+
+export interface EdgeReport extends JoinInput {
+    activating: boolean;
+}
+
+export interface BarrierNodeSnapshot {
+    nodeId: number;
+    resolved: number[];
+    reports: [number, EdgeReport][];
+    activated: boolean;
+    input: any;
+    done: boolean;
+}
+
+interface NodeState {
+    resolved: Set<number>;
+    reports: Map<number, EdgeReport>;
+    activated: boolean;
+    input: any;
+    done: boolean;
+}
+
+const UNKNOWN_INPUT: JoinInput = {
+    status: 'UNKNOWN',
+    output: {},
+    executionChannel: 'unknown',
+};
+
+const topologies = new WeakMap<ExecutionPlan, Map<number, JoinTopology>>();
+
+export function isJoinNode(plan: ExecutionPlan, nodeId: number): boolean {
+    const logicType = plan.nodes.get(nodeId)?.logicType;
+    return logicType === LogicType.AND || logicType === LogicType.NOT;
+}
+
+export class JoinBarrier {
+    private readonly topology: JoinTopology;
+    private readonly states = new Map<number, NodeState>();
+
+    constructor(private readonly plan: ExecutionPlan, rootNodeId: number) {
+        this.topology = getTopology(plan, rootNodeId);
+    }
+
+    snapshot(): BarrierNodeSnapshot[] {
+        return [...this.states].map(([nodeId, state]) => ({
+            nodeId,
+            resolved: [...state.resolved],
+            reports: [...state.reports],
+            activated: state.activated,
+            input: state.input,
+            done: state.done,
+        }));
+    }
+
+    restore(snapshot: BarrierNodeSnapshot[]) {
+        for (const saved of snapshot) {
+            this.states.set(saved.nodeId, {
+                resolved: new Set(saved.resolved),
+                reports: new Map(saved.reports),
+                activated: saved.activated,
+                input: saved.input,
+                done: saved.done,
+            });
+        }
+    }
+
+    report(sourceNodeId: number, status: ExecutionStatus, executionChannel: string, output: any) {
+        const run: number[] = [];
+        const fire: JoinFiring[] = [];
+        for (const edge of this.outgoingEdges(sourceNodeId)) {
+            const live = status === ExecutionStatus.SUCCESS && edge.channel === executionChannel;
+            const expected = this.topology.expected.get(edge.targetNodeId)?.has(edge.id) ?? false;
+            if (isJoinNode(this.plan, edge.targetNodeId)) {
+                if (expected) {
+                    this.resolve(edge, { status, output, executionChannel, activating: live }, run, fire);
+                }
+            } else if (live) {
+                this.state(edge.targetNodeId).activated = true;
+                run.push(edge.targetNodeId);
+                if (expected) {
+                    this.state(edge.targetNodeId).resolved.add(edge.id);
+                }
+            } else if (expected) {
+                this.resolve(edge, null, run, fire);
+            }
+        }
+        return { run, fire };
+    }
+
+    private resolve(edge: PlanEdge, report: EdgeReport | null, run: number[], fire: JoinFiring[]) {
+        const targetId = edge.targetNodeId;
+        const state = this.state(targetId);
+        if (state.done) {
+            return;
+        }
+        state.resolved.add(edge.id);
+        if (report) {
+            state.reports.set(edge.id, report);
+            if (report.activating) {
+                state.activated = true;
+                state.input = report.output;
+            }
+        }
+        const expected = this.topology.expected.get(targetId);
+        if (!expected || state.resolved.size < expected.size) {
+            return;
+        }
+        state.done = true;
+        if (!state.activated) {
+            this.propagateDead(targetId, run, fire);
+            return;
+        }
+        if (!isJoinNode(this.plan, targetId)) {
+            return;
+        }
+        const incomingNodes = (this.plan.incoming.get(targetId) ?? []).map(incoming => {
+            const edgeReport = state.reports.get(incoming.id);
+            return edgeReport
+                ? { status: edgeReport.status, output: edgeReport.output, executionChannel: edgeReport.executionChannel }
+                : UNKNOWN_INPUT;
+        });
+        fire.push({ nodeId: targetId, input: state.input, incomingNodes });
+    }
+
+    private propagateDead(nodeId: number, run: number[], fire: JoinFiring[]) {
+        for (const edge of this.outgoingEdges(nodeId)) {
+            if (this.topology.expected.get(edge.targetNodeId)?.has(edge.id)) {
+                this.resolve(edge, isJoinNode(this.plan, edge.targetNodeId) ? { ...UNKNOWN_INPUT, activating: false } : null, run, fire);
+            }
+        }
+    }
+
+    private outgoingEdges(nodeId: number): readonly PlanEdge[] {
+        return this.plan.outgoingEdges.get(nodeId) ?? [];
+    }
+
+    private state(nodeId: number): NodeState {
+        let state = this.states.get(nodeId);
+        if (!state) {
+            state = { resolved: new Set(), reports: new Map(), activated: false, input: undefined, done: false };
+            this.states.set(nodeId, state);
+        }
+        return state;
+    }
+}
+
+function getTopology(plan: ExecutionPlan, rootNodeId: number): JoinTopology {
+    let byRoot = topologies.get(plan);
+    if (!byRoot) {
+        byRoot = new Map();
+        topologies.set(plan, byRoot);
+    }
+    let topology = byRoot.get(rootNodeId);
+    if (!topology) {
+        topology = buildTopology(plan, rootNodeId);
+        byRoot.set(rootNodeId, topology);
+    }
+    return topology;
+}
+
+function buildTopology(plan: ExecutionPlan, rootNodeId: number): JoinTopology {
+    const successors = (nodeId: number) => new Set((plan.outgoingEdges.get(nodeId) ?? []).map(edge => edge.targetNodeId));
+    const reachable = new Set<number>([rootNodeId]);
+    const stack = [rootNodeId];
+    while (stack.length > 0) {
+        for (const targetId of successors(stack.pop()!)) {
+            if (!reachable.has(targetId)) {
+                reachable.add(targetId);
+                stack.push(targetId);
+            }
+        }
+    }
+    const component = new Map<number, number>();
+    const lowLink = new Map<number, number>();
+    const order = new Map<number, number>();
+    const onStack = new Set<number>();
+    const path: number[] = [];
+    let counter = 0;
+    const connect = (nodeId: number) => {
+        order.set(nodeId, counter);
+        lowLink.set(nodeId, counter);
+        counter++;
+        path.push(nodeId);
+        onStack.add(nodeId);
+        for (const targetId of successors(nodeId)) {
+            if (!order.has(targetId)) {
+                connect(targetId);
+                lowLink.set(nodeId, Math.min(lowLink.get(nodeId)!, lowLink.get(targetId)!));
+            } else if (onStack.has(targetId)) {
+                lowLink.set(nodeId, Math.min(lowLink.get(nodeId)!, order.get(targetId)!));
+            }
+        }
+        if (lowLink.get(nodeId) === order.get(nodeId)) {
+            let member: number;
+            do {
+                member = path.pop()!;
+                onStack.delete(member);
+                component.set(member, nodeId);
+            } while (member !== nodeId);
+        }
+    };
+    connect(rootNodeId);
+    const expected = new Map<number, Set<number>>();
+    for (const nodeId of reachable) {
+        if (nodeId === rootNodeId) {
+            continue;
+        }
+        const edges = new Set<number>();
+        for (const edge of plan.incoming.get(nodeId) ?? []) {
+            if (reachable.has(edge.sourceNodeId) && component.get(edge.sourceNodeId) !== component.get(nodeId)) {
+                edges.add(edge.id);
+            }
+        }
+        if (edges.size > 0) {
+            expected.set(nodeId, edges);
+        }
+    }
+    return { expected };
+}
@@ -0,0 +1,94 @@
+import { ConfigService } from '@nestjs/config';
+import { ReactionDispatcherService } from './reaction-dispatcher.service';
+import { ReactionBatcherService, ReactionRequest } from './reaction-batcher.service';
+
+describe('ReactionBatcherService', () => {
+  const config = { get: (_key: string, fallback: string) => fallback } as unknown as ConfigService;
+
+  const request = (name: string): ReactionRequest => ({ type: 'reaction', name, userId: 1, config: {}, input: {} });
+
+  const dispatcher = (handler: (path: string, body: any) => { status: number; data: any }) => {
+    const calls: { path: string; body: any }[] = [];
+    const fake = {
+      post: async (url: string, body: any) => {
+        const path = new URL(url).pathname;
+        calls.push({ path, body });
+        return handler(path, body);
+      },
+    } as unknown as ReactionDispatcherService;
+    return { fake, calls };
+  };
+
+  it('coalesces concurrent reactions into one ordered batch', async () => {
+    const { fake, calls } = dispatcher((_path, body) => ({
+      status: 201,
+      data: {
+        success: true,
+        results: body.items.map((item: ReactionRequest) =>
+          item.name === 'bad' ? { success: false, error: 'boom' } : { success: true, result: item.name }),
+      },
+    }));
+    const batcher = new ReactionBatcherService(config, fake);
+    const results = await Promise.all(['a', 'bad', 'c'].map(name => batcher.execute('http://svc', request(name))));
+    expect(calls.length).toBe(1);
+    expect(calls[0].path).toBe('/execute-batch');
+    expect(calls[0].body.items.map((item: ReactionRequest) => item.name)).toEqual(['a', 'bad', 'c']);
+    expect(results).toEqual([
+      { success: true, result: 'a' },
+      { success: false, error: 'boom' },
+      { success: true, result: 'c' },
+    ]);
+    expect(batcher.getStats().batches).toBe(1);
+  });
+
+  it('sends a lone reaction to /execute', async () => {
+    const { fake, calls } = dispatcher(() => ({ status: 201, data: { success: true, result: 1 } }));
+    const batcher = new ReactionBatcherService(config, fake);
+    expect(await batcher.execute('http://svc', request('a'))).toEqual({ success: true, result: 1 });
+    expect(calls.map(call => call.path)).toEqual(['/execute']);
+  });
+
+  it('falls back to single calls in order when the service has no batch route', async () => {
+    const { fake, calls } = dispatcher((path, body) =>
+      path === '/execute-batch'
+        ? { status: 404, data: { message: 'Cannot POST /execute-batch' } }
+        : { status: 201, data: { success: true, result: body.name } });
+    const batcher = new ReactionBatcherService(config, fake);
+    const results = await Promise.all(['a', 'b'].map(name => batcher.execute('http://svc', request(name))));
+    expect(results.map(result => result.result)).toEqual(['a', 'b']);
+    expect(calls.map(call => call.path)).toEqual(['/execute-batch', '/execute', '/execute']);
+    await batcher.execute('http://svc', request('c'));
+    await batcher.execute('http://svc', request('d'));
+    expect(calls.length).toBe(5);
+    expect(batcher.getStats().unbatchedServices).toEqual(['http://svc']);
+  });
+
+  it('aborts the batch request once every batched reaction is cancelled', async () => {
+    let sent: { signal?: AbortSignal; timeoutMs?: number } = {};
+    const fake = {
+      post: (_url: string, _body: any, signal?: AbortSignal, timeoutMs?: number) => {
+        sent = { signal, timeoutMs };
+        return new Promise((_resolve, reject) => signal?.addEventListener('abort', () => reject(signal.reason)));
+      },
+    } as unknown as ReactionDispatcherService;
+    const batcher = new ReactionBatcherService(config, fake);
+    const controllers = [new AbortController(), new AbortController()];
+    const results = controllers.map(controller =>
+      batcher.execute('http://svc', request('a'), controller.signal).then(() => null, (error: Error) => error.message));
+    await new Promise(resolve => setTimeout(resolve, 20));
+    expect(sent.timeoutMs).toBe(60000);
+    controllers[0].abort(new Error('cancelled'));
+    expect(sent.signal?.aborted).toBe(false);
+    controllers[1].abort(new Error('cancelled'));
+    expect(sent.signal?.aborted).toBe(true);
+    expect(await Promise.all(results)).toEqual(['cancelled', 'cancelled']);
+  });
+
+  it('rejects every item of a batch when the request itself fails', async () => {
+    const { fake } = dispatcher(() => ({ status: 500, data: { message: 'down' } }));
+    const batcher = new ReactionBatcherService(config, fake);
+    const errors = await Promise.all(['a', 'b'].map(name =>
+      batcher.execute('http://svc', request(name)).then(() => null, (error: Error) => error.message)));
+    expect(errors).toEqual(['down', 'down']);
+  });
+});
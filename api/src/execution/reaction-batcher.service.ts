@@ -0,0 +1,178 @@
+import { Injectable, OnModuleDestroy } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { DispatchResponse, ReactionDispatcherService } from './reaction-dispatcher.service';
+
+export interface ReactionRequest {
+    type: 'reaction';
+    name: string;
+    userId: number;
+    config: any;
+    input: any;
+}
+
+export interface ReactionResult {
+    success: boolean;
+    result?: any;
+    error?: string;
+}
+
+interface PendingReaction {
+    request: ReactionRequest;
+    resolve: (result: ReactionResult) => void;
+    reject: (error: any) => void;
+    signal?: AbortSignal;
+}
+
+interface ServiceBatch {
+    pending: PendingReaction[];
+    timer: NodeJS.Timeout;
+}
+
+@Injectable()
+export class ReactionBatcherService implements OnModuleDestroy {
+    private readonly batches = new Map<string, ServiceBatch>();
+    private readonly unbatched = new Set<string>();
+    private readonly windowMs: number;
+    private readonly maxItems: number;
+    private readonly batchTimeout: number;
+    private readonly stats = {
+        single: 0,
+        batches: 0,
+        batchedItems: 0,
+        largestBatch: 0,
+        fallbacks: 0,
+    };
+
+    constructor(
+        private configService: ConfigService,
+        private dispatcher: ReactionDispatcherService,
+    ) {
+        this.windowMs = Number(this.configService.get<string>('REACTION_BATCH_WINDOW_MS', '5')) || 0;
+        this.maxItems = Number(this.configService.get<string>('REACTION_BATCH_MAX_ITEMS', '20')) || 20;
+        this.batchTimeout = Number(this.configService.get<string>('REACTION_BATCH_TIMEOUT_MS', '60000')) || 60000;
+    }
+
+    onModuleDestroy() {
+        for (const serviceUrl of [...this.batches.keys()]) {
+            this.flush(serviceUrl);
+        }
+    }
+
+    execute(serviceUrl: string, request: ReactionRequest, signal?: AbortSignal): Promise<ReactionResult> {
+        if (signal?.aborted) {
+            return Promise.reject(signal.reason);
+        }
+        if (this.windowMs <= 0 || this.maxItems <= 1 || this.unbatched.has(serviceUrl)) {
+            return this.executeOne(serviceUrl, request, signal);
+        }
+        return new Promise<ReactionResult>((settle, fail) => {
+            const onAbort = () => {
+                const batch = this.batches.get(serviceUrl);
+                const index = batch ? batch.pending.indexOf(entry) : -1;
+                if (index !== -1) {
+                    batch!.pending.splice(index, 1);
+                }
+                fail(signal!.reason);
+            };
+            const resolve = (result: ReactionResult) => {
+                signal?.removeEventListener('abort', onAbort);
+                settle(result);
+            };
+            const reject = (error: any) => {
+                signal?.removeEventListener('abort', onAbort);
+                fail(error);
+            };
+            const entry: PendingReaction = { request, resolve, reject, signal };
+            signal?.addEventListener('abort', onAbort, { once: true });
+            let batch = this.batches.get(serviceUrl);
+            if (!batch) {
+                batch = {
+                    pending: [],
+                    timer: setTimeout(() => this.flush(serviceUrl), this.windowMs),
+                };
+                this.batches.set(serviceUrl, batch);
+            }
+            batch.pending.push(entry);
+            if (batch.pending.length >= this.maxItems) {
+                this.flush(serviceUrl);
+            }
+        });
+    }
+
+    getStats() {
+        return {
+            windowMs: this.windowMs,
+            maxItems: this.maxItems,
+            batchTimeoutMs: this.batchTimeout,
+            ...this.stats,
+            averageBatchSize: this.stats.batches > 0 ? this.stats.batchedItems / this.stats.batches : 0,
+            pending: [...this.batches.values()].reduce((total, batch) => total + batch.pending.length, 0),
+            unbatchedServices: [...this.unbatched],
+        };
+    }
+
+    private flush(serviceUrl: string) {
+        const batch = this.batches.get(serviceUrl);
+        if (!batch) {
+            return;
+        }
+        this.batches.delete(serviceUrl);
+        clearTimeout(batch.timer);
+        const { pending } = batch;
+        if (pending.length === 0) {
+            return;
+        }
+        if (pending.length === 1) {
+            this.executeOne(serviceUrl, pending[0].request, pending[0].signal).then(pending[0].resolve, pending[0].reject);
+            return;
+        }
+        this.stats.batches++;
+        this.stats.batchedItems += pending.length;
+        this.stats.largestBatch = Math.max(this.stats.largestBatch, pending.length);
+        const controller = new AbortController();
+        let live = pending.length;
+        const onItemAbort = () => {
+            if (--live === 0) {
+                controller.abort(new Error('Every reaction in the batch was cancelled'));
+            }
+        };
+        for (const entry of pending) {
+            entry.signal?.addEventListener('abort', onItemAbort, { once: true });
+        }
+        this.dispatcher.post(`${serviceUrl}/execute-batch`, { items: pending.map(entry => entry.request) }, controller.signal, this.batchTimeout)
+            .finally(() => {
+                for (const entry of pending) {
+                    entry.signal?.removeEventListener('abort', onItemAbort);
+                }
+            })
+            .then(response => {
+                if (response.status === 404) {
+                    this.unbatched.add(serviceUrl);
+                    this.stats.fallbacks++;
+                    return pending.reduce<Promise<void>>(
+                        (previous, entry) => previous.then(() =>
+                            this.executeOne(serviceUrl, entry.request, entry.signal).then(entry.resolve, entry.reject)),
+                        Promise.resolve(),
+                    );
+                }
+                const results = this.checkResponse(response).results;
+                if (!Array.isArray(results) || results.length !== pending.length) {
+                    throw new Error(`Malformed batch response from ${serviceUrl}: expected ${pending.length} result(s)`);
+                }
+                pending.forEach((entry, index) => entry.resolve(results[index] ?? { success: false }));
+            })
+            .catch(error => pending.forEach(entry => entry.reject(error)));
+    }
+
+    private async executeOne(serviceUrl: string, request: ReactionRequest, signal?: AbortSignal): Promise<ReactionResult> {
+        this.stats.single++;
+        return this.checkResponse(await this.dispatcher.post(`${serviceUrl}/execute`, request, signal));
+    }
+
+    private checkResponse(response: DispatchResponse) {
+        if (response.status >= 400) {
+            throw new Error(response.data?.error || response.data?.message || `Request failed with status code ${response.status}`);
+        }
+        return response.data ?? {};
+    }
+}
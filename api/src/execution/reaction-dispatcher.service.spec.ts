@@ -0,0 +1,80 @@
+import * as http from 'http';
+import { AddressInfo } from 'net';
+import { ConfigService } from '@nestjs/config';
+import { ReactionDispatcherService } from './reaction-dispatcher.service';
+
+describe('ReactionDispatcherService', () => {
+  const config = (values: Record<string, string> = {}) =>
+    ({ get: (key: string, fallback: string) => values[key] ?? fallback }) as unknown as ConfigService;
+
+  const listen = (handler: http.RequestListener) =>
+    new Promise<{ server: http.Server; url: string; connections: () => number }>(resolve => {
+      let connections = 0;
+      const server = http.createServer(handler);
+      server.on('connection', () => connections++);
+      server.listen(0, '127.0.0.1', () => {
+        const { port } = server.address() as AddressInfo;
+        resolve({ server, url: `http://127.0.0.1:${port}`, connections: () => connections });
+      });
+    });
+
+  it('reuses keep-alive sockets across sequential calls', async () => {
+    const { server, url, connections } = await listen((req, res) => {
+      let body = '';
+      req.on('data', chunk => (body += chunk));
+      req.on('end', () => {
+        res.setHeader('Content-Type', 'application/json');
+        res.end(JSON.stringify({ success: true, result: JSON.parse(body) }));
+      });
+    });
+    const dispatcher = new ReactionDispatcherService(config());
+    try {
+      for (let i = 0; i < 5; i++) {
+        const response = await dispatcher.post(`${url}/execute`, { i });
+        expect(response.status).toBe(200);
+        expect(response.data).toEqual({ success: true, result: { i } });
+      }
+      expect(connections()).toBe(1);
+      const stats = dispatcher.getStats().services[url];
+      expect(stats.requests).toBe(5);
+      expect(stats.inFlight).toBe(0);
+      expect(stats.socketsIdle).toBe(1);
+    } finally {
+      dispatcher.onModuleDestroy();
+      server.close();
+    }
+  });
+
+  it('fails slow responses with a timeout', async () => {
+    const { server, url } = await listen(() => undefined);
+    const dispatcher = new ReactionDispatcherService(config({ REACTION_HTTP_TIMEOUT_MS: '50' }));
+    let message = '';
+    try {
+      await dispatcher.post(`${url}/execute`, {}).catch((error: Error) => {
+        message = error.message;
+      });
+      expect(message).toBe(`Reaction request to ${url} timed out after 50ms`);
+      expect(dispatcher.getStats().services[url].timeouts).toBe(1);
+    } finally {
+      dispatcher.onModuleDestroy();
+      server.closeAllConnections();
+      server.close();
+    }
+  });
+
+  it('aborts an in-flight call when the signal fires', async () => {
+    const { server, url } = await listen(() => undefined);
+    const dispatcher = new ReactionDispatcherService(config());
+    const controller = new AbortController();
+    try {
+      const pending = dispatcher.post(`${url}/execute`, {}, controller.signal).catch((error: Error) => error.message);
+      setTimeout(() => controller.abort(new Error('Execution cancelled')), 20);
+      expect(await pending).toBe('Execution cancelled');
+      expect(dispatcher.getStats().services[url].inFlight).toBe(0);
+    } finally {
+      dispatcher.onModuleDestroy();
+      server.closeAllConnections();
+      server.close();
+    }
+  });
+});
@@ -0,0 +1,197 @@
+import { Injectable, OnModuleDestroy } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import * as http from 'http';
+import * as https from 'https';
+
+export interface DispatchResponse {
+    status: number;
+    data: any;
+}
+
+const LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000];
+
+interface ServicePool {
+    agent: http.Agent;
+    transport: typeof http | typeof https;
+    requests: number;
+    errors: number;
+    timeouts: number;
+    inFlight: number;
+    latency: number[];
+    latencyTotalMs: number;
+}
+
+@Injectable()
+export class ReactionDispatcherService implements OnModuleDestroy {
+    private readonly pools = new Map<string, ServicePool>();
+    private readonly maxSockets: number;
+    private readonly connectTimeout: number;
+    private readonly responseTimeout: number;
+    private readonly idleTimeout: number;
+
+    constructor(private configService: ConfigService) {
+        this.maxSockets = Number(this.configService.get<string>('REACTION_HTTP_MAX_SOCKETS', '32')) || 32;
+        this.connectTimeout = Number(this.configService.get<string>('REACTION_HTTP_CONNECT_TIMEOUT_MS', '2000')) || 2000;
+        this.responseTimeout = Number(this.configService.get<string>('REACTION_HTTP_TIMEOUT_MS', '30000')) || 30000;
+        this.idleTimeout = Number(this.configService.get<string>('REACTION_HTTP_IDLE_TIMEOUT_MS', '30000')) || 30000;
+    }
+
+    onModuleDestroy() {
+        for (const pool of this.pools.values()) {
+            pool.agent.destroy();
+        }
+        this.pools.clear();
+    }
+
+    post(url: string, body: any, signal?: AbortSignal, timeoutMs = this.responseTimeout): Promise<DispatchResponse> {
+        if (signal?.aborted) {
+            return Promise.reject(signal.reason);
+        }
+        const target = new URL(url);
+        const pool = this.pool(target);
+        const payload = Buffer.from(JSON.stringify(body ?? {}));
+        const startedAt = Date.now();
+        pool.requests++;
+        pool.inFlight++;
+        return new Promise<DispatchResponse>((resolve, reject) => {
+            let settled = false;
+            let connectTimer: NodeJS.Timeout | null = null;
+            let responseTimer: NodeJS.Timeout | undefined;
+            const onAbort = () => request.destroy(signal!.reason);
+            const finish = (error: any, response?: DispatchResponse) => {
+                if (settled) {
+                    return;
+                }
+                settled = true;
+                clearTimeout(responseTimer);
+                signal?.removeEventListener('abort', onAbort);
+                if (connectTimer) {
+                    clearTimeout(connectTimer);
+                }
+                pool.inFlight--;
+                this.record(pool, Date.now() - startedAt);
+                if (error) {
+                    pool.errors++;
+                    reject(error);
+                } else {
+                    resolve(response!);
+                }
+            };
+            const request = pool.transport.request(target, {
+                method: 'POST',
+                agent: pool.agent,
+                headers: {
+                    'Content-Type': 'application/json',
+                    'Content-Length': payload.length,
+                },
+            });
+            responseTimer = setTimeout(() => {
+                pool.timeouts++;
+                request.destroy(new Error(`Reaction request to ${target.origin} timed out after ${timeoutMs}ms`));
+            }, timeoutMs);
+            request.on('socket', socket => {
+                if (!socket.connecting) {
+                    return;
+                }
+                connectTimer = setTimeout(() => {
+                    pool.timeouts++;
+                    request.destroy(new Error(`Connection to ${target.origin} timed out after ${this.connectTimeout}ms`));
+                }, this.connectTimeout);
+                socket.once('connect', () => {
+                    if (connectTimer) {
+                        clearTimeout(connectTimer);
+                        connectTimer = null;
+                    }
+                });
+            });
+            request.on('response', response => {
+                const chunks: Buffer[] = [];
+                response.on('data', chunk => chunks.push(chunk));
+                response.on('error', error => finish(error));
+                response.on('end', () => {
+                    const text = Buffer.concat(chunks).toString();
+                    let data: any = text;
+                    try {
+                        data = text ? JSON.parse(text) : null;
+                    } catch {
+                        data = text;
+                    }
+                    finish(null, { status: response.statusCode ?? 0, data });
+                });
+            });
+            request.on('error', error => finish(error));
+            signal?.addEventListener('abort', onAbort, { once: true });
+            request.end(payload);
+        });
+    }
+
+    getStats() {
+        const services: Record<string, any> = {};
+        for (const [origin, pool] of this.pools) {
+            services[origin] = {
+                socketsInUse: this.count(pool.agent.sockets),
+                socketsIdle: this.count(pool.agent.freeSockets),
+                queuedRequests: this.count(pool.agent.requests),
+                inFlight: pool.inFlight,
+                requests: pool.requests,
+                errors: pool.errors,
+                timeouts: pool.timeouts,
+                averageLatencyMs: pool.requests - pool.inFlight > 0
+                    ? pool.latencyTotalMs / (pool.requests - pool.inFlight)
+                    : 0,
+                latencyHistogram: Object.fromEntries(
+                    pool.latency.map((count, index) => [
+                        index < LATENCY_BUCKETS_MS.length ? `le_${LATENCY_BUCKETS_MS[index]}ms` : 'gt_10000ms',
+                        count,
+                    ])
+                ),
+            };
+        }
+        return {
+            maxSocketsPerService: this.maxSockets,
+            connectTimeoutMs: this.connectTimeout,
+            responseTimeoutMs: this.responseTimeout,
+            services,
+        };
+    }
+
+    private pool(target: URL): ServicePool {
+        let pool = this.pools.get(target.origin);
+        if (!pool) {
+            const secure = target.protocol === 'https:';
+            const options = {
+                keepAlive: true,
+                maxSockets: this.maxSockets,
+                maxFreeSockets: this.maxSockets,
+                timeout: this.idleTimeout,
+                scheduling: 'lifo' as const,
+            };
+            pool = {
+                agent: secure ? new https.Agent(options) : new http.Agent(options),
+                transport: secure ? https : http,
+                requests: 0,
+                errors: 0,
+                timeouts: 0,
+                inFlight: 0,
+                latency: new Array(LATENCY_BUCKETS_MS.length + 1).fill(0),
+                latencyTotalMs: 0,
+            };
+            this.pools.set(target.origin, pool);
+        }
+        return pool;
+    }
+
+    private record(pool: ServicePool, elapsedMs: number) {
+        const bucket = LATENCY_BUCKETS_MS.findIndex(limit => elapsedMs <= limit);
+        pool.latency[bucket === -1 ? LATENCY_BUCKETS_MS.length : bucket]++;
+        pool.latencyTotalMs += elapsedMs;
+    }
+
+    private count(sockets: NodeJS.ReadOnlyDict<unknown[]>) {
+        let total = 0;
+        for (const list of Object.values(sockets)) {
+            total += list?.length ?? 0;
+        }
+        return total;
+    }
+}
@@ -0,0 +1,96 @@
+import { Injectable, Logger, OnApplicationBootstrap, OnModuleDestroy } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { randomBytes } from 'crypto';
+import { hostname } from 'os';
+import { PrismaService } from '../../prisma/prisma.service';
+
+export enum ReplicaRole {
+    API = 'api',
+    WORKER = 'worker',
+}
+
+@Injectable()
+export class ReplicaService implements OnApplicationBootstrap, OnModuleDestroy {
+    private readonly logger = new Logger(ReplicaService.name);
+    readonly id = `${hostname()}:${process.pid}:${randomBytes(3).toString('hex')}`;
+    readonly role: ReplicaRole;
+    private readonly heartbeatInterval: number;
+    private readonly expireAfter: number;
+    private timer: NodeJS.Timeout | null = null;
+    private live = new Map<ReplicaRole, number>();
+    private heartbeats = 0;
+
+    constructor(
+        private prisma: PrismaService,
+        private configService: ConfigService,
+    ) {
+        this.role = this.configService.get<string>('REPLICA_ROLE', ReplicaRole.API) === ReplicaRole.WORKER
+            ? ReplicaRole.WORKER
+            : ReplicaRole.API;
+        this.heartbeatInterval = Number(this.configService.get<string>('REPLICA_HEARTBEAT_MS', '5000')) || 5000;
+        this.expireAfter = Math.max(
+            Number(this.configService.get<string>('REPLICA_EXPIRE_MS', '15000')) || 15000,
+            2 * this.heartbeatInterval,
+        );
+    }
+
+    onApplicationBootstrap() {
+        const beat = () => {
+            this.heartbeat().catch((error: any) => {
+                this.logger.error(`Replica heartbeat failed: ${error.message}`);
+            });
+        };
+        beat();
+        this.timer = setInterval(beat, this.heartbeatInterval);
+        this.timer.unref();
+        this.logger.log(`Registered as ${this.role} replica ${this.id}`);
+    }
+
+    async onModuleDestroy() {
+        if (this.timer) {
+            clearInterval(this.timer);
+            this.timer = null;
+        }
+        await this.prisma.replica.deleteMany({ where: { id: this.id } }).catch((error: any) => {
+            this.logger.error(`Failed to deregister replica ${this.id}: ${error.message}`);
+        });
+    }
+
+    liveReplicas(role: ReplicaRole): number {
+        return Math.max(this.live.get(role) ?? 0, role === this.role ? 1 : 0);
+    }
+
+    getStats() {
+        return {
+            id: this.id,
+            role: this.role,
+            heartbeatMs: this.heartbeatInterval,
+            expireMs: this.expireAfter,
+            live: {
+                [ReplicaRole.API]: this.liveReplicas(ReplicaRole.API),
+                [ReplicaRole.WORKER]: this.live.get(ReplicaRole.WORKER) ?? 0,
+            },
+            heartbeats: this.heartbeats,
+        };
+    }
+
+    private async heartbeat() {
+        await this.prisma.$executeRaw`
+            INSERT INTO "Replica" ("id", "role", "startedAt", "heartbeatAt")
+            VALUES (${this.id}, ${this.role}, NOW(), NOW())
+            ON CONFLICT ("id") DO UPDATE SET "heartbeatAt" = NOW()
+        `;
+        const live = await this.prisma.$queryRaw<{ role: string; count: number }[]>`
+            SELECT "role", COUNT(*)::int AS "count" FROM "Replica"
+            WHERE "heartbeatAt" > NOW() - make_interval(secs => ${this.expireAfter / 1000})
+            GROUP BY "role"
+        `;
+        this.live = new Map(live.map(row => [row.role as ReplicaRole, row.count]));
+        this.heartbeats++;
+        if (this.heartbeats % 20 === 1) {
+            await this.prisma.$executeRaw`
+                DELETE FROM "Replica" WHERE "heartbeatAt" < NOW() - make_interval(secs => ${(10 * this.expireAfter) / 1000})
+            `;
+        }
+    }
+}
@@ -0,0 +1,105 @@
+import { RunScheduler } from './run-scheduler';
+
+describe('RunScheduler', () => {
+  const limits = { maxSteps: 100, maxDepth: 10, maxParallel: 4 };
+  const graph: Record<number, number[]> = { 1: [2, 3], 2: [4], 3: [], 4: [] };
+  const step = async (nodeId: number) => {
+    const next = graph[nodeId] ?? [];
+    const children: any[] = new Array(next.length);
+    return { result: { nodeId, nextNodes: children }, next, children };
+  };
+
+  it('builds the nested result tree breadth first', async () => {
+    const result = await new RunScheduler(limits, step).run(1);
+    expect(result).toEqual({
+      nodeId: 1,
+      nextNodes: [
+        { nodeId: 2, nextNodes: [{ nodeId: 4, nextNodes: [] }] },
+        { nodeId: 3, nextNodes: [] },
+      ],
+    });
+  });
+
+  it('aborts a cyclic run at the step limit', async () => {
+    const loop = async (nodeId: number) => {
+      const children: any[] = [undefined];
+      return { result: { nodeId, nextNodes: children }, next: [nodeId === 1 ? 2 : 1], children };
+    };
+    const scheduler = new RunScheduler({ maxSteps: 5, maxDepth: 1000, maxParallel: 2 }, loop);
+    await scheduler.run(1);
+    expect(scheduler.aborted).toBe('Execution exceeded the maximum of 5 steps');
+    expect(scheduler.getStats().steps).toBe(5);
+  });
+
+  it('aborts a run that goes too deep', async () => {
+    const chain = async (nodeId: number) => {
+      const children: any[] = [undefined];
+      return { result: { nodeId, nextNodes: children }, next: [nodeId + 1], children };
+    };
+    const scheduler = new RunScheduler({ maxSteps: 1000, maxDepth: 3, maxParallel: 2 }, chain);
+    const result = await scheduler.run(0);
+    expect(scheduler.aborted).toBe('Execution exceeded the maximum depth of 3');
+    expect(result.nextNodes[0].nextNodes[0].nextNodes[0].nextNodes[0]).toEqual({ error: 'Execution exceeded the maximum depth of 3' });
+  });
+
+  it('caps parallel branches', async () => {
+    let active = 0;
+    let peak = 0;
+    const wide = async (nodeId: number) => {
+      active++;
+      peak = Math.max(peak, active);
+      await new Promise(resolve => setTimeout(resolve, 1));
+      active--;
+      const next = nodeId === 0 ? Array.from({ length: 20 }, (_, i) => i + 1) : [];
+      const children: any[] = new Array(next.length);
+      return { result: { nodeId, nextNodes: children }, next, children };
+    };
+    const result = await new RunScheduler({ maxSteps: 100, maxDepth: 5, maxParallel: 3 }, wide).run(0);
+    expect(peak).toBe(3);
+    expect(result.nextNodes.length).toBe(20);
+  });
+
+  it('keeps branch errors in place and rethrows root errors', async () => {
+    const failing = async (nodeId: number) => {
+      if (nodeId === 3) {
+        throw new Error('boom');
+      }
+      return step(nodeId);
+    };
+    const result = await new RunScheduler(limits, failing).run(1);
+    expect(result.nextNodes[1]).toEqual({ error: 'boom' });
+    let rejected = false;
+    await new RunScheduler(limits, failing).run(3).catch(() => {
+      rejected = true;
+    });
+    expect(rejected).toBe(true);
+  });
+
+  it('stops scheduling once the signal aborts and reports the skipped nodes', async () => {
+    const controller = new AbortController();
+    const slow = async (nodeId: number) => {
+      if (nodeId === 2) {
+        controller.abort(new Error('Execution cancelled'));
+      }
+      return step(nodeId);
+    };
+    const scheduler = new RunScheduler({ ...limits, maxParallel: 1 }, slow, controller.signal);
+    const result = await scheduler.run(1);
+    expect(scheduler.aborted).toBe('Execution cancelled');
+    expect(scheduler.skipped).toEqual([3, 4]);
+    expect(result.nextNodes[1]).toEqual({ error: 'Execution cancelled' });
+  });
+
+  it('resumes from a saved frontier, keeping depth and step counts', async () => {
+    const visited: number[] = [];
+    const scheduler = new RunScheduler({ maxSteps: 4, maxDepth: 10, maxParallel: 1 }, async (nodeId: number, depth: number) => {
+      visited.push(nodeId * 10 + depth);
+      return step(nodeId);
+    });
+    const results = await scheduler.resume([{ item: 2, depth: 1 }, { item: 3, depth: 1 }], 2);
+    expect(visited).toEqual([21, 31]);
+    expect(results.map(result => result.nodeId)).toEqual([2, 3]);
+    expect(scheduler.aborted).toBe('Execution exceeded the maximum of 4 steps');
+    expect(scheduler.skipped).toEqual([4]);
+  });
+});
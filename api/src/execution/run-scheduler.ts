@@ -0,0 +1,140 @@
+import { abortReason } from './deadline';
+
+export interface RunLimits {
+    maxSteps: number;
+    maxDepth: number;
+    maxParallel: number;
+}
+
+export interface StepOutcome<T> {
+    result: any;
+    next: T[];
+    children?: any[];
+}
+
+interface QueuedStep<T> {
+    item: T;
+    depth: number;
+    slot: any[];
+    index: number;
+}
+
+export class RunScheduler<T> {
+    private readonly queue: QueuedStep<T>[] = [];
+    private readonly skippedItems: T[] = [];
+    private head = 0;
+    private active = 0;
+    private steps = 0;
+    private deepest = 0;
+    private abortReason: string | null = null;
+
+    constructor(
+        private readonly limits: RunLimits,
+        private readonly step: (item: T, depth: number) => Promise<StepOutcome<T>>,
+        private readonly signal?: AbortSignal,
+    ) { }
+
+    get aborted(): string | null {
+        return this.abortReason;
+    }
+
+    get skipped(): readonly T[] {
+        return this.skippedItems;
+    }
+
+    getStats() {
+        return {
+            steps: this.steps,
+            depth: this.deepest,
+            skipped: this.skippedItems.length,
+            aborted: this.abortReason,
+        };
+    }
+
+    run(root: T): Promise<any> {
+        return this.start([{ item: root, depth: 0 }]).then(results => results[0]);
+    }
+
+    resume(roots: { item: T; depth: number }[], steps = 0): Promise<any[]> {
+        this.steps = steps;
+        return this.start(roots);
+    }
+
+    private start(roots: { item: T; depth: number }[]): Promise<any[]> {
+        const rootSlot: any[] = new Array(roots.length);
+        roots.forEach(({ item, depth }, index) => {
+            this.queue.push({ item, depth, slot: rootSlot, index });
+        });
+        return new Promise((resolve, reject) => {
+            let rootError: any = null;
+            const onAbort = () => {
+                this.abort(abortReason(this.signal!));
+                pump();
+            };
+            const pump = () => {
+                if (this.signal?.aborted) {
+                    this.abort(abortReason(this.signal));
+                }
+                while (!this.abortReason && this.active < this.limits.maxParallel && this.head < this.queue.length) {
+                    const entry = this.queue[this.head];
+                    if (this.steps >= this.limits.maxSteps) {
+                        this.abort(`Execution exceeded the maximum of ${this.limits.maxSteps} steps`);
+                        break;
+                    }
+                    if (entry.depth > this.limits.maxDepth) {
+                        this.abort(`Execution exceeded the maximum depth of ${this.limits.maxDepth}`);
+                        break;
+                    }
+                    this.head++;
+                    this.steps++;
+                    this.active++;
+                    this.deepest = Math.max(this.deepest, entry.depth);
+                    this.step(entry.item, entry.depth).then(
+                        outcome => {
+                            entry.slot[entry.index] = outcome.result;
+                            outcome.next.forEach((item, index) => {
+                                this.queue.push({ item, depth: entry.depth + 1, slot: outcome.children ?? [], index });
+                            });
+                        },
+                        (error: any) => {
+                            if (entry.slot === rootSlot) {
+                                rootError = error;
+                            } else {
+                                entry.slot[entry.index] = { error: error?.message ?? String(error) };
+                            }
+                        },
+                    ).finally(() => {
+                        this.active--;
+                        pump();
+                    });
+                }
+                if (this.active > 0) {
+                    return;
+                }
+                if (this.abortReason) {
+                    for (; this.head < this.queue.length; this.head++) {
+                        const skipped = this.queue[this.head];
+                        skipped.slot[skipped.index] = { error: this.abortReason };
+                        this.skippedItems.push(skipped.item);
+                    }
+                }
+                if (this.head >= this.queue.length) {
+                    this.signal?.removeEventListener('abort', onAbort);
+                    if (rootError) {
+                        reject(rootError);
+                    } else {
+                        resolve(rootSlot);
+                    }
+                }
+            };
+            this.signal?.addEventListener('abort', onAbort, { once: true });
+            pump();
+        });
+    }
+
+    private abort(reason: string) {
+        if (!this.abortReason) {
+            this.abortReason = reason;
+        }
+    }
+}
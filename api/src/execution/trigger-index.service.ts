@@ -0,0 +1,280 @@
+import { Injectable, Logger, OnApplicationBootstrap, OnModuleDestroy } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { PrismaService } from '../../prisma/prisma.service';
+import { ExecutionPlanService } from './execution-plan.service';
+import { TriggerWindow, parseTriggerWindow } from './trigger-window.service';
+
+export interface TriggerTarget {
+    workflowId: number;
+    workflowName: string;
+    triggerNodeId: number;
+    isTriggered: boolean;
+    window: TriggerWindow | null;
+}
+
+interface IndexedWorkflow {
+    userId: number;
+    keys: string[];
+}
+
+interface IndexedWorkflowRow {
+    id: number;
+    name: string;
+    userId: number;
+    isActive: boolean;
+    nodes: { id: number; actionId: number | null; isTriggered: boolean; conf: any }[];
+}
+
+const TARGET_BYTES = 96;
+const KEY_OVERHEAD_BYTES = 80;
+const WORKFLOW_OVERHEAD_BYTES = 120;
+
+@Injectable()
+export class TriggerIndexService implements OnApplicationBootstrap, OnModuleDestroy {
+    private readonly logger = new Logger(TriggerIndexService.name);
+    private readonly actionTtl: number;
+    private readonly rebuildInterval: number;
+    private readonly refreshSeq = new Map<number, number>();
+    private readonly actionIds = new Map<string, { ids: number[]; loadedAt: number }>();
+    private targets = new Map<string, TriggerTarget[]>();
+    private workflows = new Map<number, IndexedWorkflow>();
+    private ready: Promise<void> | null = null;
+    private rebuilding: Set<number> | null = null;
+    private rebuildTimer: NodeJS.Timeout | null = null;
+    private hits = 0;
+    private misses = 0;
+    private actionHits = 0;
+    private actionMisses = 0;
+    private rebuilds = 0;
+    private refreshes = 0;
+
+    constructor(
+        private prisma: PrismaService,
+        private configService: ConfigService,
+        private executionPlans: ExecutionPlanService,
+    ) {
+        this.actionTtl = Number(this.configService.get<string>('TRIGGER_INDEX_ACTION_TTL_MS', '60000')) || 60000;
+        this.rebuildInterval = Number(this.configService.get<string>('TRIGGER_INDEX_REBUILD_MS', '300000')) || 0;
+        this.executionPlans.onInvalidate(workflowId => {
+            this.refreshWorkflow(workflowId).catch((error: any) => {
+                this.logger.error(`Failed to refresh trigger index for workflow ${workflowId}: ${error.message}`);
+            });
+        });
+    }
+
+    onApplicationBootstrap() {
+        this.ready = this.rebuild();
+        if (this.rebuildInterval > 0) {
+            this.rebuildTimer = setInterval(() => {
+                this.rebuild().catch((error: any) => {
+                    this.logger.error(`Trigger index rebuild failed: ${error.message}`);
+                });
+            }, this.rebuildInterval);
+            this.rebuildTimer.unref();
+        }
+    }
+
+    onModuleDestroy() {
+        if (this.rebuildTimer) {
+            clearInterval(this.rebuildTimer);
+            this.rebuildTimer = null;
+        }
+    }
+
+    async resolveActionIds(actionName: string): Promise<number[]> {
+        const cached = this.actionIds.get(actionName);
+        if (cached && Date.now() - cached.loadedAt < this.actionTtl) {
+            this.actionHits++;
+            return cached.ids;
+        }
+        this.actionMisses++;
+        const actions = await this.prisma.actions.findMany({
+            where: { name: actionName },
+            select: { id: true },
+            orderBy: { id: 'asc' },
+        });
+        const ids = actions.map(action => action.id);
+        if (ids.length > 0) {
+            this.actionIds.set(actionName, { ids, loadedAt: Date.now() });
+        } else {
+            this.actionIds.delete(actionName);
+        }
+        return ids;
+    }
+
+    async lookup(userId: number, actionIds: readonly number[]): Promise<TriggerTarget[]> {
+        if (!this.ready) {
+            this.ready = this.rebuild();
+        }
+        await this.ready;
+        const found: TriggerTarget[] = [];
+        for (const actionId of actionIds) {
+            const targets = this.targets.get(this.key(userId, actionId));
+            if (targets) {
+                found.push(...targets);
+            }
+        }
+        if (found.length > 0) {
+            this.hits++;
+        } else {
+            this.misses++;
+        }
+        if (actionIds.length > 1) {
+            found.sort(compareTargets);
+        }
+        return found;
+    }
+
+    async refreshWorkflow(workflowId: number) {
+        const seq = (this.refreshSeq.get(workflowId) ?? 0) + 1;
+        this.refreshSeq.set(workflowId, seq);
+        this.rebuilding?.add(workflowId);
+        const workflow = await this.prisma.workflow.findUnique({
+            where: { id: workflowId },
+            select: this.workflowSelect(),
+        });
+        if (this.refreshSeq.get(workflowId) !== seq) {
+            return;
+        }
+        this.refreshSeq.delete(workflowId);
+        this.unindex(workflowId);
+        if (workflow?.isActive) {
+            this.index(workflow, this.targets, this.workflows);
+            this.sortKeys(this.targets, this.workflows.get(workflowId)?.keys ?? []);
+        }
+        this.refreshes++;
+    }
+
+    getStats() {
+        let targetCount = 0;
+        let keyBytes = 0;
+        for (const [key, targets] of this.targets) {
+            targetCount += targets.length;
+            keyBytes += key.length * 2 + KEY_OVERHEAD_BYTES;
+        }
+        let nameBytes = 0;
+        for (const targets of this.targets.values()) {
+            for (const target of targets) {
+                nameBytes += target.workflowName.length * 2;
+            }
+        }
+        const lookups = this.hits + this.misses;
+        const actionLookups = this.actionHits + this.actionMisses;
+        return {
+            keys: this.targets.size,
+            targets: targetCount,
+            workflows: this.workflows.size,
+            cachedActionNames: this.actionIds.size,
+            approxBytes: keyBytes + nameBytes + targetCount * TARGET_BYTES + this.workflows.size * WORKFLOW_OVERHEAD_BYTES,
+            hits: this.hits,
+            misses: this.misses,
+            hitRate: lookups > 0 ? this.hits / lookups : 0,
+            actionHits: this.actionHits,
+            actionMisses: this.actionMisses,
+            actionHitRate: actionLookups > 0 ? this.actionHits / actionLookups : 0,
+            rebuilds: this.rebuilds,
+            refreshes: this.refreshes,
+        };
+    }
+
+    private async rebuild() {
+        const dirty = new Set<number>();
+        this.rebuilding = dirty;
+        const startedAt = Date.now();
+        try {
+            const workflows = await this.prisma.workflow.findMany({
+                where: {
+                    isActive: true,
+                    nodes: { some: { actionId: { not: null } } },
+                },
+                select: this.workflowSelect(),
+            });
+            const targets = new Map<string, TriggerTarget[]>();
+            const indexed = new Map<number, IndexedWorkflow>();
+            for (const workflow of workflows) {
+                this.index(workflow, targets, indexed);
+            }
+            this.sortKeys(targets, targets.keys());
+            this.targets = targets;
+            this.workflows = indexed;
+            this.rebuilds++;
+            this.logger.log(
+                `Trigger index built: ${indexed.size} workflow(s), ${targets.size} key(s) in ${Date.now() - startedAt}ms`
+            );
+        } finally {
+            if (this.rebuilding === dirty) {
+                this.rebuilding = null;
+            }
+        }
+        for (const workflowId of dirty) {
+            await this.refreshWorkflow(workflowId);
+        }
+    }
+
+    private workflowSelect() {
+        return {
+            id: true,
+            name: true,
+            userId: true,
+            isActive: true,
+            nodes: {
+                where: { actionId: { not: null } },
+                select: { id: true, actionId: true, isTriggered: true, conf: true },
+                orderBy: { id: 'asc' as const },
+            },
+        };
+    }
+
+    private index(workflow: IndexedWorkflowRow, targets: Map<string, TriggerTarget[]>, indexed: Map<number, IndexedWorkflow>) {
+        const keys: string[] = [];
+        for (const node of workflow.nodes) {
+            if (node.actionId === null) {
+                continue;
+            }
+            const key = this.key(workflow.userId, node.actionId);
+            const list = targets.get(key) ?? [];
+            list.push({
+                workflowId: workflow.id,
+                workflowName: workflow.name,
+                triggerNodeId: node.id,
+                isTriggered: node.isTriggered,
+                window: parseTriggerWindow(node.conf),
+            });
+            targets.set(key, list);
+            keys.push(key);
+        }
+        if (keys.length > 0) {
+            indexed.set(workflow.id, { userId: workflow.userId, keys });
+        }
+    }
+
+    private sortKeys(targets: Map<string, TriggerTarget[]>, keys: Iterable<string>) {
+        for (const key of new Set(keys)) {
+            targets.get(key)?.sort(compareTargets);
+        }
+    }
+
+    private unindex(workflowId: number) {
+        const entry = this.workflows.get(workflowId);
+        if (!entry) {
+            return;
+        }
+        for (const key of new Set(entry.keys)) {
+            const remaining = (this.targets.get(key) ?? []).filter(target => target.workflowId !== workflowId);
+            if (remaining.length > 0) {
+                this.targets.set(key, remaining);
+            } else {
+                this.targets.delete(key);
+            }
+        }
+        this.workflows.delete(workflowId);
+    }
+
+    private key(userId: number, actionId: number) {
+        return `${userId}:${actionId}`;
+    }
+}
+
+function compareTargets(a: TriggerTarget, b: TriggerTarget) {
+    return a.workflowId - b.workflowId || a.triggerNodeId - b.triggerNodeId;
+}
@@ -0,0 +1,90 @@
+import { ConfigService } from '@nestjs/config';
+import { PrismaService } from '../../prisma/prisma.service';
+import { TriggerTarget } from './trigger-index.service';
+import { TriggerWindow, TriggerWindowService, parseTriggerWindow } from './trigger-window.service';
+
+describe('TriggerWindowService', () => {
+  const config = { get: (_key: string, fallback: string) => fallback } as unknown as ConfigService;
+
+  const target = (window: TriggerWindow | null): TriggerTarget => ({
+    workflowId: 1,
+    workflowName: 'wf',
+    triggerNodeId: 10,
+    isTriggered: true,
+    window,
+  });
+
+  const setup = (state: { fires?: number[]; held?: number; dueAt?: Date | null } = {}) => {
+    const updates: any[][] = [];
+    let drains = 0;
+    const tx = {
+      $queryRaw: async () => [{ fires: [], held: 0, dueAt: null, ...state }],
+      $executeRaw: async (_sql: TemplateStringsArray, ...values: any[]) => {
+        updates.push(values);
+        return 1;
+      },
+    };
+    const prisma = {
+      $transaction: async (run: (client: typeof tx) => Promise<unknown>) => run(tx),
+      $queryRaw: async () => {
+        drains++;
+        return [];
+      },
+    } as unknown as PrismaService;
+    return { service: new TriggerWindowService(prisma, config), updates, drains: () => drains };
+  };
+
+  it('parses window options from the node configuration', () => {
+    expect(parseTriggerWindow({ window: { mode: 'debounce', ms: 200 } })).toEqual({ mode: 'debounce', ms: 200 });
+    expect(parseTriggerWindow({ window: { mode: 'throttle', ms: 1000 } })).toEqual({ mode: 'throttle', ms: 1000, limit: 1 });
+    expect(parseTriggerWindow({ window: { mode: 'batch', ms: 9999999, maxEvents: 5000 } }))
+      .toEqual({ mode: 'batch', ms: 3600000, maxEvents: 1000 });
+    expect(parseTriggerWindow({ window: { mode: 'debounce' } })).toBe(null);
+    expect(parseTriggerWindow({ window: { mode: 'other', ms: 10 } })).toBe(null);
+    expect(parseTriggerWindow({ filter: 'x' })).toBe(null);
+    expect(parseTriggerWindow(null)).toBe(null);
+  });
+
+  it('runs events immediately without a window', async () => {
+    const { service, updates } = setup();
+    expect(await service.admit(1, 'push', target(null), { a: 1 })).toEqual({ action: 'run', input: { a: 1 } });
+    expect(updates).toEqual([]);
+  });
+
+  it('counts throttled fires from the stored window and prunes expired ones', async () => {
+    const now = Date.now();
+    const throttled = target({ mode: 'throttle', ms: 60000, limit: 2 });
+    const full = setup({ fires: [now - 120000, now - 2000, now - 1000] });
+    expect(await full.service.admit(1, 'push', throttled, { i: 1 })).toEqual({ action: 'drop', mode: 'throttle' });
+    expect(JSON.parse(full.updates[0][0])).toEqual([now - 2000, now - 1000]);
+
+    const open = setup({ fires: [now - 120000, now - 1000] });
+    expect(await open.service.admit(1, 'push', throttled, { i: 2 })).toEqual({ action: 'run', input: { i: 2 } });
+    expect(JSON.parse(open.updates[0][0]).length).toBe(2);
+  });
+
+  it('stores only the last event of a debounced burst with a new deadline', async () => {
+    const { service, updates } = setup({ held: 1, dueAt: new Date() });
+    const before = Date.now();
+    expect(await service.admit(1, 'push', target({ mode: 'debounce', ms: 500 }), { i: 4 }))
+      .toEqual({ action: 'hold', mode: 'debounce' });
+    const [events, dueAt] = updates[0];
+    expect(JSON.parse(events)).toEqual([{ i: 4 }]);
+    expect(dueAt.getTime()).toBeGreaterThanOrEqual(before + 500);
+  });
+
+  it('appends batched events and flushes a full batch right away', async () => {
+    const batched = target({ mode: 'batch', ms: 60000, maxEvents: 3 });
+    const dueAt = new Date(Date.now() + 30000);
+    const partial = setup({ held: 1, dueAt });
+    expect(await partial.service.admit(1, 'push', batched, { i: 2 })).toEqual({ action: 'hold', mode: 'batch' });
+    expect(partial.updates[0]).toEqual([JSON.stringify([{ i: 2 }]), dueAt, 10]);
+    expect(partial.drains()).toBe(0);
+
+    const full = setup({ held: 2, dueAt });
+    await full.service.admit(1, 'push', batched, { i: 3 });
+    expect(full.updates[0][1].getTime()).toBeLessThanOrEqual(Date.now());
+    await full.service.flushDue();
+    expect(full.drains()).toBe(1);
+  });
+});
@@ -0,0 +1,235 @@
+import { Injectable, Logger, OnModuleInit, OnModuleDestroy } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { PrismaService } from '../../prisma/prisma.service';
+import type { TriggerTarget } from './trigger-index.service';
+
+export type TriggerWindow =
+    | { mode: 'debounce'; ms: number }
+    | { mode: 'throttle'; ms: number; limit: number }
+    | { mode: 'batch'; ms: number; maxEvents: number };
+
+export type WindowDecision =
+    | { action: 'run'; input: any }
+    | { action: 'hold'; mode: 'debounce' | 'batch' }
+    | { action: 'drop'; mode: 'throttle' };
+
+interface WindowState {
+    fires: number[];
+    held: number;
+    dueAt: Date | null;
+}
+
+const MAX_WINDOW_MS = 3600000;
+const DEFAULT_BATCH_EVENTS = 100;
+const MAX_BATCH_EVENTS = 1000;
+
+export function parseTriggerWindow(conf: any): TriggerWindow | null {
+    const window = conf?.window;
+    const ms = Math.floor(Number(window?.ms));
+    if (!window || typeof window !== 'object' || !(ms > 0)) {
+        return null;
+    }
+    const boundedMs = Math.min(ms, MAX_WINDOW_MS);
+    switch (window.mode) {
+        case 'debounce':
+            return { mode: 'debounce', ms: boundedMs };
+        case 'throttle': {
+            const limit = Math.floor(Number(window.limit ?? 1));
+            return limit > 0 ? { mode: 'throttle', ms: boundedMs, limit } : null;
+        }
+        case 'batch': {
+            const maxEvents = Math.floor(Number(window.maxEvents ?? DEFAULT_BATCH_EVENTS));
+            return maxEvents > 0 ? { mode: 'batch', ms: boundedMs, maxEvents: Math.min(maxEvents, MAX_BATCH_EVENTS) } : null;
+        }
+        default:
+            return null;
+    }
+}
+
+@Injectable()
+export class TriggerWindowService implements OnModuleInit, OnModuleDestroy {
+    private readonly logger = new Logger(TriggerWindowService.name);
+    private readonly listeners: (() => void)[] = [];
+    private readonly pollInterval: number;
+    private readonly maxAttempts: number;
+    private readonly stats = {
+        passed: 0,
+        debounced: 0,
+        batched: 0,
+        throttled: 0,
+        flushes: 0,
+        pruned: 0,
+    };
+    private pollTimer: NodeJS.Timeout | null = null;
+    private pruneTimer: NodeJS.Timeout | null = null;
+    private flushing: Promise<void> | null = null;
+
+    constructor(
+        private prisma: PrismaService,
+        private configService: ConfigService,
+    ) {
+        this.pollInterval = Number(this.configService.get<string>('TRIGGER_WINDOW_POLL_MS', '1000')) || 1000;
+        this.maxAttempts = Number(this.configService.get<string>('TRIGGER_JOB_MAX_ATTEMPTS', '3')) || 3;
+    }
+
+    onModuleInit() {
+        this.pollTimer = setInterval(() => void this.flushDue(), this.pollInterval);
+        this.pollTimer.unref();
+        this.pruneTimer = setInterval(() => {
+            this.prune().catch((error: any) => {
+                this.logger.error(`Failed to prune trigger windows: ${error.message}`);
+            });
+        }, 60000);
+        this.pruneTimer.unref();
+    }
+
+    async onModuleDestroy() {
+        if (this.pollTimer) {
+            clearInterval(this.pollTimer);
+            this.pollTimer = null;
+        }
+        if (this.pruneTimer) {
+            clearInterval(this.pruneTimer);
+            this.pruneTimer = null;
+        }
+        await this.flushing;
+    }
+
+    onFlush(listener: () => void) {
+        this.listeners.push(listener);
+    }
+
+    async admit(userId: number, actionName: string, target: TriggerTarget, data: any): Promise<WindowDecision> {
+        const window = target.window;
+        if (!window) {
+            this.stats.passed++;
+            return { action: 'run', input: data };
+        }
+        const nodeId = target.triggerNodeId;
+        let full = false;
+        const decision = await this.prisma.$transaction(async tx => {
+            const [state] = await tx.$queryRaw<WindowState[]>`
+                INSERT INTO "TriggerWindow" ("nodeId", "userId", "actionName", "mode")
+                VALUES (${nodeId}, ${userId}, ${actionName}, ${window.mode})
+                ON CONFLICT ("nodeId") DO UPDATE
+                SET "userId" = EXCLUDED."userId", "actionName" = EXCLUDED."actionName", "mode" = EXCLUDED."mode"
+                RETURNING "fires", jsonb_array_length("events")::int AS "held", "dueAt"
+            `;
+            const now = Date.now();
+            if (window.mode === 'throttle') {
+                const recent = state.fires.filter(at => at > now - window.ms);
+                const allowed = recent.length < window.limit;
+                if (allowed) {
+                    recent.push(now);
+                }
+                await tx.$executeRaw`
+                    UPDATE "TriggerWindow"
+                    SET "fires" = ${JSON.stringify(recent)}::jsonb, "expiresAt" = ${new Date(Math.max(...recent) + window.ms)}
+                    WHERE "nodeId" = ${nodeId}
+                `;
+                return allowed ? { action: 'run' as const, input: data } : { action: 'drop' as const, mode: 'throttle' as const };
+            }
+            if (window.mode === 'debounce') {
+                await tx.$executeRaw`
+                    UPDATE "TriggerWindow"
+                    SET "events" = ${JSON.stringify([data ?? null])}::jsonb, "dueAt" = ${new Date(now + window.ms)}
+                    WHERE "nodeId" = ${nodeId}
+                `;
+                return { action: 'hold' as const, mode: 'debounce' as const };
+            }
+            full = state.held + 1 >= window.maxEvents;
+            const dueAt = full ? new Date(now) : state.dueAt ?? new Date(now + window.ms);
+            await tx.$executeRaw`
+                UPDATE "TriggerWindow"
+                SET "events" = "events" || ${JSON.stringify([data ?? null])}::jsonb, "dueAt" = ${dueAt}
+                WHERE "nodeId" = ${nodeId}
+            `;
+            return { action: 'hold' as const, mode: 'batch' as const };
+        });
+        if (decision.action === 'run') {
+            this.stats.passed++;
+        } else if (decision.action === 'drop') {
+            this.stats.throttled++;
+        } else {
+            this.stats[decision.mode === 'debounce' ? 'debounced' : 'batched']++;
+        }
+        if (full) {
+            void this.flushDue();
+        }
+        return decision;
+    }
+
+    async getStats() {
+        const [windows] = await this.prisma.$queryRaw<{ windows: number; openWindows: number; heldEvents: number }[]>`
+            SELECT COUNT(*)::int AS "windows",
+                   COUNT("dueAt")::int AS "openWindows",
+                   COALESCE(SUM(jsonb_array_length("events")), 0)::int AS "heldEvents"
+            FROM "TriggerWindow"
+        `;
+        return {
+            ...this.stats,
+            ...windows,
+            pollIntervalMs: this.pollInterval,
+        };
+    }
+
+    flushDue(): Promise<void> {
+        this.flushing ??= this.drain()
+            .catch((error: any) => {
+                this.logger.error(`Failed to flush trigger windows: ${error.message}`);
+            })
+            .finally(() => {
+                this.flushing = null;
+            });
+        return this.flushing;
+    }
+
+    private async drain() {
+        const jobs = await this.prisma.$queryRaw<{ id: number; triggerNodeId: number }[]>`
+            WITH drained AS (
+                UPDATE "TriggerWindow" w
+                SET "events" = '[]'::jsonb, "dueAt" = NULL
+                FROM (
+                    SELECT "nodeId", "userId", "actionName", "mode", "events"
+                    FROM "TriggerWindow"
+                    WHERE "dueAt" <= NOW()
+                    ORDER BY "dueAt"
+                    LIMIT 100
+                    FOR UPDATE SKIP LOCKED
+                ) due
+                WHERE w."nodeId" = due."nodeId"
+                RETURNING due.*
+            )
+            INSERT INTO "TriggerJob" ("userId", "actionName", "payload", "maxAttempts", "triggerNodeId")
+            SELECT "userId",
+                   "actionName",
+                   CASE WHEN "mode" = 'batch'
+                       THEN jsonb_build_object('events', "events", 'count', jsonb_array_length("events"))
+                       ELSE "events" -> -1
+                   END,
+                   ${this.maxAttempts},
+                   "nodeId"
+            FROM drained
+            WHERE jsonb_array_length("events") > 0
+            RETURNING "id", "triggerNodeId"
+        `;
+        if (jobs.length === 0) {
+            return;
+        }
+        this.stats.flushes += jobs.length;
+        this.logger.log(`Flushed ${jobs.length} trigger window(s) into trigger jobs`);
+        for (const listener of this.listeners) {
+            listener();
+        }
+    }
+
+    private async prune() {
+        const pruned = await this.prisma.triggerWindow.deleteMany({
+            where: {
+                dueAt: null,
+                OR: [{ expiresAt: null }, { expiresAt: { lte: new Date() } }],
+            },
+        });
+        this.stats.pruned += pruned.count;
+    }
+}
@@ -0,0 +1,81 @@
+import { ConditionCache, ConditionSyntaxError, compileCondition, compileStructuredCondition } from './condition-compiler';
+
+describe('compileCondition', () => {
+  it('evaluates the literal comparisons used by IF nodes', () => {
+    expect(compileCondition('2 == 2')({})).toBe(true);
+    expect(compileCondition('2 == 1')({})).toBe(false);
+    expect(compileCondition('1 == 1')({})).toBe(true);
+    expect(compileCondition('1 == 2')({})).toBe(false);
+    expect(compileCondition('true')({})).toBe(true);
+    expect(compileCondition('false')({})).toBe(false);
+  });
+
+  it('resolves placeholders and nested field paths without rewriting the source', () => {
+    const input = { count: 12, author: { name: 'Ada' }, tags: ['a', 'b'] };
+    expect(compileCondition('${count} > 10')(input)).toBe(true);
+    expect(compileCondition('${input.author.name} == "Ada"')(input)).toBe(true);
+    expect(compileCondition('author.name === \'Ada\' && count <= 12')(input)).toBe(true);
+    expect(compileCondition('tags[1] == "b"')(input)).toBe(true);
+    expect(compileCondition('missing.field == null')(input)).toBe(true);
+  });
+
+  it('supports boolean operators, precedence and grouping', () => {
+    expect(compileCondition('1 + 2 * 3 == 7')({})).toBe(true);
+    expect(compileCondition('(1 + 2) * 3 == 9')({})).toBe(true);
+    expect(compileCondition('!(1 > 2) and not false')({})).toBe(true);
+    expect(compileCondition('1 > 2 || 3 > 2 && 0')({})).toBe(0);
+  });
+
+  it('supports string and number functions', () => {
+    const input = { subject: '  Invoice #42  ', amount: '19.5' };
+    expect(compileCondition('contains(lower(subject), "invoice")')(input)).toBe(true);
+    expect(compileCondition('startsWith(trim(subject), "Invoice")')(input)).toBe(true);
+    expect(compileCondition('number(amount) >= 19 && len(trim(subject)) == 11')(input)).toBe(true);
+    expect(compileCondition('exists(subject) && !exists(other)')(input)).toBe(true);
+  });
+
+  it('rejects code outside the expression language', () => {
+    expect(() => compileCondition('process.exit(1)')).toThrow(ConditionSyntaxError);
+    expect(() => compileCondition('constructor.constructor("return 1")()')).toThrow(ConditionSyntaxError);
+    expect(() => compileCondition('a = 1')).toThrow(ConditionSyntaxError);
+    expect(() => compileCondition('1 ==')).toThrow(ConditionSyntaxError);
+    expect(() => compileCondition('"unterminated')).toThrow(ConditionSyntaxError);
+  });
+
+  it('does not read through the prototype chain', () => {
+    expect(compileCondition('toString')({})).toBeUndefined();
+    expect(compileCondition('a["__proto__"]')({ a: {} })).toBeUndefined();
+  });
+});
+
+describe('compileStructuredCondition', () => {
+  it('compares resolved operands', () => {
+    const condition = compileStructuredCondition({ operator: '>=', left: '${score}', right: 10 });
+    expect(condition({ score: 10 })).toBe(true);
+    expect(condition({ score: 9 })).toBe(false);
+  });
+
+  it('guards operands like placeholders in expressions', () => {
+    expect(compileStructuredCondition({ operator: '==', left: '${toString}', right: undefined })({})).toBe(true);
+    expect(compileStructuredCondition({ operator: '==', left: '${user.age}', right: 30 })({ user: { age: 30 } })).toBe(true);
+    expect(() => compileStructuredCondition({ operator: '==', left: '${__proto__}', right: 1 })).toThrow(ConditionSyntaxError);
+    expect(() => compileStructuredCondition({ operator: '==', left: '${constructor}', right: 1 })).toThrow(ConditionSyntaxError);
+  });
+});
+
+describe('ConditionCache', () => {
+  it('compiles each condition once and evicts the oldest entry first', () => {
+    const cache = new ConditionCache(2);
+    const first = cache.get('1 == 1');
+    expect(cache.get('1 == 1')).toBe(first);
+    cache.get('2 == 2');
+    cache.get('3 == 3');
+    expect(cache.getStats()).toEqual({ entries: 2, hits: 1, misses: 3 });
+    expect(cache.get('1 == 1')).not.toBe(first);
+  });
+
+  it('turns syntax errors into a condition that throws when evaluated', () => {
+    const cache = new ConditionCache();
+    expect(() => cache.get('1 ==')({})).toThrow(ConditionSyntaxError);
+  });
+});
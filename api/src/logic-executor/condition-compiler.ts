@@ -0,0 +1,423 @@
+export type CompiledCondition = (input: any) => any;
+
+export class ConditionSyntaxError extends Error { }
+
+type TokenType = 'number' | 'string' | 'identifier' | 'placeholder' | 'operator' | 'punctuation' | 'end';
+
+interface Token {
+    type: TokenType;
+    value: string;
+    position: number;
+}
+
+const MAX_SOURCE_LENGTH = 4096;
+const MAX_DEPTH = 64;
+const FORBIDDEN_KEYS = new Set(['__proto__', 'prototype', 'constructor']);
+const OPERATORS = ['===', '!==', '==', '!=', '<=', '>=', '&&', '||', '<', '>', '!', '+', '-', '*', '/', '%'];
+const KEYWORD_OPERATORS: Record<string, string> = { and: '&&', or: '||', not: '!' };
+const BINARY_PRECEDENCE: Record<string, number> = {
+    '||': 1,
+    '&&': 2,
+    '==': 3, '!=': 3, '===': 3, '!==': 3,
+    '<': 4, '<=': 4, '>': 4, '>=': 4,
+    '+': 5, '-': 5,
+    '*': 6, '/': 6, '%': 6,
+};
+
+const FUNCTIONS: Record<string, (...args: any[]) => any> = {
+    contains: (haystack, needle) => typeof haystack === 'string'
+        ? haystack.includes(String(needle))
+        : Array.isArray(haystack) && haystack.includes(needle),
+    startsWith: (value, prefix) => typeof value === 'string' && value.startsWith(String(prefix)),
+    endsWith: (value, suffix) => typeof value === 'string' && value.endsWith(String(suffix)),
+    lower: value => String(value ?? '').toLowerCase(),
+    upper: value => String(value ?? '').toUpperCase(),
+    trim: value => String(value ?? '').trim(),
+    len: value => typeof value === 'string' || Array.isArray(value)
+        ? value.length
+        : value && typeof value === 'object' ? Object.keys(value).length : 0,
+    number: value => Number(value),
+    string: value => value === undefined || value === null ? '' : typeof value === 'object' ? JSON.stringify(value) : String(value),
+    exists: value => value !== undefined && value !== null,
+    abs: value => Math.abs(value),
+    round: value => Math.round(value),
+    floor: value => Math.floor(value),
+    ceil: value => Math.ceil(value),
+    min: (...values) => Math.min(...values),
+    max: (...values) => Math.max(...values),
+};
+
+function readMember(target: any, key: any): any {
+    if (target === null || target === undefined) {
+        return undefined;
+    }
+    const property = typeof key === 'number' ? key : String(key);
+    if (typeof property === 'string' && FORBIDDEN_KEYS.has(property)) {
+        return undefined;
+    }
+    if (typeof target !== 'object' && typeof target !== 'string') {
+        return undefined;
+    }
+    return Object.prototype.hasOwnProperty.call(target, property) ? target[property] : undefined;
+}
+
+function tokenize(source: string): Token[] {
+    const tokens: Token[] = [];
+    let i = 0;
+    while (i < source.length) {
+        const char = source[i];
+        if (/\s/.test(char)) {
+            i++;
+            continue;
+        }
+        if (/[0-9]/.test(char) || (char === '.' && /[0-9]/.test(source[i + 1] ?? ''))) {
+            const match = /^(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?/.exec(source.slice(i))!;
+            tokens.push({ type: 'number', value: match[0], position: i });
+            i += match[0].length;
+            continue;
+        }
+        if (char === '"' || char === '\'') {
+            let value = '';
+            let j = i + 1;
+            while (j < source.length && source[j] !== char) {
+                if (source[j] === '\\' && j + 1 < source.length) {
+                    const escaped = source[j + 1];
+                    value += escaped === 'n' ? '\n' : escaped === 't' ? '\t' : escaped;
+                    j += 2;
+                } else {
+                    value += source[j++];
+                }
+            }
+            if (j >= source.length) {
+                throw new ConditionSyntaxError(`Unterminated string at position ${i}`);
+            }
+            tokens.push({ type: 'string', value, position: i });
+            i = j + 1;
+            continue;
+        }
+        if (char === '$' && source[i + 1] === '{') {
+            const end = source.indexOf('}', i + 2);
+            if (end === -1) {
+                throw new ConditionSyntaxError(`Unterminated placeholder at position ${i}`);
+            }
+            tokens.push({ type: 'placeholder', value: source.slice(i + 2, end).trim(), position: i });
+            i = end + 1;
+            continue;
+        }
+        if (/[A-Za-z_$]/.test(char)) {
+            const match = /^[A-Za-z_$][\w$]*/.exec(source.slice(i))!;
+            const keyword = Object.prototype.hasOwnProperty.call(KEYWORD_OPERATORS, match[0])
+                ? KEYWORD_OPERATORS[match[0]]
+                : undefined;
+            tokens.push({ type: keyword ? 'operator' : 'identifier', value: keyword ?? match[0], position: i });
+            i += match[0].length;
+            continue;
+        }
+        const operator = OPERATORS.find(op => source.startsWith(op, i));
+        if (operator) {
+            tokens.push({ type: 'operator', value: operator, position: i });
+            i += operator.length;
+            continue;
+        }
+        if ('()[],.'.includes(char)) {
+            tokens.push({ type: 'punctuation', value: char, position: i });
+            i++;
+            continue;
+        }
+        throw new ConditionSyntaxError(`Unexpected character "${char}" at position ${i}`);
+    }
+    tokens.push({ type: 'end', value: '', position: source.length });
+    return tokens;
+}
+
+class Parser {
+    private index = 0;
+    private depth = 0;
+
+    constructor(private readonly tokens: Token[]) { }
+
+    parse(): CompiledCondition {
+        const expression = this.expression(0);
+        const token = this.peek();
+        if (token.type !== 'end') {
+            throw new ConditionSyntaxError(`Unexpected "${token.value}" at position ${token.position}`);
+        }
+        return expression;
+    }
+
+    private expression(minPrecedence: number): CompiledCondition {
+        if (++this.depth > MAX_DEPTH) {
+            throw new ConditionSyntaxError('Expression is nested too deeply');
+        }
+        let left = this.unary();
+        for (;;) {
+            const token = this.peek();
+            const precedence = token.type === 'operator' ? BINARY_PRECEDENCE[token.value] : undefined;
+            if (precedence === undefined || precedence <= minPrecedence) {
+                break;
+            }
+            this.index++;
+            left = binary(token.value, left, this.expression(precedence));
+        }
+        this.depth--;
+        return left;
+    }
+
+    private unary(): CompiledCondition {
+        const token = this.peek();
+        if (token.type === 'operator' && (token.value === '!' || token.value === '-' || token.value === '+')) {
+            this.index++;
+            if (++this.depth > MAX_DEPTH) {
+                throw new ConditionSyntaxError('Expression is nested too deeply');
+            }
+            const operand = this.unary();
+            this.depth--;
+            if (token.value === '!') {
+                return input => !operand(input);
+            }
+            return token.value === '-' ? input => -operand(input) : input => +operand(input);
+        }
+        return this.postfix(this.primary());
+    }
+
+    private primary(): CompiledCondition {
+        const token = this.next();
+        switch (token.type) {
+            case 'number': {
+                const value = Number(token.value);
+                return () => value;
+            }
+            case 'string': {
+                const value = token.value;
+                return () => value;
+            }
+            case 'placeholder':
+                return pathAccessor(token.value, token.position);
+            case 'identifier': {
+                if (token.value === 'true') {
+                    return () => true;
+                }
+                if (token.value === 'false') {
+                    return () => false;
+                }
+                if (token.value === 'null') {
+                    return () => null;
+                }
+                if (this.peek().value === '(') {
+                    return this.call(token);
+                }
+                if (token.value === 'input') {
+                    return input => input;
+                }
+                checkKey(token.value, token.position);
+                const key = token.value;
+                return input => readMember(input, key);
+            }
+            case 'punctuation':
+                if (token.value === '(') {
+                    const inner = this.expression(0);
+                    this.expect(')');
+                    return inner;
+                }
+                break;
+        }
+        throw new ConditionSyntaxError(
+            token.type === 'end' ? 'Unexpected end of expression' : `Unexpected "${token.value}" at position ${token.position}`
+        );
+    }
+
+    private postfix(target: CompiledCondition): CompiledCondition {
+        for (;;) {
+            const token = this.peek();
+            if (token.value === '.' && token.type === 'punctuation') {
+                this.index++;
+                const name = this.next();
+                if (name.type !== 'identifier') {
+                    throw new ConditionSyntaxError(`Expected a field name at position ${name.position}`);
+                }
+                checkKey(name.value, name.position);
+                const owner = target;
+                const key = name.value;
+                target = input => readMember(owner(input), key);
+            } else if (token.value === '[' && token.type === 'punctuation') {
+                this.index++;
+                const owner = target;
+                const key = this.expression(0);
+                this.expect(']');
+                target = input => readMember(owner(input), key(input));
+            } else {
+                return target;
+            }
+        }
+    }
+
+    private call(name: Token): CompiledCondition {
+        const fn = Object.prototype.hasOwnProperty.call(FUNCTIONS, name.value) ? FUNCTIONS[name.value] : undefined;
+        if (!fn) {
+            throw new ConditionSyntaxError(`Unknown function "${name.value}" at position ${name.position}`);
+        }
+        this.expect('(');
+        const args: CompiledCondition[] = [];
+        if (this.peek().value !== ')') {
+            do {
+                args.push(this.expression(0));
+            } while (this.accept(','));
+        }
+        this.expect(')');
+        return input => fn(...args.map(arg => arg(input)));
+    }
+
+    private peek(): Token {
+        return this.tokens[this.index];
+    }
+
+    private next(): Token {
+        const token = this.tokens[this.index];
+        if (token.type !== 'end') {
+            this.index++;
+        }
+        return token;
+    }
+
+    private accept(value: string): boolean {
+        const token = this.peek();
+        if (token.type === 'punctuation' && token.value === value) {
+            this.index++;
+            return true;
+        }
+        return false;
+    }
+
+    private expect(value: string) {
+        if (!this.accept(value)) {
+            const token = this.peek();
+            throw new ConditionSyntaxError(`Expected "${value}" at position ${token.position}`);
+        }
+    }
+}
+
+function checkKey(key: string, position: number) {
+    if (FORBIDDEN_KEYS.has(key)) {
+        throw new ConditionSyntaxError(`Access to "${key}" is not allowed at position ${position}`);
+    }
+}
+
+function pathAccessor(path: string, position: number): CompiledCondition {
+    const segments = path.split('.').map(segment => segment.trim());
+    if (segments[0] === 'input' && segments.length > 1) {
+        segments.shift();
+    }
+    for (const segment of segments) {
+        if (!segment) {
+            throw new ConditionSyntaxError(`Invalid placeholder "\${${path}}" at position ${position}`);
+        }
+        checkKey(segment, position);
+    }
+    return input => {
+        let value = input;
+        for (const segment of segments) {
+            value = readMember(value, segment);
+        }
+        return value;
+    };
+}
+
+function binary(operator: string, left: CompiledCondition, right: CompiledCondition): CompiledCondition {
+    switch (operator) {
+        case '||': return input => left(input) || right(input);
+        case '&&': return input => left(input) && right(input);
+        case '==': return input => left(input) == right(input);
+        case '!=': return input => left(input) != right(input);
+        case '===': return input => left(input) === right(input);
+        case '!==': return input => left(input) !== right(input);
+        case '<': return input => left(input) < right(input);
+        case '<=': return input => left(input) <= right(input);
+        case '>': return input => left(input) > right(input);
+        case '>=': return input => left(input) >= right(input);
+        case '+': return input => left(input) + right(input);
+        case '-': return input => left(input) - right(input);
+        case '*': return input => left(input) * right(input);
+        case '/': return input => left(input) / right(input);
+        case '%': return input => left(input) % right(input);
+    }
+    throw new ConditionSyntaxError(`Unknown operator "${operator}"`);
+}
+
+export function compileCondition(source: string): CompiledCondition {
+    if (source.length > MAX_SOURCE_LENGTH) {
+        throw new ConditionSyntaxError(`Condition exceeds ${MAX_SOURCE_LENGTH} characters`);
+    }
+    return new Parser(tokenize(source)).parse();
+}
+
+export function compileStructuredCondition(condition: { operator: string; left: any; right: any }): CompiledCondition {
+    const operand = (value: any): CompiledCondition => {
+        if (typeof value === 'string' && value.startsWith('${') && value.endsWith('}')) {
+            return pathAccessor(value.slice(2, -1), 0);
+        }
+        return () => value;
+    };
+    const left = operand(condition.left);
+    const right = operand(condition.right);
+    switch (condition.operator) {
+        case '==':
+        case '===':
+            return input => left(input) === right(input);
+        case '!=':
+        case '!==':
+            return input => left(input) !== right(input);
+        case '>':
+        case '<':
+        case '>=':
+        case '<=':
+            return binary(condition.operator, left, right);
+        default:
+            return () => false;
+    }
+}
+
+export class ConditionCache {
+    private readonly entries = new Map<string, CompiledCondition>();
+    private readonly structured = new Map<string, CompiledCondition>();
+    private hits = 0;
+    private misses = 0;
+
+    constructor(private readonly maxEntries = 1000) { }
+
+    get(condition: any): CompiledCondition {
+        const isSource = typeof condition === 'string';
+        const entries = isSource ? this.entries : this.structured;
+        const key: string = isSource ? condition : JSON.stringify(condition);
+        const cached = entries.get(key);
+        if (cached) {
+            this.hits++;
+            return cached;
+        }
+        this.misses++;
+        let compiled: CompiledCondition;
+        try {
+            compiled = isSource ? compileCondition(condition) : compileStructuredCondition(condition);
+        } catch (error: any) {
+            if (!(error instanceof ConditionSyntaxError)) {
+                throw error;
+            }
+            const message = error.message;
+            compiled = () => {
+                throw new ConditionSyntaxError(message);
+            };
+        }
+        entries.set(key, compiled);
+        if (entries.size > this.maxEntries) {
+            entries.delete(entries.keys().next().value!);
+        }
+        return compiled;
+    }
+
+    getStats() {
+        return {
+            entries: this.entries.size + this.structured.size,
+            hits: this.hits,
+            misses: this.misses,
+        };
+    }
+}
@@ -1,4 +1,5 @@
 import { Injectable, BadRequestException } from '@nestjs/common';
+import { ConditionCache } from './condition-compiler';
 
 export interface LogicExecutionInput {
     condition?: any;
@@ -20,6 +21,8 @@ export interface LogicExecutionResult {
 
 @Injectable()
 export class LogicExecutorService {
+    private readonly conditions = new ConditionCache();
+
     async executeIf(input: LogicExecutionInput): Promise<LogicExecutionResult> {
         let logs = 'Executing IF logic node\n';
         try {
@@ -104,59 +107,23 @@ export class LogicExecutorService {
         }
     }
 
+    getConditionStats() {
+        return this.conditions.getStats();
+    }
+
     private evaluateCondition(condition: any, input: any): boolean {
         if (typeof condition === 'boolean') {
             return condition;
         }
-        if (typeof condition === 'string') {
+        if (typeof condition === 'string'
+            || (typeof condition === 'object' && condition !== null
+                && condition.operator && condition.left !== undefined && condition.right !== undefined)) {
             try {
-                let expr = condition;
-                if (input && typeof input === 'object') {
-                    Object.keys(input).forEach(key => {
-                        const regex = new RegExp(`\\$\{${key}\}`, 'g');
-                        expr = expr.replace(regex, JSON.stringify(input[key]));
-                    });
-                }
-                if (expr.includes('>') || expr.includes('<') || expr.includes('==') || expr.includes('!=')) {
-                    return eval(expr);
-                }
-                return !!expr;
+                return !!this.conditions.get(condition)(input);
             } catch {
                 return false;
             }
         }
-        if (typeof condition === 'object' && condition !== null) {
-            if (condition.operator && condition.left !== undefined && condition.right !== undefined) {
-                const left = this.resolveValue(condition.left, input);
-                const right = this.resolveValue(condition.right, input);
-                switch (condition.operator) {
-                    case '==':
-                    case '===':
-                        return left === right;
-                    case '!=':
-                    case '!==':
-                        return left !== right;
-                    case '>':
-                        return left > right;
-                    case '<':
-                        return left < right;
-                    case '>=':
-                        return left >= right;
-                    case '<=':
-                        return left <= right;
-                    default:
-                        return false;
-                }
-            }
-        }
         return !!condition;
     }
-
-    private resolveValue(value: any, input: any): any {
-        if (typeof value === 'string' && value.startsWith('${') && value.endsWith('}')) {
-            const key = value.slice(2, -1);
-            return input?.[key];
-        }
-        return value;
-    }
 }
@@ -17,6 +17,7 @@ async function bootstrap() {
     app = await NestFactory.create(AppModule);
   }
   app.enableCors();
+  app.enableShutdownHooks();
   app.useGlobalPipes(new ValidationPipe({
     whitelist: true,
     forbidNonWhitelisted: true,
@@ -3,9 +3,10 @@ import { NodeConnectionService } from './node-connect.service';
 import { NodeConnectionController } from './node-connect.controller';
 import { PrismaModule } from '../../prisma/prisma.module';
 import { AuthModule } from '../auth/auth.module';
+import { ExecutionModule } from '../execution/execution.module';
 
 @Module({
-    imports: [PrismaModule, AuthModule],
+    imports: [PrismaModule, AuthModule, ExecutionModule],
     controllers: [NodeConnectionController],
     providers: [NodeConnectionService],
     exports: [NodeConnectionService],
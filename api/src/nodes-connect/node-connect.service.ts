@@ -1,10 +1,15 @@
 import { Injectable, NotFoundException, ForbiddenException, BadRequestException, ConflictException } from '@nestjs/common';
 import { PrismaService } from '../../prisma/prisma.service';
 import { CreateNodeConnectionDto, UpdateNodeConnectionDto } from './dto/node-connect.dto';
+import { ExecutionPlanService } from '../execution/execution-plan.service';
+import { wouldCreateCycle } from '../execution/graph-order';
 
 @Injectable()
 export class NodeConnectionService {
-    constructor(private prisma: PrismaService) { }
+    constructor(
+        private prisma: PrismaService,
+        private executionPlans: ExecutionPlanService,
+    ) { }
     async create(workflowId: number, createNodeConnectionDto: CreateNodeConnectionDto, userId?: number) {
         try {
             await this.verifyWorkflowAccess(workflowId, userId);
@@ -43,6 +48,7 @@ export class NodeConnectionService {
             if (createNodeConnectionDto.sourceNodeId === createNodeConnectionDto.targetNodeId) {
                 throw new BadRequestException('A node cannot be connected to itself');
             }
+            await this.assertAcyclic(workflowId, createNodeConnectionDto.sourceNodeId, createNodeConnectionDto.targetNodeId);
             const connection = await this.prisma.nodeConnection.create({
                 data: {
                     workflowId,
@@ -73,6 +79,8 @@ export class NodeConnectionService {
                     },
                 },
             });
+            await this.touchWorkflow(workflowId);
+            this.executionPlans.invalidate(workflowId);
             return connection;
         } catch (error) {
             throw error;
@@ -176,6 +184,9 @@ export class NodeConnectionService {
             if (sourceId === targetId) {
                 throw new BadRequestException('A node cannot be connected to itself');
             }
+            if (sourceId !== existingConnection.sourceNodeId || targetId !== existingConnection.targetNodeId) {
+                await this.assertAcyclic(workflowId, sourceId, targetId, connectionId);
+            }
             if (updateNodeConnectionDto.sourceNodeId || updateNodeConnectionDto.targetNodeId || updateNodeConnectionDto.channel) {
                 const conflictingConnection = await this.prisma.nodeConnection.findUnique({
                     where: {
@@ -218,6 +229,8 @@ export class NodeConnectionService {
                     },
                 },
             });
+            await this.touchWorkflow(workflowId);
+            this.executionPlans.invalidate(workflowId);
             return connection;
         } catch (error) {
             throw error;
@@ -230,6 +243,8 @@ export class NodeConnectionService {
             await this.prisma.nodeConnection.delete({
                 where: { id: connectionId },
             });
+            await this.touchWorkflow(workflowId);
+            this.executionPlans.invalidate(workflowId);
             return { message: `Connection with ID ${connectionId} deleted successfully` };
         } catch (error) {
             throw error;
@@ -354,4 +369,21 @@ export class NodeConnectionService {
         }
         return workflow;
     }
+
+    private async assertAcyclic(workflowId: number, sourceNodeId: number, targetNodeId: number, connectionId?: number) {
+        const plan = await this.executionPlans.getPlan(workflowId);
+        if (plan && wouldCreateCycle(plan, sourceNodeId, targetNodeId, connectionId)) {
+            throw new BadRequestException(`Connecting node ${sourceNodeId} to node ${targetNodeId} would create a cycle`);
+        }
+    }
+
+    private async touchWorkflow(workflowId: number) {
+        const workflow = await this.prisma.workflow.update({
+            where: { id: workflowId },
+            data: { updatedAt: new Date() },
+            select: { id: true, userId: true },
+        });
+        this.prisma.recordWrite(workflow.userId);
+        return workflow;
+    }
 }
@@ -3,11 +3,11 @@ import { NodeService } from './node.service';
 import { NodeController } from './node.controller';
 import { PrismaModule } from '../../prisma/prisma.module';
 import { AuthModule } from '../auth/auth.module';
-import { HttpModule } from '@nestjs/axios';
 import { LogicExecutorModule } from 'src/logic-executor/logic-executor.module';
+import { ExecutionModule } from '../execution/execution.module';
 
 @Module({
-    imports: [PrismaModule, AuthModule, HttpModule, LogicExecutorModule],
+    imports: [PrismaModule, AuthModule, LogicExecutorModule, ExecutionModule],
     controllers: [NodeController],
     providers: [NodeService],
     exports: [NodeService],
@@ -2,16 +2,45 @@ import { Injectable, NotFoundException, ForbiddenException, BadRequestException
 import { PrismaService } from '../../prisma/prisma.service';
 import { CreateNodeDto, UpdateNodeDto, ExecuteNodeDto, LogicType, ExecutionStatus, NodeLogicConfig } from './dto/node.dto';
 import { LogicExecutionResult, LogicExecutorService } from '../logic-executor/logic-executor.service';
-import { HttpService } from '@nestjs/axios';
-import { firstValueFrom } from 'rxjs';
+import { ConfigService } from '@nestjs/config';
+import { ExecutionPlan, ExecutionPlanService } from '../execution/execution-plan.service';
+import { CheckpointItem, ExecutionJournalService, JournalRun, JournalSegment, ResumableExecution } from '../execution/execution-journal.service';
+import { FanOutService } from '../execution/fan-out.service';
+import { TriggerIndexService } from '../execution/trigger-index.service';
+import { JoinBarrier, JoinInput, isJoinNode } from '../execution/join-barrier';
+import { ExecutionLogService } from '../execution/execution-log.service';
+import { RunLimits, RunScheduler, StepOutcome } from '../execution/run-scheduler';
+import { ReactionBatcherService } from '../execution/reaction-batcher.service';
+import { withDeadline } from '../execution/deadline';
+
+const INTERRUPTED_MESSAGE = 'Execution was interrupted while this reaction was running; it is not retried to avoid running it twice';
 
 @Injectable()
 export class NodeService {
+    private readonly runLimits: RunLimits;
+    private readonly runTimeout: number;
+    private readonly nodeTimeout: number;
+
     constructor(
         private prisma: PrismaService,
         private logicExecutor: LogicExecutorService,
-        private httpService: HttpService
-    ) { }
+        private executionPlans: ExecutionPlanService,
+        private journal: ExecutionJournalService,
+        private fanOut: FanOutService,
+        private triggerIndex: TriggerIndexService,
+        private executionLogs: ExecutionLogService,
+        private reactionBatcher: ReactionBatcherService,
+        private configService: ConfigService,
+    ) {
+        this.runLimits = {
+            maxSteps: Number(this.configService.get<string>('EXECUTION_MAX_STEPS', '1000')) || 1000,
+            maxDepth: Number(this.configService.get<string>('EXECUTION_MAX_DEPTH', '100')) || 100,
+            maxParallel: Number(this.configService.get<string>('EXECUTION_MAX_PARALLEL_BRANCHES', '16')) || 16,
+        };
+        this.runTimeout = Number(this.configService.get<string>('EXECUTION_RUN_TIMEOUT_MS', '300000')) || 0;
+        this.nodeTimeout = Number(this.configService.get<string>('EXECUTION_NODE_TIMEOUT_MS', '60000')) || 0;
+        this.journal.onResume(execution => this.resume(execution));
+    }
 
     async create(workflowId: number, createNodeDto: CreateNodeDto, userId?: number) {
         try {
@@ -47,6 +76,8 @@ export class NodeService {
                     },
                 },
             });
+            await this.touchWorkflow(workflowId);
+            this.executionPlans.invalidate(workflowId);
             return node;
         } catch (error) {
             throw error;
@@ -54,8 +85,8 @@ export class NodeService {
     }
 
     async findAll(workflowId: number, userId?: number) {
-        await this.verifyWorkflowAccess(workflowId, userId);
-        return this.prisma.node.findMany({
+        const workflow = await this.verifyWorkflowAccess(workflowId, userId);
+        return this.prisma.read(workflow.userId).node.findMany({
             where: { workflowId },
             include: {
                 action: {
@@ -171,6 +202,8 @@ export class NodeService {
                     },
                 },
             });
+            await this.touchWorkflow(workflowId);
+            this.executionPlans.invalidate(workflowId);
             return node;
         } catch (error) {
             throw error;
@@ -183,6 +216,8 @@ export class NodeService {
             await this.prisma.node.delete({
                 where: { id: nodeId },
             });
+            await this.touchWorkflow(workflowId);
+            this.executionPlans.invalidate(workflowId);
             return { message: `Node with ID ${nodeId} deleted successfully` };
         } catch (error) {
             throw error;
@@ -191,7 +226,7 @@ export class NodeService {
 
     async toggleTrigger(workflowId: number, nodeId: number, userId?: number) {
         const node = await this.findOne(workflowId, nodeId, userId);
-        return this.prisma.node.update({
+        const toggled = await this.prisma.node.update({
             where: { id: nodeId },
             data: {
                 isTriggered: !node.isTriggered,
@@ -205,305 +240,319 @@ export class NodeService {
                 },
             },
         });
+        await this.touchWorkflow(workflowId);
+        this.executionPlans.invalidate(workflowId);
+        return toggled;
     }
 
     async triggerWorkflowsByActionId(actionId: number, userId: number, triggerData: any) {
-        const workflows = await this.prisma.workflow.findMany({
-            where: {
-                userId,
-                isActive: true,
-            },
-            include: {
-                nodes: {
-                    where: {
-                        actionId,
-                    },
-                },
-            },
-        });
-        const results: any[] = [];
-        for (const workflow of workflows) {
-            for (const triggerNode of workflow.nodes) {
-                try {
-                    const executionResult = await this.execute(
-                        workflow.id,
-                        triggerNode.id,
-                        { input: triggerData },
-                        userId
-                    );
-                    results.push({
-                        workflowId: workflow.id,
-                        nodeId: triggerNode.id,
-                        success: true,
-                        result: executionResult,
-                    });
-                } catch (error: any) {
-                    results.push({
-                        workflowId: workflow.id,
-                        nodeId: triggerNode.id,
-                        success: false,
-                        error: error.message,
-                    });
-                }
+        const targets = await this.triggerIndex.lookup(userId, [actionId]);
+        const results = await this.fanOut.run(targets, target => target.workflowId, async ({ workflowId, triggerNodeId }) => {
+            try {
+                const executionResult = await this.execute(
+                    workflowId,
+                    triggerNodeId,
+                    { input: triggerData },
+                    userId
+                );
+                return {
+                    workflowId,
+                    nodeId: triggerNodeId,
+                    success: true,
+                    result: executionResult,
+                };
+            } catch (error: any) {
+                return {
+                    workflowId,
+                    nodeId: triggerNodeId,
+                    success: false,
+                    error: error.message,
+                };
             }
-        }
+        });
         return {
             triggeredCount: results.filter(r => r.success).length,
             results,
         };
     }
 
-    private interpolateVariables(config: any, input: any): any {
-        if (!config) return config;
-        const configStr = JSON.stringify(config);
-        const interpolated = configStr.replace(/\$\{([^}]+)\}/g, (match, varName) => {
-            const value = input[varName.trim()];
-            return value !== undefined ? JSON.stringify(value).slice(1, -1) : match;
-        });
-        return JSON.parse(interpolated);
+    async execute(workflowId: number, nodeId: number, executeNodeDto: ExecuteNodeDto, userId?: number, triggerJobId?: number) {
+        const plan = await this.getExecutionPlan(workflowId, userId);
+        if (!plan.nodes.has(nodeId)) {
+            throw new NotFoundException(`Node with ID ${nodeId} not found in workflow ${workflowId}`);
+        }
+        const run = executeNodeDto.executionId
+            ? this.journal.attach(executeNodeDto.executionId, workflowId)
+            : await this.journal.open(workflowId, nodeId, triggerJobId);
+        this.journal.addWork(run, 1);
+        try {
+            const rootInputs = isJoinNode(plan, nodeId)
+                ? await this.loadRootJoinInputs(plan, run, nodeId, !!executeNodeDto.executionId)
+                : undefined;
+            const segment = this.journal.beginSegment(run, nodeId, new JoinBarrier(plan, nodeId));
+            const [root] = this.journal.schedule(run, segment, [{ nodeId, input: executeNodeDto.input, joinInputs: rootInputs, depth: 0 }]);
+            return await this.runSegment(plan, run, segment, scheduler => scheduler.run(root));
+        } catch (error: any) {
+            await this.journal.complete(run, ExecutionStatus.FAILED, error.message);
+            throw error;
+        } finally {
+            await this.journal.release(run);
+        }
     }
 
-    async execute(workflowId: number, nodeId: number, executeNodeDto: ExecuteNodeDto, userId?: number) {
+    private async resume(execution: ResumableExecution) {
+        const run = this.journal.attach(execution.executionId, execution.workflowId, true);
+        run.startedAt = execution.startedAt;
         try {
-            await this.verifyWorkflowAccess(workflowId, userId);
-            const node = await this.prisma.node.findFirst({
-                where: {
-                    id: nodeId,
-                    workflowId,
-                },
-                include: {
-                    action: {
-                        include: { service: true },
-                    },
-                    reaction: {
-                        include: { service: true },
-                    },
-                    outConnect: {
-                        include: {
-                            targetNode: true,
-                        },
-                    },
-                },
-            });
-            if (!node) {
-                throw new NotFoundException(`Node with ID ${nodeId} not found in workflow ${workflowId}`);
+            const plan = await this.executionPlans.getPlan(execution.workflowId);
+            if (!plan) {
+                throw new NotFoundException(`Workflow with ID ${execution.workflowId} not found`);
             }
-            let executionId = executeNodeDto.executionId;
-            if (!executionId) {
-                const workflowExecution = await this.prisma.workflowExecution.create({
-                    data: {
-                        workflowId,
-                        triggeredBy: nodeId,
-                        status: ExecutionStatus.RUNNING,
-                    },
-                });
-                executionId = workflowExecution.id;
+            const saved = execution.checkpoint.segments.filter(segment => segment.frontier.length > 0);
+            if (saved.length === 0) {
+                await this.journal.complete(run, ExecutionStatus.SUCCESS);
+                return;
             }
-            const nodeExecution = await this.prisma.nodeExecution.create({
-                data: {
-                    nodeId,
-                    executionId,
-                    status: ExecutionStatus.RUNNING,
-                    startedAt: new Date(),
-                },
-            });
-            let output: any = executeNodeDto.input || {};
-            let logs = '';
-            let executionStatus: ExecutionStatus = ExecutionStatus.SUCCESS;
-            let executionChannel = 'success';
-            try {
-                const nodeName = node.name || `Node ${nodeId}`;
-                console.log(`Executing node: ${nodeName}`);
-                logs += `Executing node: ${nodeName}\n`;
-                if (node.reactionId) {
-                    logs += `Type: Reaction - ${node.reaction?.name}\n`;
-                    try {
-                        if (!node.reaction) {
-                            throw new BadRequestException('Reaction not found on node');
-                        }
-                        const reactionUrl = node.reaction.service?.microServiceUrl;
-                        if (!reactionUrl) {
-                            throw new BadRequestException('Reaction microservice URL not configured');
-                        }
-                        const workflow = await this.prisma.workflow.findUnique({
-                            where: { id: workflowId },
-                            select: { userId: true },
-                        });
-                        if (!workflow) {
-                            throw new BadRequestException('Workflow not found');
-                        }
-                        const interpolatedConfig = this.interpolateVariables(node.conf, executeNodeDto.input);
-                        logs += `Sending to microservice:\n`;
-                        logs += `  - Original Config: ${JSON.stringify(node.conf)}\n`;
-                        logs += `  - Interpolated Config: ${JSON.stringify(interpolatedConfig)}\n`;
-                        logs += `  - Input: ${JSON.stringify(executeNodeDto.input)}\n`;
-                        const response = await firstValueFrom(
-                            this.httpService.post(`${reactionUrl}/execute`, {
-                                type: 'reaction',
-                                name: node.reaction.name,
-                                userId: workflow.userId,
-                                config: interpolatedConfig || {},
-                                input: executeNodeDto.input || {},
-                            })
-                        );
-                        if (!response.data.success) {
-                            throw new Error(response.data.error || 'Reaction execution failed');
-                        }
-                        output = response.data.result;
-                        logs += `Microservice response: ${JSON.stringify(response.data.result)}\n`;
-                    } catch (reactionError: any) {
-                        executionStatus = ExecutionStatus.FAILED;
-                        logs += `Reaction microservice error: ${reactionError.message}\n`;
-                        output = { error: reactionError.message };
-                        executionChannel = 'failed';
+            this.journal.addWork(run, saved.reduce((total, segment) => total + segment.frontier.length, 0));
+            const outcomes = await Promise.allSettled(saved.map(({ rootNodeId, steps, barrier: snapshot, frontier }) => {
+                const barrier = new JoinBarrier(plan, rootNodeId);
+                barrier.restore(snapshot);
+                const segment = this.journal.beginSegment(run, rootNodeId, barrier, steps);
+                const roots = this.journal.schedule(run, segment, frontier.map(item => ({
+                    ...item,
+                    inFlight: false,
+                    interrupted: item.interrupted || item.inFlight,
+                })));
+                return this.runSegment(plan, run, segment, scheduler =>
+                    scheduler.resume(roots.map(item => ({ item, depth: item.depth })), steps));
+            }));
+            const failure = outcomes.find(outcome => outcome.status === 'rejected');
+            if (failure) {
+                throw failure.reason;
+            }
+        } catch (error: any) {
+            await this.journal.complete(run, ExecutionStatus.FAILED, error.message);
+        } finally {
+            await this.journal.release(run);
+        }
+    }
+
+    private async runSegment(
+        plan: ExecutionPlan,
+        run: JournalRun,
+        segment: JournalSegment,
+        start: (scheduler: RunScheduler<CheckpointItem>) => Promise<any>,
+    ) {
+        const deadline = withDeadline(run.abort.signal, this.runTimeout, `Execution exceeded its deadline of ${this.runTimeout}ms`);
+        try {
+            const scheduler = new RunScheduler<CheckpointItem>(this.runLimits, (item, depth) =>
+                this.executeNode(plan, run, segment, item, deadline.signal).catch((error: any) => {
+                    if (depth > 0) {
+                        console.error(`Error executing next node ${item.nodeId}: ${error.message}`);
                     }
+                    throw error;
+                }),
+                deadline.signal,
+            );
+            const result = await start(scheduler);
+            if (scheduler.aborted) {
+                for (const item of scheduler.skipped) {
+                    this.journal.settle(run, segment, item);
+                    await this.journal.completeNode(run, this.journal.startNode(run, item.nodeId), {
+                        status: ExecutionStatus.SKIPPED,
+                        output: { error: scheduler.aborted },
+                        logs: '',
+                        executionChannel: 'skipped',
+                    }, false);
                 }
-                else if (node.logicType) {
-                    logs += `Type: Logic - ${node.logicType}\n`;
-                    const conf = node.conf as NodeLogicConfig;
-                    let incomingNodes: Array<{ status: string; output: any; executionChannel: string }> | undefined;
-                    if (node.logicType === LogicType.AND || node.logicType === LogicType.NOT) {
-                        const inConnections = await this.prisma.nodeConnection.findMany({
-                            where: { targetNodeId: nodeId },
-                            include: {
-                                sourceNode: true,
-                            },
-                        });
-                        incomingNodes = await Promise.all(
-                            inConnections.map(async (conn) => {
-                                const lastExecution = await this.prisma.nodeExecution.findFirst({
-                                    where: {
-                                        nodeId: conn.sourceNodeId,
-                                    },
-                                    orderBy: {
-                                        startedAt: 'desc',
-                                    },
-                                });
-                                return {
-                                    status: lastExecution?.status || 'UNKNOWN',
-                                    output: lastExecution?.output || {},
-                                    executionChannel: lastExecution?.executionChannel || 'unknown',
-                                };
-                            })
-                        );
-                        logs += `Found ${incomingNodes.length} incoming node(s)\n`;
-                        logs += `Incoming nodes channels: ${incomingNodes.map(node => node.executionChannel).join(', ')}\n`;
+                await this.journal.complete(run, ExecutionStatus.FAILED, scheduler.aborted);
+                return { ...result, aborted: scheduler.aborted };
+            }
+            return result;
+        } finally {
+            deadline.clear();
+            this.journal.endSegment(run, segment);
+        }
+    }
+
+    private async executeNode(
+        plan: ExecutionPlan,
+        run: JournalRun,
+        segment: JournalSegment,
+        item: CheckpointItem,
+        signal: AbortSignal,
+    ): Promise<StepOutcome<CheckpointItem>> {
+        const { nodeId, input, joinInputs } = item;
+        const node = plan.nodes.get(nodeId);
+        if (!node) {
+            this.journal.settle(run, segment, item);
+            await this.journal.finishWork(run);
+            throw new NotFoundException(`Node with ID ${nodeId} not found in workflow ${plan.workflowId}`);
+        }
+        const executeNodeDto: ExecuteNodeDto = { executionId: run.executionId, input };
+        const outChannels = plan.outgoing.get(nodeId);
+        const nodeExecution = this.journal.startNode(run, nodeId);
+        let output: any = executeNodeDto.input || {};
+        const log = this.executionLogs.create();
+        let executionStatus: ExecutionStatus = ExecutionStatus.SUCCESS;
+        let executionChannel = 'success';
+        let countExecution = true;
+        try {
+            const nodeName = node.name || `Node ${nodeId}`;
+            console.log(`Executing node: ${nodeName}`);
+            log.info(`Executing node: ${nodeName}`);
+            if (node.reactionId) {
+                log.info(`Type: Reaction - ${node.reaction?.name}`);
+                try {
+                    if (!node.reaction) {
+                        throw new BadRequestException('Reaction not found on node');
                     }
-                    const logicInput = {
-                        condition: conf?.condition,
-                        input: executeNodeDto.input,
-                        maxIterations: conf?.maxIterations,
-                        incomingNodes,
-                    };
-                    let logicResult: LogicExecutionResult;
-                    switch (node.logicType) {
-                        case LogicType.IF:
-                            logicResult = await this.logicExecutor.executeIf(logicInput);
-                            break;
-                        case LogicType.AND:
-                            logicResult = await this.logicExecutor.executeAnd(logicInput);
-                            break;
-                        case LogicType.NOT:
-                            logicResult = await this.logicExecutor.executeNot(logicInput);
-                            break;
-                        default:
-                            throw new BadRequestException(`Unknown logic type: ${node.logicType}`);
+                    if (item.interrupted) {
+                        countExecution = false;
+                        throw new Error(INTERRUPTED_MESSAGE);
                     }
-                    logs += logicResult.logs;
-                    output = logicResult.output;
-                    executionChannel = logicResult.channel;
-                    logs += `Execution channel: ${executionChannel}\n`;
+                    const reactionUrl = node.reaction.serviceUrl;
+                    if (!reactionUrl) {
+                        throw new BadRequestException('Reaction microservice URL not configured');
+                    }
+                    const interpolatedConfig = node.template.render(executeNodeDto.input);
+                    log.info(`Sending to microservice: ${reactionUrl}`);
+                    log.debug('Original Config', () => node.conf);
+                    log.debug('Interpolated Config', () => interpolatedConfig);
+                    await this.journal.markInFlight(run, item);
+                    const nodeDeadline = withDeadline(signal, this.nodeTimeout, `Node ${nodeId} exceeded its deadline of ${this.nodeTimeout}ms`);
+                    const response = await this.reactionBatcher.execute(reactionUrl, {
+                        type: 'reaction',
+                        name: node.reaction.name,
+                        userId: plan.userId,
+                        config: interpolatedConfig || {},
+                        input: executeNodeDto.input || {},
+                    }, nodeDeadline.signal).finally(nodeDeadline.clear);
+                    if (!response.success) {
+                        throw new Error(response.error || 'Reaction execution failed');
+                    }
+                    output = response.result;
+                    log.debug('Microservice response', () => response.result);
+                } catch (reactionError: any) {
+                    executionStatus = ExecutionStatus.FAILED;
+                    log.error(`Reaction microservice error: ${reactionError.message}`);
+                    output = { error: reactionError.message };
+                    executionChannel = 'failed';
                 }
-                logs += `Input: ${JSON.stringify(executeNodeDto.input)}\n`;
-                logs += `Output: ${JSON.stringify(output)}\n`;
-                await this.prisma.node.update({
-                    where: { id: nodeId },
-                    data: {
-                        lastExecuted: new Date(),
-                        executionCount: {
-                            increment: 1,
-                        },
-                    },
-                });
-            } catch (error: any) {
-                executionStatus = ExecutionStatus.FAILED;
-                logs += `Error: ${error.message}\n`;
-                output = { error: error.message };
-                executionChannel = 'failed';
             }
-            const finalNodeExecution = await this.prisma.nodeExecution.update({
-                where: { id: nodeExecution.id },
-                data: {
-                    status: executionStatus,
-                    completedAt: new Date(),
-                    output,
-                    logs,
-                    executionChannel,
-                },
-            });
-            if (executionStatus === ExecutionStatus.SUCCESS && node.outConnect.length > 0) {
-                const nextExecutions: Promise<any>[] = [];
-                const connectionsToExecute = node.outConnect.filter(conn =>
-                    conn.channel === executionChannel
-                );
-                logs += `Found ${connectionsToExecute.length} connection(s) for channel "${executionChannel}"\n`;
-                for (const connection of connectionsToExecute) {
-                    nextExecutions.push(
-                        this.execute(
-                            workflowId,
-                            connection.targetNodeId,
-                            { executionId, input: output },
-                            userId
-                        ).catch((err: any) => {
-                            console.error(`Error executing next node ${connection.targetNodeId}: ${err.message}`);
-                            return { error: err.message };
-                        })
-                    );
+            else if (node.logicType) {
+                log.info(`Type: Logic - ${node.logicType}`);
+                const conf = node.conf as NodeLogicConfig;
+                const incomingNodes = joinInputs;
+                if (incomingNodes) {
+                    log.info(`Found ${incomingNodes.length} incoming node(s)`);
+                    log.info(`Incoming nodes channels: ${incomingNodes.map(node => node.executionChannel).join(', ')}`);
                 }
-                const results = await Promise.all(nextExecutions);
-                if (executionId) {
-                    const allCompleted = await this.checkWorkflowExecutionComplete(executionId);
-                    if (allCompleted) {
-                        await this.prisma.workflowExecution.update({
-                            where: { id: executionId },
-                            data: {
-                                status: ExecutionStatus.SUCCESS,
-                                completedAt: new Date(),
-                            },
-                        });
+                const logicInput = {
+                    condition: conf?.condition,
+                    input: executeNodeDto.input,
+                    maxIterations: conf?.maxIterations,
+                    incomingNodes,
+                };
+                let logicResult: LogicExecutionResult;
+                switch (node.logicType) {
+                    case LogicType.IF:
+                        logicResult = await this.logicExecutor.executeIf(logicInput);
+                        break;
+                    case LogicType.AND:
+                        logicResult = await this.logicExecutor.executeAnd(logicInput);
+                        break;
+                    case LogicType.NOT:
+                        logicResult = await this.logicExecutor.executeNot(logicInput);
+                        break;
+                    default:
+                        throw new BadRequestException(`Unknown logic type: ${node.logicType}`);
+                }
+                for (const line of logicResult.logs.split('\n')) {
+                    if (line) {
+                        log.info(line);
                     }
                 }
-                return {
-                    nodeExecution: finalNodeExecution,
-                    nextNodes: results,
-                };
+                output = logicResult.output;
+                executionChannel = logicResult.channel;
+                log.info(`Execution channel: ${executionChannel}`);
             }
+            log.debug('Input', () => executeNodeDto.input);
+            log.debug('Output', () => output);
+        } catch (error: any) {
+            countExecution = false;
+            executionStatus = ExecutionStatus.FAILED;
+            log.error(`Error: ${error.message}`);
+            output = { error: error.message };
+            executionChannel = 'failed';
+        }
+        const { run: targetsToExecute, fire } = segment.barrier.report(nodeId, executionStatus, executionChannel, output);
+        const proceed = (executionStatus === ExecutionStatus.SUCCESS && !!outChannels) || fire.length > 0;
+        const next = this.journal.advance(run, segment, item, proceed
+            ? [
+                ...targetsToExecute.map(targetNodeId => ({ nodeId: targetNodeId, input: output })),
+                ...fire.map(join => ({ nodeId: join.nodeId, input: join.input, joinInputs: join.incomingNodes })),
+            ]
+            : []);
+        const finalNodeExecution = await this.journal.completeNode(run, nodeExecution, {
+            status: executionStatus,
+            output,
+            logs: log.toString(),
+            executionChannel,
+        }, countExecution);
+        this.journal.addWork(run, targetsToExecute.length + fire.length);
+        await this.journal.finishWork(run);
+        if (proceed) {
+            const nextNodes: any[] = new Array(next.length);
             return {
-                nodeExecution: finalNodeExecution,
+                result: {
+                    nodeExecution: finalNodeExecution,
+                    nextNodes,
+                },
+                next,
+                children: nextNodes,
             };
-        } catch (error: any) {
-            if (executeNodeDto.executionId) {
-                await this.prisma.workflowExecution.update({
-                    where: { id: executeNodeDto.executionId },
-                    data: {
-                        status: ExecutionStatus.FAILED,
-                        completedAt: new Date(),
-                        errorMessage: error.message,
-                    },
-                }).catch(() => { });
-            }
-            throw error;
         }
+        return {
+            result: {
+                nodeExecution: finalNodeExecution,
+            },
+            next: [],
+        };
     }
 
-    private async checkWorkflowExecutionComplete(executionId: number): Promise<boolean> {
-        const nodeExecutions = await this.prisma.nodeExecution.findMany({
-            where: { executionId },
-        });
-        const hasRunning = nodeExecutions.some(
-            ne => ne.status === ExecutionStatus.RUNNING || ne.status === ExecutionStatus.PENDING
+    private async loadRootJoinInputs(plan: ExecutionPlan, run: JournalRun, nodeId: number, runScoped: boolean): Promise<JoinInput[]> {
+        const inConnections = plan.incoming.get(nodeId) ?? [];
+        return Promise.all(
+            inConnections.map(async (conn) => {
+                const lastExecution = this.journal.findLatest(run, conn.sourceNodeId)
+                    ?? await this.prisma.nodeExecution.findFirst({
+                        where: {
+                            nodeId: conn.sourceNodeId,
+                            ...(runScoped ? { executionId: run.executionId } : {}),
+                        },
+                        orderBy: {
+                            startedAt: 'desc',
+                        },
+                    });
+                return {
+                    status: lastExecution?.status || 'UNKNOWN',
+                    output: lastExecution?.output || {},
+                    executionChannel: lastExecution?.executionChannel || 'unknown',
+                };
+            })
         );
-        return !hasRunning;
+    }
+
+    private async getExecutionPlan(workflowId: number, userId?: number) {
+        const plan = await this.executionPlans.getPlan(workflowId);
+        if (!plan) {
+            throw new NotFoundException(`Workflow with ID ${workflowId} not found`);
+        }
+        if (userId && plan.userId !== userId) {
+            throw new ForbiddenException('You can only access nodes from your own workflows');
+        }
+        return plan;
     }
 
     private async verifyWorkflowAccess(workflowId: number, userId?: number) {
@@ -522,4 +571,14 @@ export class NodeService {
         }
         return workflow;
     }
+
+    private async touchWorkflow(workflowId: number) {
+        const workflow = await this.prisma.workflow.update({
+            where: { id: workflowId },
+            data: { updatedAt: new Date() },
+            select: { id: true, userId: true },
+        });
+        this.prisma.recordWrite(workflow.userId);
+        return workflow;
+    }
 }
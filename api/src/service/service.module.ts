@@ -1,12 +1,13 @@
 import { Module } from '@nestjs/common';
 import { ServicesController } from './service.controller';
 import { ServicesService } from './service.service';
-import { PrismaService } from '../../prisma/prisma.service';
 import { AuthService } from '../auth/auth.service';
+import { ExecutionModule } from '../execution/execution.module';
 
 @Module({
+    imports: [ExecutionModule],
     controllers: [ServicesController],
-    providers: [ServicesService, PrismaService, AuthService],
+    providers: [ServicesService, AuthService],
     exports: [ServicesService],
 })
 export class ServicesModule {}
@@ -1,13 +1,19 @@
 import { Injectable, NotFoundException, ConflictException } from '@nestjs/common';
 import { PrismaService } from '../../prisma/prisma.service';
 import { UpdateServiceDto } from './dto/service.dto';
+import { ExecutionPlanService } from '../execution/execution-plan.service';
+
+const SERVICES_SCOPE = 'services';
 
 @Injectable()
 export class ServicesService {
-    constructor(private readonly prisma: PrismaService) {}
+    constructor(
+        private readonly prisma: PrismaService,
+        private readonly executionPlans: ExecutionPlanService,
+    ) {}
 
     async findAll() {
-        return this.prisma.service.findMany({
+        return this.prisma.read(SERVICES_SCOPE).service.findMany({
             orderBy: { name: 'asc' },
             select: {
                 id: true,
@@ -119,7 +125,7 @@ export class ServicesService {
                 );
             }
         }
-        return this.prisma.service.update({
+        const service = await this.prisma.service.update({
             where: { id },
             data: updateServiceDto,
             select: {
@@ -140,6 +146,9 @@ export class ServicesService {
                 }
             }
         });
+        this.executionPlans.invalidateAll();
+        this.prisma.recordWrite(SERVICES_SCOPE);
+        return service;
     }
 
     async remove(id: number) {
@@ -168,9 +177,11 @@ export class ServicesService {
                 `Cannot delete service: ${reactionsCount} reactions are still using it`
             );
         }
-        return this.prisma.service.delete({
+        const service = await this.prisma.service.delete({
             where: { id }
         });
+        this.prisma.recordWrite(SERVICES_SCOPE);
+        return service;
     }
 
     async changeApiKey(serviceId: number, newApiKeyId: number) {
@@ -184,7 +195,7 @@ export class ServicesService {
         if (!apiKey.isActive) {
             throw new ConflictException('Cannot assign inactive API key');
         }
-        return this.prisma.service.update({
+        const service = await this.prisma.service.update({
             where: { id: serviceId },
             data: {
                 apiKeyId: newApiKeyId
@@ -204,13 +215,17 @@ export class ServicesService {
                 }
             }
         });
+        this.prisma.recordWrite(SERVICES_SCOPE);
+        return service;
     }
 
     async deactivateServicesByApiKey(apiKeyId: number) {
-        return this.prisma.service.updateMany({
+        const result = await this.prisma.service.updateMany({
             where: { apiKeyId },
             data: { isActive: false }
         });
+        this.prisma.recordWrite(SERVICES_SCOPE);
+        return result;
     }
 
     async findInactiveServices(daysSinceLastSeen: number) {
@@ -0,0 +1,6 @@
+export enum TriggerJobStatus {
+    PENDING = "PENDING",
+    RUNNING = "RUNNING",
+    DONE = "DONE",
+    FAILED = "FAILED"
+}
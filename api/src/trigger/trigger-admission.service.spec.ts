@@ -0,0 +1,65 @@
+import { ConfigService } from '@nestjs/config';
+import { PrismaService } from '../../prisma/prisma.service';
+import { ReplicaService } from '../execution/replica.service';
+import { TriggerAdmissionService } from './trigger-admission.service';
+
+describe('TriggerAdmissionService', () => {
+  const setup = (values: Record<string, string>, pending: { userId: number; count: number }[] = [], replicas = 1) => {
+    const prisma = {
+      triggerJob: {
+        groupBy: async () => pending.map(({ userId, count }) => ({ userId, _count: { _all: count } })),
+      },
+    } as unknown as PrismaService;
+    const config = { get: (key: string, fallback: string) => values[key] ?? fallback } as unknown as ConfigService;
+    const replica = { liveReplicas: () => replicas } as unknown as ReplicaService;
+    return new TriggerAdmissionService(prisma, config, replica);
+  };
+
+  it('splits the per-user budget across live api replicas', async () => {
+    const admission = setup({ TRIGGER_USER_BURST: '4', TRIGGER_USER_RATE_PER_SEC: '1' }, [], 2);
+    expect(await admission.admit(1)).toEqual({ admitted: true });
+    expect(await admission.admit(1)).toEqual({ admitted: true });
+    expect(await admission.admit(1)).toMatchObject({ admitted: false, retryAfter: 2 });
+  });
+
+  it('reports a full bucket for users that only have recorded waits', async () => {
+    const admission = setup({ TRIGGER_USER_BURST: '4' }, [], 2);
+    admission.recordWait(3, 120);
+    const stats = await admission.getStats();
+    expect(stats.users[3]).toMatchObject({ tokens: 2, averageWaitMs: 120 });
+  });
+
+  it('sheds a user once their token bucket is empty without affecting others', async () => {
+    const admission = setup({ TRIGGER_USER_BURST: '2', TRIGGER_USER_RATE_PER_SEC: '0.5' });
+    expect(await admission.admit(1)).toEqual({ admitted: true });
+    expect(await admission.admit(1)).toEqual({ admitted: true });
+    expect(await admission.admit(1)).toEqual({
+      admitted: false,
+      reason: 'Trigger rate limit exceeded for this user',
+      retryAfter: 2,
+    });
+    expect(await admission.admit(2)).toEqual({ admitted: true });
+    const stats = await admission.getStats();
+    expect(stats.shed).toBe(1);
+    expect(stats.users[1]).toMatchObject({ admitted: 2, shed: 1, depth: 2 });
+  });
+
+  it('sheds everyone once the global backlog is full', async () => {
+    const admission = setup({ TRIGGER_BACKLOG_MAX: '10', TRIGGER_BACKLOG_RETRY_AFTER_S: '7' }, [{ userId: 3, count: 10 }]);
+    expect(await admission.admit(4)).toEqual({ admitted: false, reason: 'Trigger backlog is full', retryAfter: 7 });
+  });
+
+  it('sheds a user whose own backlog is full', async () => {
+    const admission = setup({ TRIGGER_USER_BACKLOG_MAX: '5' }, [{ userId: 3, count: 5 }]);
+    expect((await admission.admit(3)).admitted).toBe(false);
+    expect((await admission.admit(4)).admitted).toBe(true);
+  });
+
+  it('tracks queue wait per user', async () => {
+    const admission = setup({});
+    await admission.admit(1);
+    admission.recordWait(1, 100);
+    admission.recordWait(1, 300);
+    expect((await admission.getStats()).users[1]).toMatchObject({ averageWaitMs: 200, maxWaitMs: 300 });
+  });
+});
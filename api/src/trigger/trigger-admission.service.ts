@@ -0,0 +1,181 @@
+import { Injectable, Logger } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { PrismaService } from '../../prisma/prisma.service';
+import { TriggerJobStatus } from './dto/trigger.dto';
+import { ReplicaRole, ReplicaService } from '../execution/replica.service';
+
+export type AdmissionDecision =
+    | { admitted: true }
+    | { admitted: false; reason: string; retryAfter: number };
+
+interface TokenBucket {
+    tokens: number;
+    updatedAt: number;
+}
+
+interface UserAdmission {
+    admitted: number;
+    shed: number;
+    claimed: number;
+    totalWaitMs: number;
+    maxWaitMs: number;
+}
+
+const MAX_TRACKED_USERS = 1000;
+
+@Injectable()
+export class TriggerAdmissionService {
+    private readonly logger = new Logger(TriggerAdmissionService.name);
+    private readonly buckets = new Map<number, TokenBucket>();
+    private readonly users = new Map<number, UserAdmission>();
+    private readonly rate: number;
+    private readonly burst: number;
+    private readonly maxBacklog: number;
+    private readonly maxUserBacklog: number;
+    private readonly backlogRetryAfter: number;
+    private readonly depthTtl: number;
+    private pendingByUser = new Map<number, number>();
+    private pendingTotal = 0;
+    private depthLoadedAt = 0;
+    private depthLoading: Promise<void> | null = null;
+    private shed = 0;
+
+    constructor(
+        private prisma: PrismaService,
+        private configService: ConfigService,
+        private replica: ReplicaService,
+    ) {
+        this.rate = Number(this.configService.get<string>('TRIGGER_USER_RATE_PER_SEC', '5')) || 5;
+        this.burst = Number(this.configService.get<string>('TRIGGER_USER_BURST', '50')) || 50;
+        this.maxBacklog = Number(this.configService.get<string>('TRIGGER_BACKLOG_MAX', '10000')) || 10000;
+        this.maxUserBacklog = Number(this.configService.get<string>('TRIGGER_USER_BACKLOG_MAX', '1000')) || 1000;
+        this.backlogRetryAfter = Number(this.configService.get<string>('TRIGGER_BACKLOG_RETRY_AFTER_S', '5')) || 5;
+        this.depthTtl = Number(this.configService.get<string>('TRIGGER_BACKLOG_REFRESH_MS', '1000')) || 1000;
+    }
+
+    async admit(userId: number): Promise<AdmissionDecision> {
+        await this.loadDepth();
+        const stats = this.userStats(userId);
+        let decision: AdmissionDecision = { admitted: true };
+        if (this.pendingTotal >= this.maxBacklog) {
+            decision = { admitted: false, reason: 'Trigger backlog is full', retryAfter: this.backlogRetryAfter };
+        } else if ((this.pendingByUser.get(userId) ?? 0) >= this.maxUserBacklog) {
+            decision = { admitted: false, reason: 'Too many pending triggers for this user', retryAfter: this.backlogRetryAfter };
+        } else {
+            const bucket = this.refill(userId);
+            if (bucket.tokens < 1) {
+                decision = {
+                    admitted: false,
+                    reason: 'Trigger rate limit exceeded for this user',
+                    retryAfter: Math.max(1, Math.ceil((1 - bucket.tokens) / this.share().rate)),
+                };
+            } else {
+                bucket.tokens -= 1;
+            }
+        }
+        if (!decision.admitted) {
+            stats.shed++;
+            this.shed++;
+            return decision;
+        }
+        stats.admitted++;
+        this.pendingTotal++;
+        this.pendingByUser.set(userId, (this.pendingByUser.get(userId) ?? 0) + 1);
+        return decision;
+    }
+
+    recordWait(userId: number, waitMs: number) {
+        const stats = this.userStats(userId);
+        stats.claimed++;
+        stats.totalWaitMs += Math.max(0, waitMs);
+        stats.maxWaitMs = Math.max(stats.maxWaitMs, waitMs);
+    }
+
+    async getStats() {
+        await this.loadDepth();
+        const share = this.share();
+        const users: Record<number, any> = {};
+        for (const [userId, stats] of this.users) {
+            users[userId] = {
+                depth: this.pendingByUser.get(userId) ?? 0,
+                admitted: stats.admitted,
+                shed: stats.shed,
+                tokens: this.buckets.has(userId) ? Math.floor(this.refill(userId).tokens) : share.burst,
+                averageWaitMs: stats.claimed > 0 ? stats.totalWaitMs / stats.claimed : 0,
+                maxWaitMs: stats.maxWaitMs,
+            };
+        }
+        return {
+            ratePerSecond: this.rate,
+            burst: this.burst,
+            replicas: this.replica.liveReplicas(ReplicaRole.API),
+            replicaRatePerSecond: share.rate,
+            replicaBurst: share.burst,
+            maxBacklog: this.maxBacklog,
+            maxUserBacklog: this.maxUserBacklog,
+            backlog: this.pendingTotal,
+            shed: this.shed,
+            users,
+        };
+    }
+
+    private share() {
+        const replicas = this.replica.liveReplicas(ReplicaRole.API);
+        return {
+            rate: this.rate / replicas,
+            burst: Math.max(1, Math.ceil(this.burst / replicas)),
+        };
+    }
+
+    private refill(userId: number) {
+        const now = Date.now();
+        const { rate, burst } = this.share();
+        let bucket = this.buckets.get(userId);
+        if (!bucket) {
+            bucket = { tokens: burst, updatedAt: now };
+            this.buckets.set(userId, bucket);
+            this.evict(this.buckets);
+        }
+        bucket.tokens = Math.min(burst, bucket.tokens + (now - bucket.updatedAt) / 1000 * rate);
+        bucket.updatedAt = now;
+        return bucket;
+    }
+
+    private userStats(userId: number) {
+        let stats = this.users.get(userId);
+        if (!stats) {
+            stats = { admitted: 0, shed: 0, claimed: 0, totalWaitMs: 0, maxWaitMs: 0 };
+            this.users.set(userId, stats);
+            this.evict(this.users);
+        }
+        return stats;
+    }
+
+    private evict(map: Map<number, unknown>) {
+        while (map.size > MAX_TRACKED_USERS) {
+            map.delete(map.keys().next().value!);
+        }
+    }
+
+    private async loadDepth() {
+        if (Date.now() - this.depthLoadedAt < this.depthTtl) {
+            return;
+        }
+        if (!this.depthLoading) {
+            this.depthLoading = this.prisma.triggerJob.groupBy({
+                by: ['userId'],
+                where: { status: TriggerJobStatus.PENDING },
+                _count: { _all: true },
+            }).then(counts => {
+                this.pendingByUser = new Map(counts.map(count => [count.userId, count._count._all]));
+                this.pendingTotal = counts.reduce((total, count) => total + count._count._all, 0);
+                this.depthLoadedAt = Date.now();
+            }).catch((error: any) => {
+                this.logger.error(`Failed to load trigger backlog depth: ${error.message}`);
+            }).finally(() => {
+                this.depthLoading = null;
+            });
+        }
+        await this.depthLoading;
+    }
+}
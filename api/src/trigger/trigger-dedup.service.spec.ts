@@ -0,0 +1,58 @@
+import { ConfigService } from '@nestjs/config';
+import { PrismaService } from '../../prisma/prisma.service';
+import { TriggerDedupService } from './trigger-dedup.service';
+
+describe('TriggerDedupService', () => {
+  const setup = (values: Record<string, string> = {}) => {
+    const rows = new Map<string, Date>();
+    let queries = 0;
+    const prisma = {
+      $queryRaw: async (_sql: TemplateStringsArray, key: string, expiresAt: Date) => {
+        queries++;
+        const current = rows.get(key);
+        if (current && current.getTime() > Date.now()) {
+          return [];
+        }
+        rows.set(key, expiresAt);
+        return [{ expiresAt }];
+      },
+      triggerEvent: {
+        deleteMany: async ({ where }: any) => {
+          rows.delete(where.key);
+          return { count: 1 };
+        },
+      },
+    } as unknown as PrismaService;
+    const config = { get: (key: string, fallback: string) => values[key] ?? fallback } as unknown as ConfigService;
+    return { dedup: new TriggerDedupService(prisma, config), queries: () => queries };
+  };
+
+  it('accepts an event once and answers repeats from memory', async () => {
+    const { dedup, queries } = setup();
+    const key = dedup.key(1, 'email_received', 'msg-1');
+    expect(await dedup.claim(key)).toBe(true);
+    expect(await dedup.claim(key)).toBe(false);
+    expect(await dedup.claim(key)).toBe(false);
+    expect(queries()).toBe(1);
+    expect(dedup.getStats()).toMatchObject({ misses: 1, memoryHits: 2, storeHits: 0 });
+  });
+
+  it('falls back to the store once the key left the memory cache', async () => {
+    const { dedup, queries } = setup({ TRIGGER_DEDUP_MAX_KEYS: '1' });
+    const first = dedup.key(1, 'email_received', 'msg-1');
+    expect(await dedup.claim(first)).toBe(true);
+    expect(await dedup.claim(dedup.key(1, 'email_received', 'msg-2'))).toBe(true);
+    expect(dedup.getStats().cachedKeys).toBe(1);
+    expect(await dedup.claim(first)).toBe(false);
+    expect(queries()).toBe(3);
+    expect(dedup.getStats().storeHits).toBe(1);
+  });
+
+  it('lets a released event through again', async () => {
+    const { dedup } = setup();
+    const key = dedup.key(2, 'new_follower', 'delivery-9');
+    expect(await dedup.claim(key)).toBe(true);
+    await dedup.release(key);
+    expect(await dedup.claim(key)).toBe(true);
+  });
+});
@@ -0,0 +1,119 @@
+import { Injectable, Logger, OnModuleInit, OnModuleDestroy } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { PrismaService } from '../../prisma/prisma.service';
+
+@Injectable()
+export class TriggerDedupService implements OnModuleInit, OnModuleDestroy {
+    private readonly logger = new Logger(TriggerDedupService.name);
+    private readonly seen = new Map<string, number>();
+    private readonly ttl: number;
+    private readonly maxKeys: number;
+    private sweepTimer: NodeJS.Timeout | null = null;
+    private memoryHits = 0;
+    private storeHits = 0;
+    private misses = 0;
+    private released = 0;
+    private expired = 0;
+
+    constructor(
+        private prisma: PrismaService,
+        private configService: ConfigService,
+    ) {
+        this.ttl = Number(this.configService.get<string>('TRIGGER_DEDUP_TTL_MS', '86400000')) || 86400000;
+        this.maxKeys = Number(this.configService.get<string>('TRIGGER_DEDUP_MAX_KEYS', '10000')) || 10000;
+    }
+
+    onModuleInit() {
+        this.sweepTimer = setInterval(() => {
+            this.sweep().catch((error: any) => {
+                this.logger.error(`Failed to sweep expired trigger events: ${error.message}`);
+            });
+        }, Math.min(this.ttl, 3600000));
+        this.sweepTimer.unref();
+    }
+
+    onModuleDestroy() {
+        if (this.sweepTimer) {
+            clearInterval(this.sweepTimer);
+            this.sweepTimer = null;
+        }
+    }
+
+    key(userId: number, actionName: string, eventId: string) {
+        return `${userId}:${actionName}:${eventId}`;
+    }
+
+    async claim(key: string): Promise<boolean> {
+        const now = Date.now();
+        const cachedUntil = this.seen.get(key);
+        if (cachedUntil !== undefined) {
+            if (cachedUntil > now) {
+                this.memoryHits++;
+                return false;
+            }
+            this.seen.delete(key);
+        }
+        const expiresAt = new Date(now + this.ttl);
+        const inserted = await this.prisma.$queryRaw<{ expiresAt: Date }[]>`
+            INSERT INTO "TriggerEvent" ("key", "expiresAt")
+            VALUES (${key}, ${expiresAt})
+            ON CONFLICT ("key") DO UPDATE
+            SET "createdAt" = NOW(), "expiresAt" = EXCLUDED."expiresAt"
+            WHERE "TriggerEvent"."expiresAt" <= NOW()
+            RETURNING "expiresAt"
+        `;
+        if (inserted.length === 0) {
+            this.storeHits++;
+            this.remember(key, now + this.ttl);
+            return false;
+        }
+        this.misses++;
+        this.remember(key, expiresAt.getTime());
+        return true;
+    }
+
+    async release(key: string) {
+        this.seen.delete(key);
+        await this.prisma.triggerEvent.deleteMany({
+            where: { key },
+        });
+        this.released++;
+    }
+
+    getStats() {
+        const hits = this.memoryHits + this.storeHits;
+        return {
+            ttlMs: this.ttl,
+            maxKeys: this.maxKeys,
+            cachedKeys: this.seen.size,
+            hits,
+            memoryHits: this.memoryHits,
+            storeHits: this.storeHits,
+            misses: this.misses,
+            hitRate: hits + this.misses > 0 ? hits / (hits + this.misses) : 0,
+            released: this.released,
+            expired: this.expired,
+        };
+    }
+
+    private remember(key: string, until: number) {
+        this.seen.delete(key);
+        this.seen.set(key, until);
+        while (this.seen.size > this.maxKeys) {
+            this.seen.delete(this.seen.keys().next().value!);
+        }
+    }
+
+    private async sweep() {
+        const now = Date.now();
+        for (const [key, until] of this.seen) {
+            if (until <= now) {
+                this.seen.delete(key);
+            }
+        }
+        const { count } = await this.prisma.triggerEvent.deleteMany({
+            where: { expiresAt: { lte: new Date(now) } },
+        });
+        this.expired += count;
+    }
+}
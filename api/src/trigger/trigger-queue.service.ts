@@ -0,0 +1,207 @@
+import { Injectable, Logger, OnModuleInit, OnModuleDestroy } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { Prisma, TriggerJob } from '@prisma/client';
+import { PrismaService } from '../../prisma/prisma.service';
+import { TriggerJobStatus } from './dto/trigger.dto';
+
+@Injectable()
+export class TriggerQueueService implements OnModuleInit, OnModuleDestroy {
+    private readonly logger = new Logger(TriggerQueueService.name);
+    private readonly listeners: (() => void)[] = [];
+    private readonly maxAttempts: number;
+    private readonly retryDelay: number;
+    private readonly lockTimeout: number;
+    private reaperTimer: NodeJS.Timeout | null = null;
+    private enqueued = 0;
+    private claimed = 0;
+    private completed = 0;
+    private failed = 0;
+    private retried = 0;
+    private reaped = 0;
+
+    constructor(
+        private prisma: PrismaService,
+        private configService: ConfigService,
+    ) {
+        this.maxAttempts = Number(this.configService.get<string>('TRIGGER_JOB_MAX_ATTEMPTS', '3')) || 3;
+        this.retryDelay = Number(this.configService.get<string>('TRIGGER_JOB_RETRY_MS', '2000')) || 2000;
+        this.lockTimeout = Number(this.configService.get<string>('TRIGGER_JOB_LOCK_TIMEOUT_MS', '300000')) || 300000;
+    }
+
+    onModuleInit() {
+        this.reaperTimer = setInterval(() => {
+            this.reapStale().catch((error: any) => {
+                this.logger.error(`Failed to reap stale trigger jobs: ${error.message}`);
+            });
+        }, Math.max(1000, Math.floor(this.lockTimeout / 2)));
+        this.reaperTimer.unref();
+    }
+
+    onModuleDestroy() {
+        if (this.reaperTimer) {
+            clearInterval(this.reaperTimer);
+            this.reaperTimer = null;
+        }
+    }
+
+    onEnqueue(listener: () => void) {
+        this.listeners.push(listener);
+    }
+
+    async enqueue(userId: number, actionName: string, payload: any): Promise<TriggerJob> {
+        const job = await this.prisma.triggerJob.create({
+            data: {
+                userId,
+                actionName,
+                payload: payload ?? Prisma.JsonNull,
+                maxAttempts: this.maxAttempts,
+            },
+        });
+        this.enqueued++;
+        for (const listener of this.listeners) {
+            listener();
+        }
+        return job;
+    }
+
+    async claim(workerId: string, limit: number): Promise<TriggerJob[]> {
+        if (limit <= 0) {
+            return [];
+        }
+        const jobs = await this.prisma.$queryRaw<TriggerJob[]>`
+            UPDATE "TriggerJob"
+            SET "status" = 'RUNNING',
+                "lockedAt" = NOW(),
+                "lockedBy" = ${workerId},
+                "attempts" = "attempts" + 1
+            WHERE "id" IN (
+                WITH ranked AS (
+                    SELECT j."id",
+                           j."runAt",
+                           ROW_NUMBER() OVER (PARTITION BY j."userId" ORDER BY j."runAt", j."id")::float
+                               / GREATEST(COALESCE(u."executionWeight", 1), 1) AS "virtualFinish"
+                    FROM "TriggerJob" j
+                    LEFT JOIN "User" u ON u."id" = j."userId"
+                    WHERE j."status" = 'PENDING' AND j."runAt" <= NOW()
+                )
+                SELECT t."id" FROM "TriggerJob" t
+                JOIN ranked r ON r."id" = t."id"
+                WHERE t."status" = 'PENDING'
+                ORDER BY r."virtualFinish", r."runAt", r."id"
+                LIMIT ${limit}
+                FOR UPDATE OF t SKIP LOCKED
+            )
+            RETURNING *
+        `;
+        this.claimed += jobs.length;
+        return jobs.sort((a, b) => a.id - b.id);
+    }
+
+    async complete(job: TriggerJob, result: any) {
+        await this.prisma.triggerJob.updateMany({
+            where: { id: job.id, lockedBy: job.lockedBy },
+            data: {
+                status: TriggerJobStatus.DONE,
+                result: result ?? Prisma.JsonNull,
+                lastError: null,
+                lockedAt: null,
+                completedAt: new Date(),
+            },
+        });
+        this.completed++;
+    }
+
+    async fail(job: TriggerJob, errorMessage: string) {
+        const exhausted = job.attempts >= job.maxAttempts;
+        await this.prisma.triggerJob.updateMany({
+            where: { id: job.id, lockedBy: job.lockedBy },
+            data: exhausted
+                ? {
+                    status: TriggerJobStatus.FAILED,
+                    lastError: errorMessage,
+                    lockedAt: null,
+                    completedAt: new Date(),
+                }
+                : {
+                    status: TriggerJobStatus.PENDING,
+                    lastError: errorMessage,
+                    lockedAt: null,
+                    lockedBy: null,
+                    runAt: new Date(Date.now() + this.retryDelay * 2 ** (job.attempts - 1)),
+                },
+        });
+        if (exhausted) {
+            this.failed++;
+        } else {
+            this.retried++;
+        }
+    }
+
+    async renew(workerId: string, ids: number[]) {
+        if (ids.length === 0) {
+            return 0;
+        }
+        const renewed = await this.prisma.triggerJob.updateMany({
+            where: { id: { in: ids }, lockedBy: workerId, status: TriggerJobStatus.RUNNING },
+            data: { lockedAt: new Date() },
+        });
+        return renewed.count;
+    }
+
+    async findOne(id: number) {
+        return this.prisma.triggerJob.findUnique({
+            where: { id },
+        });
+    }
+
+    async getStats() {
+        const counts = await this.prisma.triggerJob.groupBy({
+            by: ['status'],
+            _count: { _all: true },
+        });
+        return {
+            depth: Object.fromEntries(counts.map(count => [count.status, count._count._all])),
+            enqueued: this.enqueued,
+            claimed: this.claimed,
+            completed: this.completed,
+            failed: this.failed,
+            retried: this.retried,
+            reaped: this.reaped,
+        };
+    }
+
+    private async reapStale() {
+        const staleBefore = new Date(Date.now() - this.lockTimeout);
+        const exhausted = await this.prisma.triggerJob.updateMany({
+            where: {
+                status: TriggerJobStatus.RUNNING,
+                lockedAt: { lt: staleBefore },
+                attempts: { gte: this.maxAttempts },
+            },
+            data: {
+                status: TriggerJobStatus.FAILED,
+                lastError: 'Worker lock expired',
+                lockedAt: null,
+                completedAt: new Date(),
+            },
+        });
+        const released = await this.prisma.triggerJob.updateMany({
+            where: {
+                status: TriggerJobStatus.RUNNING,
+                lockedAt: { lt: staleBefore },
+            },
+            data: {
+                status: TriggerJobStatus.PENDING,
+                lockedAt: null,
+                lockedBy: null,
+            },
+        });
+        if (exhausted.count + released.count > 0) {
+            this.reaped += exhausted.count + released.count;
+            this.logger.warn(`Reaped ${released.count} stale trigger job(s), failed ${exhausted.count}`);
+            for (const listener of this.listeners) {
+                listener();
+            }
+        }
+    }
+}
@@ -0,0 +1,13 @@
+import { Module } from '@nestjs/common';
+import { ConfigModule } from '@nestjs/config';
+import { PrismaModule } from '../../prisma/prisma.module';
+import { TriggerModule } from './trigger.module';
+
+@Module({
+    imports: [
+        ConfigModule.forRoot({isGlobal: true}),
+        PrismaModule,
+        TriggerModule,
+    ],
+})
+export class TriggerWorkerModule { }
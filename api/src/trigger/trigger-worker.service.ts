@@ -0,0 +1,144 @@
+import { Injectable, Logger, OnApplicationBootstrap, OnModuleDestroy } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { TriggerJob } from '@prisma/client';
+import { hostname } from 'os';
+import { TriggerQueueService } from './trigger-queue.service';
+import { TriggerService } from './trigger.service';
+import { TriggerAdmissionService } from './trigger-admission.service';
+import { TriggerWindowService } from '../execution/trigger-window.service';
+
+@Injectable()
+export class TriggerWorkerService implements OnApplicationBootstrap, OnModuleDestroy {
+    private readonly logger = new Logger(TriggerWorkerService.name);
+    private readonly workerId = `${hostname()}:${process.pid}`;
+    private readonly concurrency: number;
+    private readonly pollInterval: number;
+    private readonly heartbeatInterval: number;
+    private readonly active = new Set<Promise<void>>();
+    private readonly running = new Set<number>();
+    private timer: NodeJS.Timeout | null = null;
+    private heartbeatTimer: NodeJS.Timeout | null = null;
+    private polling = false;
+    private stopped = true;
+
+    constructor(
+        private queue: TriggerQueueService,
+        private triggerService: TriggerService,
+        private admission: TriggerAdmissionService,
+        private triggerWindow: TriggerWindowService,
+        private configService: ConfigService,
+    ) {
+        const concurrency = Number(this.configService.get<string>('TRIGGER_WORKERS', '4'));
+        this.concurrency = Number.isFinite(concurrency) && concurrency > 0 ? Math.floor(concurrency) : 0;
+        this.pollInterval = Number(this.configService.get<string>('TRIGGER_WORKER_POLL_MS', '1000')) || 1000;
+        this.heartbeatInterval = Number(this.configService.get<string>('TRIGGER_JOB_HEARTBEAT_MS', '30000')) || 30000;
+    }
+
+    onApplicationBootstrap() {
+        if (this.concurrency === 0) {
+            this.logger.log('Trigger workers disabled in this process');
+            return;
+        }
+        this.stopped = false;
+        this.queue.onEnqueue(() => this.schedule(0));
+        this.triggerWindow.onFlush(() => this.schedule(0));
+        this.heartbeatTimer = setInterval(() => {
+            this.queue.renew(this.workerId, [...this.running]).catch((error: any) => {
+                this.logger.error(`Failed to renew trigger job locks: ${error.message}`);
+            });
+        }, this.heartbeatInterval);
+        this.heartbeatTimer.unref();
+        this.logger.log(`Starting ${this.concurrency} trigger worker(s) as ${this.workerId}`);
+        this.schedule(0);
+    }
+
+    async onModuleDestroy() {
+        this.stopped = true;
+        if (this.timer) {
+            clearTimeout(this.timer);
+            this.timer = null;
+        }
+        await Promise.allSettled([...this.active]);
+        if (this.heartbeatTimer) {
+            clearInterval(this.heartbeatTimer);
+            this.heartbeatTimer = null;
+        }
+    }
+
+    getStats() {
+        return {
+            workerId: this.workerId,
+            concurrency: this.concurrency,
+            active: this.active.size,
+        };
+    }
+
+    private schedule(delay: number) {
+        if (this.stopped) {
+            return;
+        }
+        if (this.timer) {
+            clearTimeout(this.timer);
+        }
+        this.timer = setTimeout(() => {
+            this.timer = null;
+            void this.poll();
+        }, delay);
+    }
+
+    private async poll() {
+        if (this.polling || this.stopped) {
+            return;
+        }
+        this.polling = true;
+        let saturated = false;
+        try {
+            const capacity = this.concurrency - this.active.size;
+            const jobs = await this.queue.claim(this.workerId, capacity);
+            for (const job of jobs) {
+                const running = this.run(job).finally(() => {
+                    this.active.delete(running);
+                    this.schedule(0);
+                });
+                this.active.add(running);
+            }
+            saturated = jobs.length > 0 && jobs.length === capacity;
+        } catch (error: any) {
+            this.logger.error(`Failed to claim trigger jobs: ${error.message}`);
+        } finally {
+            this.polling = false;
+        }
+        if (!saturated) {
+            this.schedule(this.pollInterval);
+        }
+    }
+
+    private async run(job: TriggerJob) {
+        this.running.add(job.id);
+        this.admission.recordWait(job.userId, (job.lockedAt ?? new Date()).getTime() - job.runAt.getTime());
+        try {
+            const result = await this.triggerService.dispatch(job.userId, job.actionName, job.payload, { id: job.id, attempt: job.attempts, triggerNodeId: job.triggerNodeId });
+            await this.queue.complete(job, {
+                success: result.success,
+                triggeredCount: result.triggeredCount,
+                totalWorkflows: result.totalWorkflows ?? 0,
+                error: result.error,
+                executions: (result.results ?? []).map((r: any) => ({
+                    workflowId: r.workflowId,
+                    nodeId: r.nodeId,
+                    executionId: r.result?.nodeExecution?.executionId ?? r.executionId,
+                    coalesced: r.coalesced,
+                    success: r.success,
+                    error: r.error,
+                })),
+            });
+        } catch (error: any) {
+            this.logger.error(`Trigger job ${job.id} failed (attempt ${job.attempts}/${job.maxAttempts}): ${error.message}`);
+            await this.queue.fail(job, error.message).catch((failError: any) => {
+                this.logger.error(`Failed to record failure of trigger job ${job.id}: ${failError.message}`);
+            });
+        } finally {
+            this.running.delete(job.id);
+        }
+    }
+}
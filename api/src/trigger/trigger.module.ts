@@ -0,0 +1,16 @@
+import { Module } from '@nestjs/common';
+import { PrismaModule } from '../../prisma/prisma.module';
+import { NodeModule } from '../nodes/node.module';
+import { ExecutionModule } from '../execution/execution.module';
+import { TriggerService } from './trigger.service';
+import { TriggerQueueService } from './trigger-queue.service';
+import { TriggerWorkerService } from './trigger-worker.service';
+import { TriggerDedupService } from './trigger-dedup.service';
+import { TriggerAdmissionService } from './trigger-admission.service';
+
+@Module({
+    imports: [PrismaModule, NodeModule, ExecutionModule],
+    providers: [TriggerService, TriggerQueueService, TriggerWorkerService, TriggerDedupService, TriggerAdmissionService],
+    exports: [TriggerService, TriggerQueueService, TriggerWorkerService, TriggerDedupService, TriggerAdmissionService],
+})
+export class TriggerModule { }
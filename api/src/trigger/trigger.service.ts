@@ -0,0 +1,123 @@
+import { Injectable, Logger } from '@nestjs/common';
+import { NodeService } from '../nodes/node.service';
+import { FanOutService } from '../execution/fan-out.service';
+import { TriggerIndexService, TriggerTarget } from '../execution/trigger-index.service';
+import { TriggerWindowService } from '../execution/trigger-window.service';
+import { ExecutionJournalService } from '../execution/execution-journal.service';
+
+@Injectable()
+export class TriggerService {
+    private readonly logger = new Logger(TriggerService.name);
+
+    constructor(
+        private nodeService: NodeService,
+        private fanOut: FanOutService,
+        private triggerIndex: TriggerIndexService,
+        private triggerWindow: TriggerWindowService,
+        private journal: ExecutionJournalService,
+    ) { }
+
+    async dispatch(userId: number, actionName: string, data: any, job?: { id: number; attempt: number; triggerNodeId?: number | null }) {
+        this.logger.log(`   Action: ${actionName}`);
+        this.logger.log(`   User: ${userId}`);
+        const actionIds = await this.triggerIndex.resolveActionIds(actionName);
+        if (actionIds.length === 0) {
+            this.logger.warn(`No action found with name: ${actionName}`);
+            return {
+                success: false,
+                error: 'Action not found',
+                triggeredCount: 0,
+            };
+        }
+        this.logger.log(`   Found ${actionIds.length} action(s) with name "${actionName}"`);
+        const windowNodeId = job?.triggerNodeId;
+        const found = await this.triggerIndex.lookup(userId, actionIds);
+        const targets = windowNodeId ? found.filter(target => target.triggerNodeId === windowNodeId) : found;
+        this.logger.log(
+            `   Found ${new Set(targets.map(t => t.workflowId)).size} active workflow(s) with ` +
+            `${targets.length} trigger node(s)`
+        );
+        if (targets.length === 0) {
+            return {
+                success: true,
+                triggeredCount: 0,
+                totalWorkflows: 0,
+                results: [],
+            };
+        }
+        const started = job && job.attempt > 1 ? await this.journal.startedByJob(job.id) : new Map<number, number>();
+        const results = await this.fanOut.run(targets, target => target.workflowId, async target => {
+            const executionId = started.get(target.triggerNodeId);
+            if (executionId) {
+                this.logger.log(
+                    `   Workflow ${target.workflowId} already ran for trigger job ${job!.id} (execution ${executionId}), not starting it again`
+                );
+                return {
+                    workflowId: target.workflowId,
+                    workflowName: target.workflowName,
+                    nodeId: target.triggerNodeId,
+                    success: true,
+                    executionId,
+                };
+            }
+            const decision = windowNodeId
+                ? { action: 'run' as const, input: data }
+                : await this.triggerWindow.admit(userId, actionName, target, data);
+            if (decision.action !== 'run') {
+                this.logger.log(
+                    `   Coalesced event for workflow ${target.workflowId}, node ${target.triggerNodeId} (${decision.mode})`
+                );
+                return {
+                    workflowId: target.workflowId,
+                    workflowName: target.workflowName,
+                    nodeId: target.triggerNodeId,
+                    success: true,
+                    coalesced: decision.mode,
+                };
+            }
+            return this.executeTarget(userId, target, decision.input, job?.id);
+        });
+        const successCount = results.filter(r => r.success && !('coalesced' in r)).length;
+        this.logger.log(`Trigger complete: ${successCount}/${results.length} workflows succeeded`);
+        return {
+            success: true,
+            triggeredCount: successCount,
+            totalWorkflows: results.length,
+            results,
+        };
+    }
+
+    private async executeTarget(userId: number, { workflowId, workflowName, triggerNodeId }: TriggerTarget, input: any, triggerJobId?: number) {
+        try {
+            this.logger.log(
+                `   Executing workflow "${workflowName}" (ID: ${workflowId}), node ${triggerNodeId}`
+            );
+            const executionResult = await this.nodeService.execute(
+                workflowId,
+                triggerNodeId,
+                { input },
+                userId,
+                triggerJobId,
+            );
+            return {
+                workflowId,
+                workflowName,
+                nodeId: triggerNodeId,
+                success: true,
+                result: executionResult,
+            };
+        } catch (error: any) {
+            this.logger.error(
+                `Error executing workflow ${workflowId}:`,
+                error.message
+            );
+            return {
+                workflowId,
+                workflowName,
+                nodeId: triggerNodeId,
+                success: false,
+                error: error.message,
+            };
+        }
+    }
+}
@@ -1,4 +1,4 @@
-import { IsEmail, IsString, MinLength, IsEnum, IsOptional } from 'class-validator';
+import { IsEmail, IsString, MinLength, IsEnum, IsOptional, IsInt, Min, Max } from 'class-validator';
 import { ApiProperty, ApiPropertyOptional, PartialType } from '@nestjs/swagger';
 
 export enum Role {
@@ -48,4 +48,26 @@ export class CreateUserDto {
     role?: Role;
 }
 
-export class UpdateUserDto extends PartialType(CreateUserDto) { }
+export class UpdateUserDto extends PartialType(CreateUserDto) {
+    @ApiPropertyOptional({
+        description: 'Number of days workflow execution history is kept for this user (defaults to the global retention)',
+        minimum: 1,
+        example: 7
+    })
+    @IsInt()
+    @Min(1)
+    @IsOptional()
+    executionRetentionDays?: number;
+
+    @ApiPropertyOptional({
+        description: 'Share of trigger processing given to this user relative to others (admin only)',
+        minimum: 1,
+        maximum: 100,
+        example: 1
+    })
+    @IsInt()
+    @Min(1)
+    @Max(100)
+    @IsOptional()
+    executionWeight?: number;
+}
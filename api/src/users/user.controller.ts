@@ -48,6 +48,9 @@ export class UserController {
         if (payload.role !== Role.ADMIN && payload.sub !== id) {
             throw new ForbiddenException('You can only update your own information');
         }
+        if (payload.role !== Role.ADMIN && updateUserDto.executionWeight !== undefined) {
+            throw new ForbiddenException('Only admins can change the execution weight');
+        }
         return this.userService.update(id, updateUserDto);
     }
 
@@ -3,7 +3,6 @@ import { UserService } from './user.service';
 import { UserController } from './user.controller';
 import { AuthService } from '../auth/auth.service';
 import { JwtModule } from '@nestjs/jwt';
-import { PrismaService } from '../../prisma/prisma.service';
 
 @Module({
     imports: [
@@ -14,6 +13,6 @@ import { PrismaService } from '../../prisma/prisma.service';
         }),
     ],
     controllers: [UserController],
-    providers: [UserService, AuthService, PrismaService],
+    providers: [UserService, AuthService],
 })
 export class UsersModule { }
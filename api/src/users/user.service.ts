@@ -53,6 +53,8 @@ export class UserService {
                 name: true,
                 surname: true,
                 role: true,
+                executionRetentionDays: true,
+                executionWeight: true,
             },
         });
         if (!user) {
@@ -73,6 +75,8 @@ export class UserService {
                     name: true,
                     surname: true,
                     role: true,
+                    executionRetentionDays: true,
+                    executionWeight: true,
                 },
             });
             return user;
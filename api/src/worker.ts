@@ -0,0 +1,10 @@
+import { NestFactory } from '@nestjs/core';
+import { TriggerWorkerModule } from './trigger/trigger-worker.module';
+
+async function bootstrap() {
+  process.env.REPLICA_ROLE = process.env.REPLICA_ROLE || 'worker';
+  const app = await NestFactory.createApplicationContext(TriggerWorkerModule);
+  app.enableShutdownHooks();
+  console.log(`Trigger worker running with TRIGGER_WORKERS=${process.env.TRIGGER_WORKERS || 4}`);
+}
+bootstrap();
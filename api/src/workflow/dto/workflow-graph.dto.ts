@@ -0,0 +1,96 @@
+import { IsArray, IsInt, IsOptional, IsString, ArrayMaxSize, ValidateNested } from 'class-validator';
+import { Type } from 'class-transformer';
+import { ApiProperty, ApiPropertyOptional } from '@nestjs/swagger';
+import { CreateNodeDto } from '../../nodes/dto/node.dto';
+
+export const MAX_GRAPH_NODES = 1000;
+export const MAX_GRAPH_CONNECTIONS = 5000;
+
+export class GraphNodeDto extends CreateNodeDto {
+    @ApiPropertyOptional({
+        description: 'ID of an existing node of the workflow; omit to create a new node',
+        example: 12
+    })
+    @IsInt()
+    @IsOptional()
+    id?: number;
+
+    @ApiPropertyOptional({
+        description: 'Client-side identifier of a new node, used by connections and mapped to the created node ID',
+        example: 'tmp-1'
+    })
+    @IsString()
+    @IsOptional()
+    tempId?: string;
+}
+
+export class GraphConnectionDto {
+    @ApiPropertyOptional({
+        description: 'ID of an existing source node',
+        example: 12
+    })
+    @IsInt()
+    @IsOptional()
+    sourceNodeId?: number;
+
+    @ApiPropertyOptional({
+        description: 'Client-side identifier of a new source node',
+        example: 'tmp-1'
+    })
+    @IsString()
+    @IsOptional()
+    sourceTempId?: string;
+
+    @ApiPropertyOptional({
+        description: 'ID of an existing target node',
+        example: 13
+    })
+    @IsInt()
+    @IsOptional()
+    targetNodeId?: number;
+
+    @ApiPropertyOptional({
+        description: 'Client-side identifier of a new target node',
+        example: 'tmp-2'
+    })
+    @IsString()
+    @IsOptional()
+    targetTempId?: string;
+
+    @ApiPropertyOptional({
+        description: 'Condition for the connection'
+    })
+    @IsOptional()
+    condition?: any;
+
+    @ApiPropertyOptional({
+        description: 'Channel for the connection',
+        example: 'success',
+        default: 'success'
+    })
+    @IsString()
+    @IsOptional()
+    channel?: string;
+}
+
+export class SaveWorkflowGraphDto {
+    @ApiProperty({
+        description: 'Complete node set of the workflow; existing nodes missing from it are deleted',
+        type: [GraphNodeDto]
+    })
+    @IsArray()
+    @ArrayMaxSize(MAX_GRAPH_NODES)
+    @ValidateNested({ each: true })
+    @Type(() => GraphNodeDto)
+    nodes: GraphNodeDto[];
+
+    @ApiProperty({
+        description: 'Complete connection set of the workflow; existing connections missing from it are deleted',
+        type: [GraphConnectionDto]
+    })
+    @IsArray()
+    @ArrayMaxSize(MAX_GRAPH_CONNECTIONS)
+    @ValidateNested({ each: true })
+    @Type(() => GraphConnectionDto)
+    connections: GraphConnectionDto[];
+}
@@ -0,0 +1,86 @@
+import { Controller, Get, Post, Headers, HttpCode, HttpStatus, UnauthorizedException } from '@nestjs/common';
+import { AuthService } from '../auth/auth.service';
+import { PrismaService } from '../../prisma/prisma.service';
+import { Role } from '../users/dto/user.dto';
+import { ExecutionPlanService } from '../execution/execution-plan.service';
+import { ExecutionJournalService } from '../execution/execution-journal.service';
+import { FanOutService } from '../execution/fan-out.service';
+import { TriggerIndexService } from '../execution/trigger-index.service';
+import { TriggerWindowService } from '../execution/trigger-window.service';
+import { ExecutionLogService } from '../execution/execution-log.service';
+import { ExecutionRetentionService } from '../execution/execution-retention.service';
+import { ReactionDispatcherService } from '../execution/reaction-dispatcher.service';
+import { ReactionBatcherService } from '../execution/reaction-batcher.service';
+import { ExecutionEventsService } from '../execution/execution-events.service';
+import { ReplicaService } from '../execution/replica.service';
+import { TriggerQueueService } from '../trigger/trigger-queue.service';
+import { TriggerDedupService } from '../trigger/trigger-dedup.service';
+import { TriggerAdmissionService } from '../trigger/trigger-admission.service';
+import { TriggerWorkerService } from '../trigger/trigger-worker.service';
+import { LogicExecutorService } from '../logic-executor/logic-executor.service';
+
+@Controller('execution')
+export class ExecutionMetricsController {
+    constructor(
+        private readonly authService: AuthService,
+        private readonly prisma: PrismaService,
+        private readonly executionPlans: ExecutionPlanService,
+        private readonly journal: ExecutionJournalService,
+        private readonly fanOut: FanOutService,
+        private readonly triggerIndex: TriggerIndexService,
+        private readonly triggerWindow: TriggerWindowService,
+        private readonly executionLogs: ExecutionLogService,
+        private readonly retention: ExecutionRetentionService,
+        private readonly reactionDispatcher: ReactionDispatcherService,
+        private readonly reactionBatcher: ReactionBatcherService,
+        private readonly executionEvents: ExecutionEventsService,
+        private readonly replica: ReplicaService,
+        private readonly triggerQueue: TriggerQueueService,
+        private readonly triggerDedup: TriggerDedupService,
+        private readonly triggerAdmission: TriggerAdmissionService,
+        private readonly triggerWorker: TriggerWorkerService,
+        private readonly logicExecutor: LogicExecutorService,
+    ) { }
+
+    @Get('metrics')
+    async getMetrics(@Headers('authorization') authorization: string) {
+        await this.requireAdmin(authorization);
+        return {
+            replicas: this.replica.getStats(),
+            database: this.prisma.getStats(),
+            plans: this.executionPlans.getStats(),
+            journal: this.journal.getStats(),
+            fanOut: this.fanOut.getStats(),
+            triggerIndex: this.triggerIndex.getStats(),
+            triggerWindows: await this.triggerWindow.getStats(),
+            executionLogs: this.executionLogs.getStats(),
+            retention: this.retention.getStats(),
+            reactionDispatch: this.reactionDispatcher.getStats(),
+            reactionBatching: this.reactionBatcher.getStats(),
+            executionStreams: this.executionEvents.getStats(),
+            triggerQueue: await this.triggerQueue.getStats(),
+            triggerDedup: this.triggerDedup.getStats(),
+            triggerAdmission: await this.triggerAdmission.getStats(),
+            triggerWorkers: this.triggerWorker.getStats(),
+            conditions: this.logicExecutor.getConditionStats(),
+        };
+    }
+
+    @Post('prune')
+    @HttpCode(HttpStatus.OK)
+    async prune(@Headers('authorization') authorization: string) {
+        await this.requireAdmin(authorization);
+        return this.retention.prune();
+    }
+
+    private async requireAdmin(authorization: string) {
+        if (!authorization) {
+            throw new UnauthorizedException('No authorization header');
+        }
+        const token = authorization.replace('Bearer ', '');
+        const payload = await this.authService.validateToken(token);
+        if (payload.role !== Role.ADMIN) {
+            throw new UnauthorizedException('Admin access required');
+        }
+    }
+}
@@ -0,0 +1,77 @@
+import { diffGraph, GraphNodeRow } from './workflow-graph';
+import { LogicType } from '../nodes/dto/node.dto';
+
+describe('diffGraph', () => {
+  const node = (id: number, overrides: Partial<GraphNodeRow> = {}): GraphNodeRow => ({
+    id,
+    name: `Node ${id}`,
+    actionId: null,
+    reactionId: 1,
+    logicType: null,
+    conf: { text: 'hi' },
+    isTriggered: false,
+    positionX: null,
+    positionY: null,
+    ...overrides,
+  });
+
+  it('creates new nodes and connections using the allocated ids', () => {
+    const changes = diffGraph(
+      [],
+      [],
+      [
+        { tempId: 'a', actionId: 3, name: 'Trigger' },
+        { tempId: 'b', logicType: LogicType.IF, conf: { condition: 'x > 1' } },
+      ],
+      [{ sourceTempId: 'a', targetTempId: 'b' }],
+      [40, 41],
+    );
+    expect(changes.idMap).toEqual({ a: 40, b: 41 });
+    expect(changes.createNodes.map(created => created.id)).toEqual([40, 41]);
+    expect(changes.createConnections).toEqual([
+      { sourceNodeId: 40, targetNodeId: 41, channel: 'success', condition: null },
+    ]);
+  });
+
+  it('only updates changed nodes and drops missing ones', () => {
+    const changes = diffGraph(
+      [node(1), node(2), node(3)],
+      [
+        { id: 10, sourceNodeId: 1, targetNodeId: 2, channel: 'success', condition: null },
+        { id: 11, sourceNodeId: 2, targetNodeId: 3, channel: 'success', condition: null },
+        { id: 12, sourceNodeId: 1, targetNodeId: 2, channel: 'failed', condition: null },
+      ],
+      [
+        { id: 1, name: 'Node 1', reactionId: 1, conf: { text: 'hi' } },
+        { id: 2, name: 'Renamed', reactionId: 1, conf: { text: 'hi' } },
+      ],
+      [{ sourceNodeId: 1, targetNodeId: 2 }],
+      [],
+    );
+    expect(changes.updateNodes.map(updated => updated.id)).toEqual([2]);
+    expect(changes.deleteNodeIds).toEqual([3]);
+    expect(changes.deleteConnectionIds).toEqual([12]);
+    expect(changes.createConnections).toEqual([]);
+  });
+
+  it('rejects foreign nodes, self loops and unknown references', () => {
+    expect(() => diffGraph([node(1)], [], [{ id: 9, reactionId: 1 }], [], [])).toThrow();
+    expect(() => diffGraph([node(1)], [], [{ id: 1, reactionId: 1 }], [{ sourceNodeId: 1, targetNodeId: 1 }], [])).toThrow();
+    expect(() => diffGraph([], [], [{ tempId: 'a', reactionId: 1 }], [{ sourceTempId: 'a', targetTempId: 'z' }], [5])).toThrow();
+    expect(() => diffGraph([], [], [{ name: 'empty' }], [], [5])).toThrow();
+  });
+
+  it('rejects cyclic graphs', () => {
+    expect(() => diffGraph(
+      [node(1), node(2)],
+      [],
+      [{ id: 1, reactionId: 1 }, { id: 2, reactionId: 1 }, { tempId: 'c', logicType: LogicType.NOT }],
+      [
+        { sourceNodeId: 1, targetNodeId: 2 },
+        { sourceNodeId: 2, targetTempId: 'c' },
+        { sourceTempId: 'c', targetNodeId: 1 },
+      ],
+      [3],
+    )).toThrow();
+  });
+});
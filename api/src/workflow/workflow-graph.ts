@@ -0,0 +1,178 @@
+import { BadRequestException } from '@nestjs/common';
+import { LogicType } from '../nodes/dto/node.dto';
+import { topologicalOrder } from '../execution/graph-order';
+import { GraphConnectionDto, GraphNodeDto } from './dto/workflow-graph.dto';
+
+export interface GraphNodeData {
+    name: string | null;
+    actionId: number | null;
+    reactionId: number | null;
+    logicType: LogicType | null;
+    conf: any;
+    isTriggered: boolean;
+    positionX: number | null;
+    positionY: number | null;
+}
+
+export interface GraphNodeRow extends GraphNodeData {
+    id: number;
+}
+
+export interface GraphConnectionRow {
+    id: number;
+    sourceNodeId: number;
+    targetNodeId: number;
+    channel: string;
+    condition: any;
+}
+
+export interface GraphChanges {
+    createNodes: GraphNodeRow[];
+    updateNodes: GraphNodeRow[];
+    deleteNodeIds: number[];
+    createConnections: Omit<GraphConnectionRow, 'id'>[];
+    updateConnections: { id: number; condition: any }[];
+    deleteConnectionIds: number[];
+    idMap: Record<string, number>;
+}
+
+const NODE_FIELDS: (keyof GraphNodeData)[] = [
+    'name', 'actionId', 'reactionId', 'logicType', 'conf', 'isTriggered', 'positionX', 'positionY',
+];
+
+export function countNewNodes(nodes: GraphNodeDto[]) {
+    return nodes.filter(node => node.id === undefined).length;
+}
+
+export function diffGraph(
+    currentNodes: GraphNodeRow[],
+    currentConnections: GraphConnectionRow[],
+    nodes: GraphNodeDto[],
+    connections: GraphConnectionDto[],
+    newIds: number[],
+): GraphChanges {
+    const existing = new Map(currentNodes.map(node => [node.id, node]));
+    const kept = new Set<number>();
+    const idMap: Record<string, number> = {};
+    const changes: GraphChanges = {
+        createNodes: [],
+        updateNodes: [],
+        deleteNodeIds: [],
+        createConnections: [],
+        updateConnections: [],
+        deleteConnectionIds: [],
+        idMap,
+    };
+    let nextId = 0;
+    for (const node of nodes) {
+        if (!node.actionId && !node.reactionId && !node.logicType) {
+            throw new BadRequestException('Node must have either actionId, reactionId, or logicType');
+        }
+        const data = toNodeData(node);
+        if (node.tempId !== undefined && Object.prototype.hasOwnProperty.call(idMap, node.tempId)) {
+            throw new BadRequestException(`Duplicate node tempId '${node.tempId}'`);
+        }
+        if (node.id === undefined) {
+            const id = newIds[nextId++];
+            if (node.tempId !== undefined) {
+                idMap[node.tempId] = id;
+            }
+            changes.createNodes.push({ id, ...data });
+            continue;
+        }
+        const current = existing.get(node.id);
+        if (!current) {
+            throw new BadRequestException(`Node with ID ${node.id} does not belong to this workflow`);
+        }
+        if (kept.has(node.id)) {
+            throw new BadRequestException(`Node with ID ${node.id} is listed more than once`);
+        }
+        kept.add(node.id);
+        if (node.tempId !== undefined) {
+            idMap[node.tempId] = node.id;
+        }
+        if (NODE_FIELDS.some(field => !sameValue(current[field], data[field]))) {
+            changes.updateNodes.push({ id: node.id, ...data });
+        }
+    }
+    for (const node of currentNodes) {
+        if (!kept.has(node.id)) {
+            changes.deleteNodeIds.push(node.id);
+        }
+    }
+    const present = new Set([...kept, ...changes.createNodes.map(node => node.id)]);
+    const resolve = (nodeId: number | undefined, tempId: string | undefined, role: string) => {
+        if (tempId !== undefined) {
+            if (!Object.prototype.hasOwnProperty.call(idMap, tempId)) {
+                throw new BadRequestException(`Unknown ${role} tempId '${tempId}'`);
+            }
+            return idMap[tempId];
+        }
+        if (nodeId === undefined || !present.has(nodeId)) {
+            throw new BadRequestException(`${role[0].toUpperCase()}${role.slice(1)} node ${nodeId ?? '(missing)'} is not part of the saved graph`);
+        }
+        return nodeId;
+    };
+    const desired = new Map<string, Omit<GraphConnectionRow, 'id'>>();
+    for (const connection of connections) {
+        const sourceNodeId = resolve(connection.sourceNodeId, connection.sourceTempId, 'source');
+        const targetNodeId = resolve(connection.targetNodeId, connection.targetTempId, 'target');
+        if (sourceNodeId === targetNodeId) {
+            throw new BadRequestException('A node cannot be connected to itself');
+        }
+        const channel = connection.channel || 'success';
+        const key = connectionKey(sourceNodeId, targetNodeId, channel);
+        if (desired.has(key)) {
+            throw new BadRequestException(`Connection between nodes ${sourceNodeId} and ${targetNodeId} with channel '${channel}' is listed more than once`);
+        }
+        desired.set(key, { sourceNodeId, targetNodeId, channel, condition: connection.condition ?? null });
+    }
+    const desiredEdges = [...desired.values()];
+    const deleted = new Set(changes.deleteNodeIds);
+    for (const connection of currentConnections) {
+        const key = connectionKey(connection.sourceNodeId, connection.targetNodeId, connection.channel);
+        const wanted = desired.get(key);
+        if (!wanted) {
+            if (!deleted.has(connection.sourceNodeId) && !deleted.has(connection.targetNodeId)) {
+                changes.deleteConnectionIds.push(connection.id);
+            }
+            continue;
+        }
+        desired.delete(key);
+        if (!sameValue(connection.condition, wanted.condition)) {
+            changes.updateConnections.push({ id: connection.id, condition: wanted.condition });
+        }
+    }
+    changes.createConnections.push(...desired.values());
+    if (!topologicalOrder(present, desiredEdges)) {
+        throw new BadRequestException('Workflow graph contains a cycle');
+    }
+    return changes;
+}
+
+function toNodeData(node: GraphNodeDto): GraphNodeData {
+    return {
+        name: node.name ?? null,
+        actionId: node.actionId ?? null,
+        reactionId: node.reactionId ?? null,
+        logicType: node.logicType ?? null,
+        conf: node.conf ?? null,
+        isTriggered: node.isTriggered ?? false,
+        positionX: node.positionX ?? null,
+        positionY: node.positionY ?? null,
+    };
+}
+
+function connectionKey(sourceNodeId: number, targetNodeId: number, channel: string) {
+    return `${sourceNodeId}:${targetNodeId}:${channel}`;
+}
+
+function sameValue(a: any, b: any) {
+    if (a === b) {
+        return true;
+    }
+    if (a === null || b === null || typeof a !== 'object' || typeof b !== 'object') {
+        return false;
+    }
+    return JSON.stringify(a) === JSON.stringify(b);
+}
@@ -1,6 +1,8 @@
 import { Controller, Post, Param, Body, UseGuards, ParseIntPipe, Logger } from '@nestjs/common';
 import { PrismaService } from '../../prisma/prisma.service';
 import { NodeService } from '../nodes/node.service';
+import { FanOutService } from '../execution/fan-out.service';
+import { TriggerIndexService } from '../execution/trigger-index.service';
 
 @Controller('workflows/trigger')
 export class WorkflowTriggerController {
@@ -9,6 +11,8 @@ export class WorkflowTriggerController {
     constructor(
         private readonly prisma: PrismaService,
         private readonly nodeService: NodeService,
+        private readonly fanOut: FanOutService,
+        private readonly triggerIndex: TriggerIndexService,
     ) {}
 
     @Post(':serviceId/:actionName')
@@ -38,52 +42,37 @@ export class WorkflowTriggerController {
                 };
             }
             this.logger.log(`   Action ID: ${action.id}`);
-            const workflows = await this.prisma.workflow.findMany({
-                where: {
-                    userId: body.userId,
-                    isActive: true,
-                },
-                include: {
-                    nodes: {
-                        where: {
-                            actionId: action.id,
-                            isTriggered: true,
-                        },
-                    },
-                },
-            });
-            this.logger.log(`   Found ${workflows.length} active workflow(s)`);
-            const results: any[] = [];
-            for (const workflow of workflows) {
-                for (const triggerNode of workflow.nodes) {
-                    try {
-                        this.logger.log(`   Executing workflow ${workflow.id}, node ${triggerNode.id}`);
-                        const executionResult = await this.nodeService.execute(
-                            workflow.id,
-                            triggerNode.id,
-                            { input: body.data },
-                            body.userId,
-                        );
-                        results.push({
-                            workflowId: workflow.id,
-                            workflowName: workflow.name,
-                            nodeId: triggerNode.id,
-                            success: true,
-                            result: executionResult,
-                        });
-                        this.logger.log(`Workflow ${workflow.id} executed successfully`);
-                    } catch (error: any) {
-                        this.logger.error(`Workflow ${workflow.id} failed:`, error.message);
-                        results.push({
-                            workflowId: workflow.id,
-                            workflowName: workflow.name,
-                            nodeId: triggerNode.id,
-                            success: false,
-                            error: error.message,
-                        });
-                    }
+            const targets = (await this.triggerIndex.lookup(body.userId, [action.id]))
+                .filter(target => target.isTriggered);
+            this.logger.log(`   Found ${new Set(targets.map(t => t.workflowId)).size} active workflow(s)`);
+            const results = await this.fanOut.run(targets, target => target.workflowId, async ({ workflowId, workflowName, triggerNodeId }) => {
+                try {
+                    this.logger.log(`   Executing workflow ${workflowId}, node ${triggerNodeId}`);
+                    const executionResult = await this.nodeService.execute(
+                        workflowId,
+                        triggerNodeId,
+                        { input: body.data },
+                        body.userId,
+                    );
+                    this.logger.log(`Workflow ${workflowId} executed successfully`);
+                    return {
+                        workflowId,
+                        workflowName,
+                        nodeId: triggerNodeId,
+                        success: true,
+                        result: executionResult,
+                    };
+                } catch (error: any) {
+                    this.logger.error(`Workflow ${workflowId} failed:`, error.message);
+                    return {
+                        workflowId,
+                        workflowName,
+                        nodeId: triggerNodeId,
+                        success: false,
+                        error: error.message,
+                    };
                 }
-            }
+            });
             const successCount = results.filter(r => r.success).length;
             this.logger.log(`Trigger complete: ${successCount}/${results.length} workflows succeeded`);
             return {
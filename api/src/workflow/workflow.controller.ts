@@ -4,6 +4,7 @@ import {
     Post,
     Body,
     Patch,
+    Put,
     Param,
     Delete,
     ParseIntPipe,
@@ -11,16 +12,24 @@ import {
     HttpStatus,
     Headers,
     UnauthorizedException,
+    NotFoundException,
+    HttpException,
     Logger,
-    
+    Query,
+    Res,
 } from '@nestjs/common';
+import type { Response } from 'express';
 import { WorkflowService } from './workflow.service';
 import { CreateWorkflowDto, UpdateWorkflowDto } from './dto/workflow.dto';
+import { SaveWorkflowGraphDto } from './dto/workflow-graph.dto';
 import { AuthService } from '../auth/auth.service';
 import { ServiceAuthService } from '../auth/service-auth.service';
 import { Role } from '../users/dto/user.dto';
-import { PrismaService } from '../../prisma/prisma.service';
-import { NodeService } from '../nodes/node.service';
+import { TriggerService } from '../trigger/trigger.service';
+import { TriggerQueueService } from '../trigger/trigger-queue.service';
+import { TriggerDedupService } from '../trigger/trigger-dedup.service';
+import { TriggerAdmissionService } from '../trigger/trigger-admission.service';
+import { ExecutionEventsService } from '../execution/execution-events.service';
 
 @Controller('workflow')
 export class WorkflowController {
@@ -29,8 +38,11 @@ export class WorkflowController {
         private readonly workflowService: WorkflowService,
         private readonly authService: AuthService,
         private readonly serviceAuthService: ServiceAuthService,
-        private readonly prisma: PrismaService,
-        private readonly nodeService: NodeService,
+        private readonly triggerService: TriggerService,
+        private readonly triggerQueue: TriggerQueueService,
+        private readonly triggerDedup: TriggerDedupService,
+        private readonly triggerAdmission: TriggerAdmissionService,
+        private readonly executionEvents: ExecutionEventsService,
     ) { }
 
     @Post()
@@ -59,6 +71,210 @@ export class WorkflowController {
         return this.workflowService.findAll(payload.sub);
     }
 
+    @Get('list')
+    async list(
+        @Headers('authorization') authorization: string,
+        @Headers('if-none-match') ifNoneMatch: string | undefined,
+        @Res() res: Response,
+        @Query('fields') fields?: string,
+        @Query('limit') limit?: string,
+        @Query('cursor') cursor?: string,
+        @Query('since') since?: string,
+    ) {
+        if (!authorization) {
+            throw new UnauthorizedException('No authorization header');
+        }
+        const token = authorization.replace('Bearer ', '');
+        const payload = await this.authService.validateToken(token);
+        const userId = payload.role === Role.ADMIN ? undefined : payload.sub;
+        const query = { fields, limit: limit ? Number(limit) : undefined, cursor, since };
+        const etag = await this.workflowService.getListEtag(userId, query);
+        res.setHeader('ETag', etag);
+        res.setHeader('Cache-Control', 'private, no-cache');
+        if (ifNoneMatch && ifNoneMatch.split(',').some(tag => tag.trim() === etag || tag.trim() === '*')) {
+            res.status(HttpStatus.NOT_MODIFIED).end();
+            return;
+        }
+        res.json(await this.workflowService.list(userId, query));
+    }
+
+    @Get('executions')
+    async getAllExecutions(
+        @Headers('authorization') authorization: string,
+        @Query('workflowId') workflowId?: string,
+        @Query('triggeredBy') triggeredBy?: string,
+        @Query('status') status?: string,
+        @Query('from') from?: string,
+        @Query('to') to?: string,
+        @Query('limit') limit?: string,
+        @Query('cursor') cursor?: string,
+    ) {
+        await this.requireAdmin(authorization);
+        return this.workflowService.getAllExecutions(
+            this.executionFilters(workflowId, triggeredBy, status, from, to),
+            { limit: limit ? Number(limit) : undefined, cursor },
+        );
+    }
+
+    @Get('executions/export')
+    async exportExecutions(
+        @Headers('authorization') authorization: string,
+        @Res() res: Response,
+        @Query('workflowId') workflowId?: string,
+        @Query('triggeredBy') triggeredBy?: string,
+        @Query('status') status?: string,
+        @Query('from') from?: string,
+        @Query('to') to?: string,
+    ) {
+        await this.requireAdmin(authorization);
+        const chunks = this.workflowService.exportExecutions(
+            this.executionFilters(workflowId, triggeredBy, status, from, to),
+        );
+        let closed = false;
+        res.on('close', () => {
+            closed = true;
+        });
+        res.setHeader('Content-Type', 'application/x-ndjson');
+        res.setHeader('Content-Disposition', 'attachment; filename="executions.ndjson"');
+        try {
+            for await (const rows of chunks) {
+                if (closed) {
+                    break;
+                }
+                const body = rows.map(row => JSON.stringify(row)).join('\n') + '\n';
+                if (!res.write(body)) {
+                    await new Promise<void>(resolve => {
+                        const done = () => {
+                            res.off('drain', done);
+                            res.off('close', done);
+                            resolve();
+                        };
+                        res.on('drain', done);
+                        res.on('close', done);
+                    });
+                }
+            }
+            res.end();
+        } catch (error: any) {
+            this.logger.error(`Execution export failed: ${error.message}`);
+            if (!res.headersSent) {
+                throw error;
+            }
+            res.destroy(error);
+        } finally {
+            await chunks.return(undefined);
+        }
+    }
+
+    @Post('executions/:id/cancel')
+    @HttpCode(HttpStatus.ACCEPTED)
+    async cancelExecution(
+        @Param('id', ParseIntPipe) id: number,
+        @Headers('authorization') authorization: string,
+    ) {
+        if (!authorization) {
+            throw new UnauthorizedException('No authorization header');
+        }
+        const token = authorization.replace('Bearer ', '');
+        const payload = await this.authService.validateToken(token);
+        if (payload.role === Role.ADMIN) {
+            return this.workflowService.cancelExecution(id);
+        }
+        return this.workflowService.cancelExecution(id, payload.sub);
+    }
+
+    @Get('executions/:id/stream')
+    async streamExecution(
+        @Param('id', ParseIntPipe) id: number,
+        @Headers('authorization') authorization: string,
+        @Res() res: Response,
+        @Query('token') queryToken?: string,
+    ) {
+        if (!authorization && !queryToken) {
+            throw new UnauthorizedException('No authorization header');
+        }
+        const token = authorization ? authorization.replace('Bearer ', '') : queryToken!;
+        const payload = await this.authService.validateToken(token);
+        const userId = payload.role === Role.ADMIN ? undefined : payload.sub;
+        const subscription = this.executionEvents.subscribe(id);
+        let snapshot: Awaited<ReturnType<WorkflowService['getExecutionProgress']>>;
+        try {
+            snapshot = await this.workflowService.getExecutionProgress(id, userId);
+        } catch (error) {
+            subscription.close();
+            throw error;
+        }
+        res.on('close', () => subscription.close());
+        res.status(HttpStatus.OK);
+        res.setHeader('Content-Type', 'text/event-stream');
+        res.setHeader('Cache-Control', 'no-cache');
+        res.setHeader('Connection', 'keep-alive');
+        res.setHeader('X-Accel-Buffering', 'no');
+        res.flushHeaders();
+        const send = (event: string, data: any) =>
+            res.writableEnded || res.write(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+        send('snapshot', snapshot);
+        if (snapshot.completedAt) {
+            subscription.close();
+            res.end();
+            return;
+        }
+        let idle = true;
+        const heartbeat = setInterval(() => {
+            if (res.writableEnded) {
+                return;
+            }
+            if (!idle) {
+                idle = true;
+                res.write(': ping\n\n');
+                return;
+            }
+            this.workflowService.getExecutionProgress(id).then(progress => {
+                if (res.writableEnded) {
+                    return;
+                }
+                send('snapshot', progress);
+                if (progress.completedAt) {
+                    subscription.close();
+                }
+            }).catch((error: any) => {
+                this.logger.error(`Execution stream refresh failed: ${error.message}`);
+            });
+        }, this.executionEvents.heartbeatMs);
+        heartbeat.unref();
+        try {
+            let batch = await subscription.next();
+            while (batch) {
+                idle = false;
+                if (batch.dropped > 0) {
+                    send('dropped', { count: batch.dropped });
+                }
+                let writable = true;
+                for (const event of batch.events) {
+                    writable = send(event.type, event);
+                    if (event.type === 'run.finished') {
+                        subscription.close();
+                    }
+                }
+                if (!writable) {
+                    await new Promise<void>(resolve => {
+                        const done = () => {
+                            res.off('drain', done);
+                            res.off('close', done);
+                            resolve();
+                        };
+                        res.on('drain', done);
+                        res.on('close', done);
+                    });
+                }
+                batch = await subscription.next();
+            }
+        } finally {
+            clearInterval(heartbeat);
+            res.end();
+        }
+    }
+
     @Get(':id')
     async findOne(
         @Param('id', ParseIntPipe) id: number,
@@ -92,6 +308,23 @@ export class WorkflowController {
         return this.workflowService.update(id, updateWorkflowDto, payload.sub);
     }
 
+    @Put(':id/graph')
+    async saveGraph(
+        @Param('id', ParseIntPipe) id: number,
+        @Body() graph: SaveWorkflowGraphDto,
+        @Headers('authorization') authorization: string,
+    ) {
+        if (!authorization) {
+            throw new UnauthorizedException('No authorization header');
+        }
+        const token = authorization.replace('Bearer ', '');
+        const payload = await this.authService.validateToken(token);
+        if (payload.role === Role.ADMIN) {
+            return this.workflowService.saveGraph(id, graph);
+        }
+        return this.workflowService.saveGraph(id, graph, payload.sub);
+    }
+
     @Delete(':id')
     @HttpCode(HttpStatus.NO_CONTENT)
     async remove(
@@ -126,111 +359,70 @@ export class WorkflowController {
     }
 
     @Post('trigger/:userId/:actionName')
+    @HttpCode(HttpStatus.ACCEPTED)
     async triggerWorkflows(
         @Param('userId', ParseIntPipe) userId: number,
         @Param('actionName') actionName: string,
-        @Body() body: { data: any },
+        @Body() body: { data: any; eventId?: string },
+        @Res({ passthrough: true }) res: Response,
+        @Headers('idempotency-key') idempotencyKey?: string,
     ) {
-        try {
-            this.logger.log(`   Action: ${actionName}`);
-            this.logger.log(`   User: ${userId}`);
-            const actions = await this.prisma.actions.findMany({
-                where: {
-                    name: actionName,
-                },
-            });
-            if (actions.length === 0) {
-                this.logger.warn(`No action found with name: ${actionName}`);
-                return {
-                    success: false,
-                    error: 'Action not found',
-                    triggeredCount: 0,
-                };
-            }
-            this.logger.log(`   Found ${actions.length} action(s) with name "${actionName}"`);
-            const actionIds = actions.map(a => a.id);
-            const workflows = await this.prisma.workflow.findMany({
-                where: {
-                    userId: userId,
-                    isActive: true,
-                },
-                include: {
-                    nodes: {
-                        where: {
-                            actionId: {
-                                in: actionIds,
-                            },
-                        },
-                    },
-                },
-            });
-            const workflowsWithTriggers = workflows.filter(w => w.nodes.length > 0);
-            this.logger.log(
-                `   Found ${workflowsWithTriggers.length} active workflow(s) with ` +
-                `${workflowsWithTriggers.reduce((acc, w) => acc + w.nodes.length, 0)} trigger node(s)`
-            );
-            if (workflowsWithTriggers.length === 0) {
-                return {
-                    success: true,
-                    triggeredCount: 0,
-                    totalWorkflows: 0,
-                    results: [],
-                };
-            }
-            const results: any[] = [];
-            for (const workflow of workflowsWithTriggers) {
-                for (const triggerNode of workflow.nodes) {
-                    try {
-                        this.logger.log(
-                            `   Executing workflow "${workflow.name}" (ID: ${workflow.id}), node ${triggerNode.id}`
-                        );
-                        const executionResult = await this.nodeService.execute(
-                            workflow.id,
-                            triggerNode.id,
-                            { input: body.data },
-                            userId,
-                        );
-                        results.push({
-                            workflowId: workflow.id,
-                            workflowName: workflow.name,
-                            nodeId: triggerNode.id,
-                            success: true,
-                            result: executionResult,
-                        });
-                    } catch (error: any) {
-                        this.logger.error(
-                            `Error executing workflow ${workflow.id}:`,
-                            error.message
-                        );
-                        results.push({
-                            workflowId: workflow.id,
-                            workflowName: workflow.name,
-                            nodeId: triggerNode.id,
-                            success: false,
-                            error: error.message,
-                        });
-                    }
-                }
-            }
-            const successCount = results.filter(r => r.success).length;
-            this.logger.log(`Trigger complete: ${successCount}/${results.length} workflows succeeded`);
+        const eventId = body?.eventId ?? idempotencyKey;
+        const dedupKey = eventId ? this.triggerDedup.key(userId, actionName, String(eventId)) : null;
+        if (dedupKey && !(await this.triggerDedup.claim(dedupKey))) {
+            this.logger.log(`Dropped duplicate trigger event "${eventId}" for action "${actionName}" (user ${userId})`);
             return {
                 success: true,
-                triggeredCount: successCount,
-                totalWorkflows: results.length,
-                results,
+                queued: false,
+                duplicate: true,
+                jobIds: [],
             };
-        } catch (error: any) {
-            this.logger.error('Trigger error:', error.message);
-            if (error instanceof UnauthorizedException) {
-                throw error;
+        }
+        let job;
+        try {
+            const admission = await this.triggerAdmission.admit(userId);
+            if (!admission.admitted) {
+                this.logger.warn(`Shed trigger for action "${actionName}" (user ${userId}): ${admission.reason}`);
+                res.setHeader('Retry-After', String(admission.retryAfter));
+                throw new HttpException(admission.reason, HttpStatus.TOO_MANY_REQUESTS);
             }
-            return {
-                success: false,
-                error: error.message,
-                triggeredCount: 0,
-            };
+            job = await this.triggerQueue.enqueue(userId, actionName, body?.data);
+        } catch (error) {
+            if (dedupKey) {
+                await this.triggerDedup.release(dedupKey);
+            }
+            throw error;
+        }
+        this.logger.log(`Queued trigger job ${job.id} for action "${actionName}" (user ${userId})`);
+        return {
+            success: true,
+            queued: true,
+            jobIds: [job.id],
+        };
+    }
+
+    @Get('trigger/jobs/:id')
+    async getTriggerJob(
+        @Param('id', ParseIntPipe) id: number,
+        @Headers('authorization') authorization: string,
+    ) {
+        if (!authorization) {
+            throw new UnauthorizedException('No authorization header');
+        }
+        const token = authorization.replace('Bearer ', '');
+        let payload: any;
+        let isService = false;
+        try {
+            payload = await this.authService.validateToken(token);
+        } catch {
+            payload = await this.serviceAuthService.validateToken(token);
+            isService = true;
         }
+        const job = await this.triggerQueue.findOne(id);
+        if (!job || (!isService && payload.role !== Role.ADMIN && job.userId !== payload.sub)) {
+            throw new NotFoundException(`Trigger job with ID ${id} not found`);
+        }
+        return job;
     }
 
     @Post('trigger/test/:serviceId/:actionName')
@@ -253,11 +445,19 @@ export class WorkflowController {
         } catch {
             payload = await this.serviceAuthService.validateToken(token);
         }
-        return this.triggerWorkflows(serviceId, actionName, body);
+        try {
+            return await this.triggerService.dispatch(serviceId, actionName, body.data);
+        } catch (error: any) {
+            this.logger.error('Trigger error:', error.message);
+            return {
+                success: false,
+                error: error.message,
+                triggeredCount: 0,
+            };
+        }
     }
 
-    @Get('executions')
-    async getAllExecutions(@Headers('authorization') authorization: string) {
+    private async requireAdmin(authorization: string) {
         if (!authorization) {
             throw new UnauthorizedException('No authorization header');
         }
@@ -266,6 +466,14 @@ export class WorkflowController {
         if (payload.role !== Role.ADMIN) {
             throw new UnauthorizedException('Admin access required');
         }
-        return this.workflowService.getAllExecutions();
+    }
+
+    private executionFilters(workflowId?: string, triggeredBy?: string, status?: string, from?: string, to?: string) {
+        return {
+            workflowId,
+            triggeredBy,
+            status,
+            startedAt: from || to ? { gte: from, lte: to } : undefined,
+        };
     }
 }
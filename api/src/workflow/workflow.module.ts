@@ -1,10 +1,14 @@
 import { Module } from '@nestjs/common';
 import { WorkflowService } from './workflow.service';
 import { WorkflowController } from './workflow.controller';
+import { ExecutionMetricsController } from './execution-metrics.controller';
 import { PrismaModule } from '../../prisma/prisma.module';
 import { AuthModule } from '../auth/auth.module';
 import { NodeModule } from '../nodes/node.module';
 import { HttpModule } from '@nestjs/axios';
+import { ExecutionModule } from '../execution/execution.module';
+import { TriggerModule } from '../trigger/trigger.module';
+import { LogicExecutorModule } from '../logic-executor/logic-executor.module';
 
 @Module({
     imports: [
@@ -12,8 +16,11 @@ import { HttpModule } from '@nestjs/axios';
         AuthModule,
         NodeModule,
         HttpModule,
+        ExecutionModule,
+        TriggerModule,
+        LogicExecutorModule,
     ],
-    controllers: [WorkflowController],
+    controllers: [WorkflowController, ExecutionMetricsController],
     providers: [WorkflowService],
     exports: [WorkflowService],
 })
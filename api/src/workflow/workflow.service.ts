@@ -1,10 +1,69 @@
-import { Injectable, NotFoundException, ForbiddenException } from '@nestjs/common';
+import { Injectable, NotFoundException, ForbiddenException, BadRequestException, ConflictException } from '@nestjs/common';
+import { Prisma } from '@prisma/client';
+import { ConfigService } from '@nestjs/config';
+import { createHash } from 'crypto';
 import { PrismaService } from '../../prisma/prisma.service';
 import { CreateWorkflowDto, UpdateWorkflowDto } from './dto/workflow.dto';
+import { ExecutionPlanService } from '../execution/execution-plan.service';
+import { ExecutionJournalService } from '../execution/execution-journal.service';
+import { ExecutionStatus } from '../nodes/dto/node.dto';
+import { SaveWorkflowGraphDto } from './dto/workflow-graph.dto';
+import { countNewNodes, diffGraph, GraphNodeRow } from './workflow-graph';
+
+const DEFAULT_EXECUTION_PAGE = 100;
+const MAX_EXECUTION_PAGE = 1000;
+const EXPORT_CHUNK_SIZE = 1000;
+
+const DEFAULT_WORKFLOW_PAGE = 50;
+const MAX_WORKFLOW_PAGE = 200;
+const GRAPH_SAVE_TIMEOUT_MS = 30000;
+const GRAPH_NODE_SELECT = {
+    id: true,
+    name: true,
+    actionId: true,
+    reactionId: true,
+    logicType: true,
+    conf: true,
+    isTriggered: true,
+    positionX: true,
+    positionY: true,
+} as const;
+const GRAPH_CONNECTION_SELECT = {
+    id: true,
+    sourceNodeId: true,
+    targetNodeId: true,
+    channel: true,
+    condition: true,
+} as const;
+const WORKFLOW_LIST_FIELDS = ['nodes', 'nodeConnections', 'user'] as const;
+
+type WorkflowListField = typeof WORKFLOW_LIST_FIELDS[number];
+
+interface KeysetCursor {
+    at: Date;
+    id: number;
+}
+
+export interface WorkflowListQuery {
+    fields?: string;
+    limit?: number;
+    cursor?: string;
+    since?: string;
+}
 
 @Injectable()
 export class WorkflowService {
-    constructor(private prisma: PrismaService) { }
+    private readonly tombstoneDays: number;
+
+    constructor(
+        private prisma: PrismaService,
+        private executionPlans: ExecutionPlanService,
+        private configService: ConfigService,
+        private journal: ExecutionJournalService,
+    ) {
+        this.tombstoneDays = Number(this.configService.get<string>('WORKFLOW_TOMBSTONE_DAYS', '30')) || 30;
+    }
+
     async create(createWorkflowDto: CreateWorkflowDto, userId: number) {
         try {
             const workflow = await this.prisma.workflow.create({
@@ -27,6 +86,7 @@ export class WorkflowService {
                     nodeConnections: true,
                 },
             });
+            this.prisma.recordWrite(userId);
             return workflow;
         } catch (error) {
             throw error;
@@ -35,7 +95,7 @@ export class WorkflowService {
 
     async findAll(userId?: number) {
         const where = userId ? { userId } : {};
-        return this.prisma.workflow.findMany({
+        return this.prisma.read(userId).workflow.findMany({
             where,
             include: {
                 user: {
@@ -60,6 +120,108 @@ export class WorkflowService {
         });
     }
 
+    async getListEtag(userId: number | undefined, query: WorkflowListQuery) {
+        const { since } = this.resolveSince(query.since);
+        const db = this.prisma.read(userId);
+        const where = this.listFilters(userId, since);
+        const [workflows, executions, tombstones] = await Promise.all([
+            db.workflow.aggregate({
+                where,
+                _count: { _all: true },
+                _max: { updatedAt: true, lastTriggered: true },
+            }),
+            db.workflowExecution.aggregate({
+                where: { workflow: where },
+                _count: { _all: true },
+                _max: { startedAt: true },
+            }),
+            since
+                ? db.workflowTombstone.aggregate({
+                    where: { ...(userId ? { userId } : {}), deletedAt: { gt: since } },
+                    _count: { _all: true },
+                    _max: { deletedAt: true },
+                })
+                : null,
+        ]);
+        const version = [
+            workflows._count._all,
+            workflows._max.updatedAt?.getTime() ?? 0,
+            workflows._max.lastTriggered?.getTime() ?? 0,
+            executions._count._all,
+            executions._max.startedAt?.getTime() ?? 0,
+            tombstones?._count._all ?? 0,
+            tombstones?._max.deletedAt?.getTime() ?? 0,
+        ].join('-');
+        const variant = createHash('sha1')
+            .update(JSON.stringify([userId ?? null, query.fields ?? '', query.limit ?? '', query.cursor ?? '', since?.getTime() ?? null]))
+            .digest('base64url')
+            .slice(0, 12);
+        return `W/"${version}-${variant}"`;
+    }
+
+    async list(userId: number | undefined, query: WorkflowListQuery) {
+        const db = this.prisma.read(userId);
+        const syncedAt = new Date(Date.now() - this.prisma.staleness(db));
+        const fields = this.parseListFields(query.fields);
+        const limit = Math.min(Math.max(Number(query.limit) || DEFAULT_WORKFLOW_PAGE, 1), MAX_WORKFLOW_PAGE);
+        const after = query.cursor ? this.decodeCursor(query.cursor) : undefined;
+        const { since, fullSync } = this.resolveSince(query.since);
+        const where = this.listFilters(userId, since);
+        const rows = await db.workflow.findMany({
+            select: {
+                id: true,
+                name: true,
+                description: true,
+                isActive: true,
+                userId: true,
+                lastTriggered: true,
+                createdAt: true,
+                updatedAt: true,
+                user: fields.has('user') ? { select: { id: true, email: true, name: true, surname: true } } : false,
+                nodes: fields.has('nodes'),
+                nodeConnections: fields.has('nodeConnections'),
+                _count: {
+                    select: {
+                        nodes: true,
+                        nodeConnections: true,
+                        executions: true,
+                    },
+                },
+            },
+            where: after
+                ? {
+                    AND: [
+                        where,
+                        {
+                            OR: [
+                                { updatedAt: { lt: after.at } },
+                                { updatedAt: after.at, id: { lt: after.id } },
+                            ],
+                        },
+                    ],
+                }
+                : where,
+            orderBy: [{ updatedAt: 'desc' }, { id: 'desc' }],
+            take: limit + 1,
+        });
+        const items = rows.slice(0, limit);
+        const last = items[items.length - 1];
+        const deleted = since && !after
+            ? await db.workflowTombstone.findMany({
+                where: { ...(userId ? { userId } : {}), deletedAt: { gt: since } },
+                select: { workflowId: true },
+                orderBy: { deletedAt: 'asc' },
+            })
+            : [];
+        return {
+            items,
+            nextCursor: rows.length > limit ? this.encodeCursor(last.updatedAt, last.id) : null,
+            deleted: deleted.map(tombstone => tombstone.workflowId),
+            fullSync,
+            syncedAt,
+        };
+    }
+
     async findOne(id: number, userId?: number) {
         const workflow = await this.prisma.workflow.findUnique({
             where: { id },
@@ -91,6 +253,9 @@ export class WorkflowService {
                     orderBy: {
                         startedAt: 'desc',
                     },
+                    omit: {
+                        checkpoint: true,
+                    },
                 },
             },
         });
@@ -122,6 +287,8 @@ export class WorkflowService {
                     nodeConnections: true,
                 },
             });
+            this.executionPlans.invalidate(id);
+            this.prisma.recordWrite(workflow.userId);
             return workflow;
         } catch (error) {
             throw error;
@@ -130,10 +297,17 @@ export class WorkflowService {
 
     async remove(id: number, userId?: number) {
         try {
-            await this.findOne(id, userId);
-            await this.prisma.workflow.delete({
-                where: { id },
-            });
+            const workflow = await this.findOne(id, userId);
+            await this.prisma.$transaction([
+                this.prisma.workflow.delete({
+                    where: { id },
+                }),
+                this.prisma.workflowTombstone.create({
+                    data: { workflowId: id, userId: workflow.userId },
+                }),
+            ]);
+            this.executionPlans.invalidate(id);
+            this.prisma.recordWrite(workflow.userId);
             return { message: `Workflow with ID ${id} deleted successfully` };
         } catch (error) {
             throw error;
@@ -142,18 +316,222 @@ export class WorkflowService {
 
     async toggleActive(id: number, userId?: number) {
         const workflow = await this.findOne(id, userId);
-        return this.prisma.workflow.update({
+        const toggled = await this.prisma.workflow.update({
             where: { id },
             data: {
                 isActive: !workflow.isActive,
             },
         });
+        this.executionPlans.invalidate(id);
+        this.prisma.recordWrite(toggled.userId);
+        return toggled;
+    }
+    async saveGraph(id: number, graph: SaveWorkflowGraphDto, userId?: number) {
+        const workflow = await this.prisma.workflow.findUnique({
+            where: { id },
+            select: { id: true, userId: true },
+        });
+        if (!workflow) {
+            throw new NotFoundException(`Workflow with ID ${id} not found`);
+        }
+        if (userId && workflow.userId !== userId) {
+            throw new ForbiddenException('You can only access your own workflows');
+        }
+        try {
+            const saved = await this.prisma.$transaction(async tx => {
+                const [nodes, connections] = await Promise.all([
+                    tx.node.findMany({ where: { workflowId: id }, select: GRAPH_NODE_SELECT }),
+                    tx.nodeConnection.findMany({ where: { workflowId: id }, select: GRAPH_CONNECTION_SELECT }),
+                ]);
+                const newNodes = countNewNodes(graph.nodes);
+                const newIds = newNodes > 0
+                    ? (await tx.$queryRaw<{ id: number }[]>`
+                        SELECT nextval(pg_get_serial_sequence('"Node"', 'id'))::int AS "id"
+                        FROM generate_series(1, ${newNodes})
+                    `).map(row => row.id)
+                    : [];
+                const changes = diffGraph(nodes as GraphNodeRow[], connections, graph.nodes, graph.connections, newIds);
+                if (changes.deleteConnectionIds.length > 0) {
+                    await tx.nodeConnection.deleteMany({ where: { id: { in: changes.deleteConnectionIds }, workflowId: id } });
+                }
+                if (changes.deleteNodeIds.length > 0) {
+                    await tx.node.deleteMany({ where: { id: { in: changes.deleteNodeIds }, workflowId: id } });
+                }
+                for (const { id: nodeId, ...data } of changes.updateNodes) {
+                    await tx.node.update({
+                        where: { id: nodeId },
+                        data: { ...data, conf: data.conf ?? Prisma.DbNull },
+                    });
+                }
+                if (changes.createNodes.length > 0) {
+                    await tx.node.createMany({
+                        data: changes.createNodes.map(node => ({ ...node, workflowId: id, conf: node.conf ?? Prisma.DbNull })),
+                    });
+                }
+                for (const connection of changes.updateConnections) {
+                    await tx.nodeConnection.update({
+                        where: { id: connection.id },
+                        data: { condition: connection.condition ?? Prisma.DbNull },
+                    });
+                }
+                if (changes.createConnections.length > 0) {
+                    await tx.nodeConnection.createMany({
+                        data: changes.createConnections.map(connection => ({
+                            ...connection,
+                            workflowId: id,
+                            condition: connection.condition ?? Prisma.DbNull,
+                        })),
+                    });
+                }
+                await tx.workflow.update({ where: { id }, data: { updatedAt: new Date() }, select: { id: true } });
+                const [savedNodes, savedConnections] = await Promise.all([
+                    tx.node.findMany({ where: { workflowId: id }, select: GRAPH_NODE_SELECT, orderBy: { id: 'asc' } }),
+                    tx.nodeConnection.findMany({ where: { workflowId: id }, select: GRAPH_CONNECTION_SELECT, orderBy: { id: 'asc' } }),
+                ]);
+                return {
+                    nodes: savedNodes,
+                    connections: savedConnections,
+                    idMap: changes.idMap,
+                    summary: {
+                        nodesCreated: changes.createNodes.length,
+                        nodesUpdated: changes.updateNodes.length,
+                        nodesDeleted: changes.deleteNodeIds.length,
+                        connectionsCreated: changes.createConnections.length,
+                        connectionsUpdated: changes.updateConnections.length,
+                        connectionsDeleted: changes.deleteConnectionIds.length,
+                    },
+                };
+            }, { timeout: GRAPH_SAVE_TIMEOUT_MS });
+            this.executionPlans.invalidate(id);
+            this.prisma.recordWrite(workflow.userId);
+            return saved;
+        } catch (error) {
+            if (error instanceof Prisma.PrismaClientKnownRequestError && error.code === 'P2003') {
+                throw new ConflictException('Graph references an unknown action or reaction, or deletes a node referenced by execution history');
+            }
+            throw error;
+        }
     }
+
     async getUserWorkflows(userId: number) {
         return this.findAll(userId);
     }
 
-    async getAllExecutions(filters?: any, paging?: { take?: number; skip?: number }) {
+    async cancelExecution(id: number, userId?: number) {
+        const execution = await this.prisma.workflowExecution.findUnique({
+            where: { id },
+            select: {
+                id: true,
+                status: true,
+                completedAt: true,
+                workflow: { select: { userId: true } },
+            },
+        });
+        if (!execution) {
+            throw new NotFoundException(`Execution with ID ${id} not found`);
+        }
+        if (userId && execution.workflow.userId !== userId) {
+            throw new ForbiddenException('You can only cancel executions of your own workflows');
+        }
+        if (execution.completedAt || !(await this.journal.cancel(id))) {
+            throw new ConflictException(`Execution with ID ${id} has already finished`);
+        }
+        return { id, cancelled: true };
+    }
+
+    async getExecutionProgress(id: number, userId?: number) {
+        const execution = await this.prisma.workflowExecution.findUnique({
+            where: { id },
+            select: {
+                id: true,
+                workflowId: true,
+                status: true,
+                startedAt: true,
+                completedAt: true,
+                durationMs: true,
+                errorMessage: true,
+                workflow: { select: { userId: true } },
+                nodeExecutions: {
+                    select: {
+                        nodeId: true,
+                        status: true,
+                        executionChannel: true,
+                        startedAt: true,
+                        completedAt: true,
+                    },
+                    orderBy: { startedAt: 'asc' },
+                },
+            },
+        });
+        if (!execution) {
+            throw new NotFoundException(`Execution with ID ${id} not found`);
+        }
+        if (userId && execution.workflow.userId !== userId) {
+            throw new ForbiddenException('You can only follow executions of your own workflows');
+        }
+        const { workflow, ...progress } = execution;
+        return progress;
+    }
+
+    async getAllExecutions(filters?: any, paging?: { limit?: number; cursor?: string }) {
+        const limit = Math.min(Math.max(Number(paging?.limit) || DEFAULT_EXECUTION_PAGE, 1), MAX_EXECUTION_PAGE);
+        const after = paging?.cursor ? this.decodeCursor(paging.cursor) : undefined;
+        const rows = await this.findExecutionPage(this.buildExecutionFilters(filters), after, limit + 1);
+        const items = rows.slice(0, limit);
+        const last = items[items.length - 1];
+        return {
+            items,
+            nextCursor: rows.length > limit ? this.encodeCursor(last.startedAt, last.id) : null,
+        };
+    }
+
+    async *exportExecutions(filters?: any, chunkSize = EXPORT_CHUNK_SIZE) {
+        const where = this.buildExecutionFilters(filters);
+        let after: KeysetCursor | undefined;
+        while (true) {
+            const rows = await this.findExecutionPage(where, after, chunkSize);
+            if (rows.length > 0) {
+                yield rows;
+            }
+            if (rows.length < chunkSize) {
+                return;
+            }
+            const last = rows[rows.length - 1];
+            after = { at: last.startedAt, id: last.id };
+        }
+    }
+
+    private findExecutionPage(where: any, after: KeysetCursor | undefined, take: number) {
+        return this.prisma.read().workflowExecution.findMany({
+            select: {
+                id: true,
+                workflowId: true,
+                triggeredBy: true,
+                status: true,
+                startedAt: true,
+                completedAt: true,
+                durationMs: true,
+                errorMessage: true,
+            },
+            where: after
+                ? {
+                    AND: [
+                        where,
+                        {
+                            OR: [
+                                { startedAt: { lt: after.at } },
+                                { startedAt: after.at, id: { lt: after.id } },
+                            ],
+                        },
+                    ],
+                }
+                : where,
+            orderBy: [{ startedAt: 'desc' }, { id: 'desc' }],
+            take,
+        });
+    }
+
+    private buildExecutionFilters(filters?: any) {
         const where: any = {};
         if (filters) {
             if (typeof filters.workflowId !== 'undefined' && !Number.isNaN(Number(filters.workflowId))) {
@@ -163,38 +541,71 @@ export class WorkflowService {
                 where.triggeredBy = Number(filters.triggeredBy);
             }
             if (typeof filters.status === 'string' && filters.status.length > 0) {
+                if (!Object.values(ExecutionStatus).includes(filters.status as ExecutionStatus)) {
+                    throw new BadRequestException(`Invalid status: ${filters.status}`);
+                }
                 where.status = filters.status;
             }
             if (filters.startedAt) {
                 where.startedAt = {};
                 if (filters.startedAt.gte) {
-                    where.startedAt.gte = filters.startedAt.gte;
+                    where.startedAt.gte = this.parseDate(filters.startedAt.gte);
                 }
                 if (filters.startedAt.lte) {
-                    where.startedAt.lte = filters.startedAt.lte;
+                    where.startedAt.lte = this.parseDate(filters.startedAt.lte);
                 }
             }
         }
+        return where;
+    }
 
-        const findOptions: any = {
-            select: {
-                id: true,
-                workflowId: true,
-                triggeredBy: true,
-                status: true,
-                startedAt: true,
-                completedAt: true,
-                errorMessage: true,
-            },
-            where,
-            orderBy: { startedAt: 'desc' },
-        };
+    private parseDate(value: string | Date) {
+        const date = new Date(value);
+        if (Number.isNaN(date.getTime())) {
+            throw new BadRequestException(`Invalid date: ${value}`);
+        }
+        return date;
+    }
+
+    private listFilters(userId: number | undefined, since: Date | undefined) {
+        const where: any = userId ? { userId } : {};
+        if (since) {
+            where.updatedAt = { gt: since };
+        }
+        return where;
+    }
+
+    private parseListFields(fields?: string) {
+        const selected = new Set<WorkflowListField>();
+        for (const field of (fields ?? '').split(',').map(field => field.trim()).filter(Boolean)) {
+            if (!WORKFLOW_LIST_FIELDS.includes(field as WorkflowListField)) {
+                throw new BadRequestException(`Unknown field: ${field}. Allowed fields: ${WORKFLOW_LIST_FIELDS.join(', ')}`);
+            }
+            selected.add(field as WorkflowListField);
+        }
+        return selected;
+    }
 
-        if (paging) {
-            if (typeof paging.take === 'number') findOptions.take = paging.take;
-            if (typeof paging.skip === 'number') findOptions.skip = paging.skip;
+    private resolveSince(value?: string): { since?: Date; fullSync: boolean } {
+        if (!value) {
+            return { fullSync: true };
+        }
+        const since = this.parseDate(value);
+        if (since.getTime() < Date.now() - this.tombstoneDays * 24 * 60 * 60 * 1000) {
+            return { fullSync: true };
         }
+        return { since, fullSync: false };
+    }
+
+    private encodeCursor(at: Date, id: number) {
+        return Buffer.from(`${at.getTime()}:${id}`).toString('base64url');
+    }
 
-        return this.prisma.workflowExecution.findMany(findOptions);
+    private decodeCursor(cursor: string): KeysetCursor {
+        const [time, id] = Buffer.from(cursor, 'base64url').toString().split(':').map(Number);
+        if (!Number.isInteger(time) || !Number.isInteger(id)) {
+            throw new BadRequestException('Invalid cursor');
+        }
+        return { at: new Date(time), id };
     }
 }
@@ -0,0 +1,53 @@
+import { ConditionCache } from '../../src/logic-executor/condition-compiler';
+
+function legacyEvaluate(condition: any, input: any): boolean {
+    if (typeof condition === 'boolean') {
+        return condition;
+    }
+    if (typeof condition === 'string') {
+        try {
+            let expr = condition;
+            if (input && typeof input === 'object') {
+                Object.keys(input).forEach(key => {
+                    const regex = new RegExp(`\\$\{${key}\}`, 'g');
+                    expr = expr.replace(regex, JSON.stringify(input[key]));
+                });
+            }
+            if (expr.includes('>') || expr.includes('<') || expr.includes('==') || expr.includes('!=')) {
+                return eval(expr);
+            }
+            return !!expr;
+        } catch {
+            return false;
+        }
+    }
+    return !!condition;
+}
+
+function measure(label: string, iterations: number, fn: () => void) {
+    for (let i = 0; i < Math.min(iterations, 10000); i++) {
+        fn();
+    }
+    const start = process.hrtime.bigint();
+    for (let i = 0; i < iterations; i++) {
+        fn();
+    }
+    const elapsed = Number(process.hrtime.bigint() - start);
+    return { label, nsPerOp: elapsed / iterations };
+}
+
+const iterations = Number(process.env.BENCH_ITERATIONS) || 200000;
+const input = { test: 'data', count: 12, author: 'Ada', subject: 'Invoice #42' };
+const conditions = ['2 == 2', '2 == 1', '1 == 1', '1 == 2', 'true', '${count} > 10'];
+const cache = new ConditionCache();
+
+console.log(`condition evaluation, ${iterations} iterations, input with ${Object.keys(input).length} keys`);
+for (const condition of conditions) {
+    const legacy = measure('legacy', iterations, () => legacyEvaluate(condition, input));
+    const compiled = measure('compiled', iterations, () => !!cache.get(condition)(input));
+    console.log(
+        `${JSON.stringify(condition).padEnd(18)} legacy ${legacy.nsPerOp.toFixed(1).padStart(8)} ns/op` +
+        `  compiled ${compiled.nsPerOp.toFixed(1).padStart(7)} ns/op` +
+        `  x${(legacy.nsPerOp / compiled.nsPerOp).toFixed(1)}`
+    );
+}
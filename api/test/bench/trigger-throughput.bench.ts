@@ -0,0 +1,91 @@
+const baseUrl = (process.env.BENCH_URL || 'http://localhost:8080').replace(/\/$/, '');
+const token = process.env.BENCH_TOKEN || '';
+const action = process.env.BENCH_ACTION || 'bench_trigger';
+const users = (process.env.BENCH_USERS || '1').split(',').map(Number).filter(Number.isFinite);
+const duration = Number(process.env.BENCH_DURATION_MS) || 10000;
+const concurrency = Number(process.env.BENCH_CONCURRENCY) || 32;
+const drainTimeout = Number(process.env.BENCH_DRAIN_TIMEOUT_MS) || 60000;
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+async function fire(stats: { accepted: number; shed: number; errors: number; jobIds: number[] }, sequence: number) {
+    const userId = users[sequence % users.length];
+    try {
+        const response = await fetch(`${baseUrl}/workflow/trigger/${userId}/${action}`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ data: { sequence, sentAt: Date.now() } }),
+        });
+        if (response.status === 202) {
+            const body: any = await response.json();
+            stats.accepted++;
+            stats.jobIds.push(...(body.jobIds ?? []));
+        } else if (response.status === 429) {
+            stats.shed++;
+        } else {
+            stats.errors++;
+        }
+    } catch {
+        stats.errors++;
+    }
+}
+
+async function drain(jobIds: number[]) {
+    const pending = new Set(jobIds);
+    const start = Date.now();
+    let failed = 0;
+    while (pending.size > 0 && Date.now() - start < drainTimeout) {
+        for (const id of [...pending].slice(0, concurrency)) {
+            const response = await fetch(`${baseUrl}/workflow/trigger/jobs/${id}`, {
+                headers: { Authorization: `Bearer ${token}` },
+            });
+            const job: any = response.ok ? await response.json() : null;
+            if (job && (job.status === 'DONE' || job.status === 'FAILED')) {
+                pending.delete(id);
+                failed += job.status === 'FAILED' ? 1 : 0;
+            }
+        }
+        if (pending.size > 0) {
+            await sleep(200);
+        }
+    }
+    return { completed: jobIds.length - pending.size, failed, elapsed: Date.now() - start };
+}
+
+async function main() {
+    const metrics = token
+        ? await fetch(`${baseUrl}/execution/metrics`, { headers: { Authorization: `Bearer ${token}` } })
+            .then(response => (response.ok ? response.json() : null))
+            .catch(() => null)
+        : null;
+    const replicas = metrics?.replicas?.live;
+    console.log(
+        `trigger throughput against ${baseUrl}, ${concurrency} clients for ${duration} ms, ${users.length} user(s)` +
+        (replicas ? `, ${replicas.api} api / ${replicas.worker} worker replica(s)` : '')
+    );
+    const stats = { accepted: 0, shed: 0, errors: 0, jobIds: [] as number[] };
+    const start = Date.now();
+    let sequence = 0;
+    await Promise.all(Array.from({ length: concurrency }, async () => {
+        while (Date.now() - start < duration) {
+            await fire(stats, sequence++);
+        }
+    }));
+    const elapsed = (Date.now() - start) / 1000;
+    console.log(
+        `sent ${sequence}  accepted ${stats.accepted} (${(stats.accepted / elapsed).toFixed(1)}/s)` +
+        `  shed ${stats.shed}  errors ${stats.errors}`
+    );
+    if (!token) {
+        console.log('BENCH_TOKEN not set, skipping job completion');
+        return;
+    }
+    const drained = await drain(stats.jobIds);
+    const total = elapsed + drained.elapsed / 1000;
+    console.log(
+        `completed ${drained.completed}/${stats.jobIds.length} jobs (${drained.failed} failed)` +
+        ` in ${total.toFixed(1)} s, ${(drained.completed / total).toFixed(1)} jobs/s`
+    );
+}
+
+void main();
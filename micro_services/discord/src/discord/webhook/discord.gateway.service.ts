@@ -185,7 +185,8 @@ export class DiscordGatewayService implements OnModuleInit, OnModuleDestroy {
                     channelId: data.channel_id,
                     guildId: data.guild_id,
                     timestamp: data.timestamp,
-                }
+                },
+                data.id,
             );
         }
     }
@@ -207,7 +208,8 @@ export class DiscordGatewayService implements OnModuleInit, OnModuleDestroy {
                     discriminator: data.user.discriminator,
                     guildId: data.guild_id,
                     joinedAt: data.joined_at,
-                }
+                },
+                `${data.guild_id}:${data.user.id}:${data.joined_at}`,
             );
         }
     }
@@ -274,7 +276,8 @@ export class DiscordGatewayService implements OnModuleInit, OnModuleDestroy {
                     emoji: data.emoji.name,
                     channelId: data.channel_id,
                     guildId: data.guild_id,
-                }
+                },
+                `${data.message_id}:${data.user_id}:${data.emoji.id ?? data.emoji.name}`,
             );
         }
     }
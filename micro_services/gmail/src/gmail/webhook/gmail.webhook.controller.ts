@@ -42,6 +42,7 @@ export class GmailWebhookController {
         'email_received',
         userIdNum,
         data,
+        data?.id,
       );
 
       return {
@@ -220,7 +220,7 @@ export class GmailPollingService implements OnModuleInit, OnModuleDestroy {
 
       for (const email of newEmails) {
         try {
-          await this.triggerWebhook(userId, 'email_received', email);
+          await this.triggerWebhook(userId, 'email_received', email, email.id);
         } catch (error) {
           this.logger.error(
             `Failed to process email ${email.id} for user ${userId}: ${error.message}`,
@@ -276,9 +276,10 @@ export class GmailPollingService implements OnModuleInit, OnModuleDestroy {
     userId: number,
     eventType: string,
     data: any,
+    eventId?: string,
   ): Promise<void> {
     try {
-      await this.authService.triggerWorkflows(eventType, userId, data);
+      await this.authService.triggerWorkflows(eventType, userId, data, eventId);
       this.logger.debug(
         `Triggered ${eventType} workflow for user ${userId}`,
       );
@@ -60,6 +60,23 @@ export class GoogleSheetsExecutorController {
         }
     }
 
+    @Post('execute-batch')
+    async executeBatch(@Body() body: any) {
+        if (!Array.isArray(body?.items)) {
+            return {
+                success: false,
+                error: 'items must be an array',
+                results: [],
+            };
+        }
+        this.logger.log(`Execute batch request: ${body.items.length} item(s)`);
+        const results = await Promise.all(body.items.map(item => this.execute(item)));
+        return {
+            success: true,
+            results,
+        };
+    }
+
     @Post('test/execute')
     async testExecute(@Body() body: any) {
         this.logger.log('Test execute endpoint called');
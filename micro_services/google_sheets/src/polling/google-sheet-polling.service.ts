@@ -1,9 +1,7 @@
 import { Injectable, Logger, OnModuleInit } from '@nestjs/common';
-import { ConfigService } from '@nestjs/config';
-import { HttpService } from '@nestjs/axios';
-import { firstValueFrom } from 'rxjs';
 import { CredentialsService } from '../credentials/credientials.service';
 import { GoogleSheetsAuthService } from '../google_sheets/auth/google-sheets-auth.service';
+import { AuthService } from '../auth/auth.service';
 
 interface SpreadsheetSnapshot {
     id: string;
@@ -23,8 +21,7 @@ export class GoogleSheetsPollingService implements OnModuleInit {
     constructor(
         private readonly credentialsService: CredentialsService,
         private readonly googleSheetsAuthService: GoogleSheetsAuthService,
-        private readonly httpService: HttpService,
-        private readonly configService: ConfigService,
+        private readonly authService: AuthService,
     ) { }
 
     async onModuleInit() {
@@ -133,7 +130,7 @@ export class GoogleSheetsPollingService implements OnModuleInit {
                         spreadsheetName,
                         spreadsheetUrl: `https://docs.google.com/spreadsheets/d/${spreadsheetId}`,
                         createdAt: spreadsheet.createdTime,
-                    });
+                    }, spreadsheetId);
                 }
                 return;
             }
@@ -214,7 +211,7 @@ export class GoogleSheetsPollingService implements OnModuleInit {
                         rowData: newRows[i],
                         rowIndex,
                         addedAt: new Date().toISOString(),
-                    });
+                    }, `${currentSnapshot.id}:${sheetName}:${rowIndex}:${currentSnapshot.modifiedTime}`);
                 }
             }
             const minLength = Math.min(currentRows.length, previousRows.length);
@@ -237,7 +234,7 @@ export class GoogleSheetsPollingService implements OnModuleInit {
                             oldValue: previousValue,
                             newValue: currentValue,
                             updatedAt: new Date().toISOString(),
-                        });
+                        }, `${currentSnapshot.id}:${sheetName}!${cellRange}:${currentSnapshot.modifiedTime}`);
                     }
                 }
             }
@@ -252,7 +249,7 @@ export class GoogleSheetsPollingService implements OnModuleInit {
                     spreadsheetName: currentSnapshot.name,
                     sheetName,
                     createdAt: new Date().toISOString(),
-                });
+                }, `${currentSnapshot.id}:${sheetName}`);
             }
         }
     }
@@ -286,39 +283,8 @@ export class GoogleSheetsPollingService implements OnModuleInit {
         userId: number,
         eventType: string,
         data: any,
+        eventId?: string,
     ) {
-        try {
-            const mainApiUrl = this.configService.get<string>('MAIN_API_URL');
-            const apiKey = this.configService.get<string>('API_KEY');
-            const url = `${mainApiUrl}/workflow/trigger/${userId}/${eventType}`;
-
-            const payload = {
-                userId,
-                data,
-            };
-
-            const response = await firstValueFrom(
-                this.httpService.post(url, payload, {
-                    headers: {
-                        'x-api-key': apiKey,
-                        'Content-Type': 'application/json',
-                    },
-                }),
-            );
-
-            this.logger.log(
-                `Webhook ${eventType} triggered successfully for user ${userId}: ${response.status}`,
-            );
-            this.logger.debug(`Response: ${JSON.stringify(response.data)}`);
-        } catch (error) {
-            this.logger.error(
-                `Failed to trigger webhook ${eventType} for user ${userId}:`,
-                error.message,
-            );
-            if (error.response) {
-                this.logger.error(`Status: ${error.response.status}`);
-                this.logger.error(`Response: ${JSON.stringify(error.response.data)}`);
-            }
-        }
+        await this.authService.triggerWorkflows(eventType, userId, data, eventId);
     }
 }
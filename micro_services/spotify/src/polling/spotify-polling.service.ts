@@ -4,6 +4,7 @@ import { HttpService } from '@nestjs/axios';
 import { firstValueFrom } from 'rxjs';
 import { CredentialsService } from '../credentials/credientials.service';
 import { SpotifyAuthService } from '../spotify/auth/spotify-auth.service';
+import { AuthService } from '../auth/auth.service';
 
 interface SpotifyTrack {
     id: string;
@@ -36,6 +37,7 @@ export class SpotifyPollingService implements OnModuleInit {
         private readonly spotifyAuthService: SpotifyAuthService,
         private readonly httpService: HttpService,
         private readonly configService: ConfigService,
+        private readonly authService: AuthService,
     ) { }
 
     async onModuleInit() {
@@ -222,46 +224,21 @@ export class SpotifyPollingService implements OnModuleInit {
         eventType: 'new_liked_song' | 'new_track_played',
         playedAt?: string,
     ) {
-        try {
-            const mainApiUrl = this.configService.get<string>('MAIN_API_URL');
-            const serviceToken =
-                this.configService.get<string>('SERVICE_TOKEN');
-            const url = `${mainApiUrl}/workflow/trigger/${userId}/${eventType}`;
-            const payload = {
-                userId,
-                data: {
-                    trackId: track.id,
-                    trackName: track.name,
-                    artistName: track.artists[0].name,
-                    album: track.album.name,
-                    uri: track.uri,
-                    ...(eventType === 'new_liked_song'
-                        ? { likedAt: new Date().toISOString() }
-                        : { playedAt: playedAt || new Date().toISOString() }
-                    ),
-                },
-            };
-            const response = await firstValueFrom(
-                this.httpService.post(url, payload, {
-                    headers: {
-                        Authorization: `Bearer ${serviceToken}`,
-                        'Content-Type': 'application/json',
-                    },
-                }),
-            );
-            this.logger.log(
-                `Webhook ${eventType} triggered successfully for user ${userId}: ${response.status}`,
-            );
-            this.logger.debug(`Response: ${JSON.stringify(response.data)}`);
-        } catch (error) {
-            this.logger.error(
-                `Failed to trigger webhook ${eventType} for user ${userId}:`,
-                error.message,
-            );
-            if (error.response) {
-                this.logger.error(`Status: ${error.response.status}`);
-                this.logger.error(`Response: ${JSON.stringify(error.response.data)}`);
-            }
-        }
+        await this.authService.triggerWorkflows(
+            eventType,
+            userId,
+            {
+                trackId: track.id,
+                trackName: track.name,
+                artistName: track.artists[0].name,
+                album: track.album.name,
+                uri: track.uri,
+                ...(eventType === 'new_liked_song'
+                    ? { likedAt: new Date().toISOString() }
+                    : { playedAt: playedAt || new Date().toISOString() }
+                ),
+            },
+            eventType === 'new_liked_song' ? track.id : `${track.id}:${playedAt}`,
+        );
     }
 }
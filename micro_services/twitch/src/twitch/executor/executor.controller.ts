@@ -15,6 +15,16 @@ interface ExecuteResponseDto {
     error?: string;
 }
 
+interface ExecuteBatchRequestDto {
+    items: ExecuteRequestDto[];
+}
+
+interface ExecuteBatchResponseDto {
+    success: boolean;
+    results: ExecuteResponseDto[];
+    error?: string;
+}
+
 @Controller()
 export class ExecutorController {
     private readonly logger = new Logger(ExecutorController.name);
@@ -59,4 +69,21 @@ export class ExecutorController {
             };
         }
     }
+
+    @Post('execute-batch')
+    async executeBatch(@Body() body: ExecuteBatchRequestDto): Promise<ExecuteBatchResponseDto> {
+        if (!Array.isArray(body?.items)) {
+            return {
+                success: false,
+                error: 'items must be an array',
+                results: [],
+            };
+        }
+        this.logger.log(`Execute batch request: ${body.items.length} item(s)`);
+        const results = await Promise.all(body.items.map(item => this.execute(item)));
+        return {
+            success: true,
+            results,
+        };
+    }
 }
@@ -44,12 +44,12 @@ export class TwitchEventSubController {
             return;
         }
         if (messageType === 'notification') {
-            await this.handleNotification(body);
+            await this.handleNotification(body, messageId);
         }
         return;
     }
 
-    private async handleNotification(body: any) {
+    private async handleNotification(body: any, messageId: string) {
         const { subscription, event } = body;
         const subscriptionType = subscription.type;
         this.logger.log(`EventSub notification: ${subscriptionType}`);
@@ -62,13 +62,13 @@ export class TwitchEventSubController {
         }
         switch (subscriptionType) {
             case 'stream.online':
-                await this.handleStreamOnline(event, userId);
+                await this.handleStreamOnline(event, userId, messageId);
                 break;
             case 'stream.offline':
-                await this.handleStreamOffline(event, userId);
+                await this.handleStreamOffline(event, userId, messageId);
                 break;
             case 'channel.follow':
-                await this.handleChannelFollow(event, userId);
+                await this.handleChannelFollow(event, userId, messageId);
                 break;
             case 'channel.update':
                 await this.handleChannelUpdate(event, userId);
@@ -78,7 +78,7 @@ export class TwitchEventSubController {
         }
     }
 
-    private async handleStreamOnline(event: any, userId: number) {
+    private async handleStreamOnline(event: any, userId: number, messageId: string) {
         this.logger.log(`Stream online for user ${userId}`);
         await this.authService.triggerWorkflows(
             'stream_started',
@@ -89,11 +89,12 @@ export class TwitchEventSubController {
                 gameName: event.type || 'live',
                 viewerCount: 0,
                 startedAt: event.started_at,
-            }
+            },
+            messageId,
         );
     }
 
-    private async handleStreamOffline(event: any, userId: number) {
+    private async handleStreamOffline(event: any, userId: number, messageId: string) {
         this.logger.log(`Stream offline for user ${userId}`);
         await this.authService.triggerWorkflows(
             'stream_ended',
@@ -101,11 +102,12 @@ export class TwitchEventSubController {
             {
                 streamId: event.broadcaster_user_id,
                 endedAt: new Date().toISOString(),
-            }
+            },
+            messageId,
         );
     }
 
-    private async handleChannelFollow(event: any, userId: number) {
+    private async handleChannelFollow(event: any, userId: number, messageId: string) {
         this.logger.log(`New follower for user ${userId}: ${event.user_name}`);
         await this.authService.triggerWorkflows(
             'new_follower',
@@ -114,7 +116,8 @@ export class TwitchEventSubController {
                 followerName: event.user_name,
                 followerId: event.user_id,
                 followedAt: event.followed_at,
-            }
+            },
+            messageId,
         );
     }
 
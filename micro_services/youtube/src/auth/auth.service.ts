@@ -48,7 +48,7 @@ export class AuthService implements OnModuleInit {
         }
     }
 
-    async triggerWorkflows(actionName: string, userId: number, triggerData: any): Promise<void> {
+    async triggerWorkflows(actionName: string, userId: number, triggerData: any, eventId?: string): Promise<void> {
         try {
             if (!this.serviceId) {
                 this.logger.error('Service ID not available. Registration may have failed.');
@@ -58,20 +58,33 @@ export class AuthService implements OnModuleInit {
             this.logger.log(`Triggering workflows for action: ${actionName}`);
             this.logger.log(`   User ID: ${userId}`);
             this.logger.log(`   Service ID: ${this.serviceId}`);
-            await firstValueFrom(
-                this.httpService.post(
-                    `${mainApiUrl}/workflow/trigger/${this.serviceId}/${actionName}`,
-                    {
-                        userId,
-                        data: triggerData,
-                    },
-                    {
-                        headers: {
-                            Authorization: `Bearer ${this.accessToken}`,
-                        },
-                    },
-                ),
-            );
+            for (let attempt = 1; ; attempt++) {
+                try {
+                    await firstValueFrom(
+                        this.httpService.post(
+                            `${mainApiUrl}/workflow/trigger/${userId}/${actionName}`,
+                            {
+                                userId,
+                                data: triggerData,
+                                eventId,
+                            },
+                            {
+                                headers: {
+                                    Authorization: `Bearer ${this.accessToken}`,
+                                },
+                            },
+                        ),
+                    );
+                    return;
+                } catch (error) {
+                    if (error.response?.status !== 429 || attempt >= 3) {
+                        throw error;
+                    }
+                    const retryAfter = Math.min(Number(error.response.headers?.['retry-after']) || 1, 30);
+                    this.logger.warn(`Main API is shedding load, retrying action ${actionName} in ${retryAfter}s`);
+                    await new Promise(resolve => setTimeout(resolve, retryAfter * 1000));
+                }
+            }
         } catch (error) {
             this.logger.error(
                 `\u274c Failed to trigger workflows for action ${actionName}:`,
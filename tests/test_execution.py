@@ -0,0 +1,82 @@
+import pytest
+import requests
+import os
+import random
+import string
+from dotenv import load_dotenv
+
+load_dotenv()
+
+API_URL_TEST = os.getenv('API_URL_TEST')
+USER_ROUTES_URL = f"{API_URL_TEST}/user"
+AUTH_ROUTES_URL = f"{API_URL_TEST}/auth"
+EXECUTION_ROUTES_URL = f"{API_URL_TEST}/execution"
+
+def generate_unique_email():
+    random_str = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
+    return f"test_{random_str}@example.com"
+
+@pytest.fixture
+def authenticated_user():
+    user_data = {
+        "email": generate_unique_email(),
+        "password": "PasDInspiDeso",
+        "name": "Michel",
+        "surname": "MichelAussi"
+    }
+    response = requests.post(f"{AUTH_ROUTES_URL}/register", json=user_data)
+    assert response.status_code == 201, f"Register failed: {response.status_code} - {response.text}"
+    data = response.json()
+    user_info = {
+        "id": data["user"]["id"],
+        "token": data["access_token"]
+    }
+    yield user_info
+    try:
+        headers = {"Authorization": f"Bearer {user_info['token']}"}
+        requests.delete(f"{USER_ROUTES_URL}/{user_info['id']}", headers=headers)
+    except:
+        pass
+
+
+class TestExecutionMetrics:
+    def test_metrics_without_auth(self):
+        response = requests.get(f"{EXECUTION_ROUTES_URL}/metrics")
+        assert response.status_code == 401
+
+    def test_metrics_requires_admin(self, authenticated_user):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        response = requests.get(f"{EXECUTION_ROUTES_URL}/metrics", headers=headers)
+        assert response.status_code == 401
+
+
+class TestExecutionPrune:
+    def test_prune_without_auth(self):
+        response = requests.post(f"{EXECUTION_ROUTES_URL}/prune")
+        assert response.status_code == 401
+
+    def test_prune_requires_admin(self, authenticated_user):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        response = requests.post(f"{EXECUTION_ROUTES_URL}/prune", headers=headers)
+        assert response.status_code == 401
+
+
+class TestExecutionCancel:
+    def test_cancel_without_auth(self):
+        response = requests.post(f"{API_URL_TEST}/workflow/executions/1/cancel")
+        assert response.status_code == 401
+
+    def test_cancel_unknown_execution(self, authenticated_user):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        response = requests.post(f"{API_URL_TEST}/workflow/executions/999999999/cancel", headers=headers)
+        assert response.status_code == 404
+
+class TestExecutionStream:
+    def test_stream_without_auth(self):
+        response = requests.get(f"{API_URL_TEST}/workflow/executions/1/stream")
+        assert response.status_code == 401
+
+    def test_stream_unknown_execution(self, authenticated_user):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        response = requests.get(f"{API_URL_TEST}/workflow/executions/999999999/stream", headers=headers)
+        assert response.status_code == 404
@@ -411,6 +411,41 @@ class TestNodeConnectionCRUD:
 
         requests.delete(f"{get_node_url(test_workflow['id'])}/{node3['id']}", headers=headers)
 
+    def test_create_connection_cycle(self, authenticated_user, test_workflow, test_nodes, test_connection):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        connection_data = {
+            "sourceNodeId": test_nodes["node2"]["id"],
+            "targetNodeId": test_nodes["node1"]["id"],
+            "channel": "failed"
+        }
+        response = requests.post(
+            get_connection_url(test_workflow['id']),
+            json=connection_data,
+            headers=headers
+        )
+        assert response.status_code == 400
+
+    def test_update_connection_cycle(self, authenticated_user, test_workflow, test_nodes, test_connection):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        node3_response = requests.post(
+            get_node_url(test_workflow['id']),
+            json={"name": "Third Node", "logicType": "IF"},
+            headers=headers
+        )
+        node3 = node3_response.json()
+        second = requests.post(
+            get_connection_url(test_workflow['id']),
+            json={"sourceNodeId": test_nodes["node2"]["id"], "targetNodeId": node3["id"]},
+            headers=headers
+        ).json()
+        response = requests.patch(
+            f"{get_connection_url(test_workflow['id'])}/{second['id']}",
+            json={"targetNodeId": test_nodes["node1"]["id"]},
+            headers=headers
+        )
+        assert response.status_code == 400
+        requests.delete(f"{get_node_url(test_workflow['id'])}/{node3['id']}", headers=headers)
+
     def test_update_nonexistent_connection(self, authenticated_user, test_workflow):
         headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
         update_data = {"targetNodeId": 1}
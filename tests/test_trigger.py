@@ -0,0 +1,99 @@
+import pytest
+import requests
+import os
+import random
+import string
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+API_URL_TEST = os.getenv('API_URL_TEST')
+USER_ROUTES_URL = f"{API_URL_TEST}/user"
+AUTH_ROUTES_URL = f"{API_URL_TEST}/auth"
+WORKFLOW_ROUTES_URL = f"{API_URL_TEST}/workflow"
+
+def generate_unique_email():
+    random_str = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
+    return f"test_{random_str}@example.com"
+
+def register_user():
+    user_data = {
+        "email": generate_unique_email(),
+        "password": "PasDInspiDeso",
+        "name": "Michel",
+        "surname": "MichelAussi"
+    }
+    response = requests.post(f"{AUTH_ROUTES_URL}/register", json=user_data)
+    assert response.status_code == 201, f"Register failed: {response.status_code} - {response.text}"
+    data = response.json()
+    return {
+        "id": data["user"]["id"],
+        "token": data["access_token"]
+    }
+
+def delete_user(user_info):
+    try:
+        headers = {"Authorization": f"Bearer {user_info['token']}"}
+        requests.delete(f"{USER_ROUTES_URL}/{user_info['id']}", headers=headers)
+    except:
+        pass
+
+@pytest.fixture
+def authenticated_user():
+    user_info = register_user()
+    yield user_info
+    delete_user(user_info)
+
+@pytest.fixture
+def other_user():
+    user_info = register_user()
+    yield user_info
+    delete_user(user_info)
+
+
+class TestTriggerQueue:
+    def test_trigger_returns_accepted_with_job_ids(self, authenticated_user):
+        response = requests.post(
+            f"{WORKFLOW_ROUTES_URL}/trigger/{authenticated_user['id']}/unknown_action",
+            json={"data": {"test": "data"}}
+        )
+        assert response.status_code == 202, f"Trigger failed: {response.status_code} - {response.text}"
+        data = response.json()
+        assert data["queued"] is True
+        assert len(data["jobIds"]) == 1
+
+    def test_get_trigger_job(self, authenticated_user):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        response = requests.post(
+            f"{WORKFLOW_ROUTES_URL}/trigger/{authenticated_user['id']}/unknown_action",
+            json={"data": {"test": "data"}}
+        )
+        assert response.status_code == 202
+        job_id = response.json()["jobIds"][0]
+        job = None
+        for _ in range(20):
+            job_response = requests.get(f"{WORKFLOW_ROUTES_URL}/trigger/jobs/{job_id}", headers=headers)
+            assert job_response.status_code == 200, f"Get job failed: {job_response.status_code} - {job_response.text}"
+            job = job_response.json()
+            if job["status"] in ["DONE", "FAILED"]:
+                break
+            time.sleep(0.5)
+        assert job["id"] == job_id
+        assert job["userId"] == authenticated_user["id"]
+        assert job["status"] == "DONE"
+        assert job["result"]["success"] is False
+
+    def test_get_trigger_job_of_other_user(self, authenticated_user, other_user):
+        response = requests.post(
+            f"{WORKFLOW_ROUTES_URL}/trigger/{authenticated_user['id']}/unknown_action",
+            json={"data": {"test": "data"}}
+        )
+        job_id = response.json()["jobIds"][0]
+        headers = {"Authorization": f"Bearer {other_user['token']}"}
+        job_response = requests.get(f"{WORKFLOW_ROUTES_URL}/trigger/jobs/{job_id}", headers=headers)
+        assert job_response.status_code == 404
+
+    def test_get_trigger_job_without_auth(self):
+        response = requests.get(f"{WORKFLOW_ROUTES_URL}/trigger/jobs/1")
+        assert response.status_code == 401
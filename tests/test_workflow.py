@@ -336,3 +336,122 @@ class TestWorkflowFull:
         assert len(data) >= 3
         for workflow_id in workflow_ids:
             requests.delete(f"{WORKFLOW_ROUTES_URL}/{workflow_id}", headers=headers)
+
+
+class TestWorkflowExecutions:
+    def test_list_executions_no_auth(self):
+        response = requests.get(f"{WORKFLOW_ROUTES_URL}/executions")
+        assert response.status_code == 401
+
+    def test_list_executions_requires_admin(self, authenticated_user):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        response = requests.get(f"{WORKFLOW_ROUTES_URL}/executions", headers=headers)
+        assert response.status_code == 401
+
+    def test_export_executions_requires_admin(self, authenticated_user):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        response = requests.get(f"{WORKFLOW_ROUTES_URL}/executions/export", headers=headers)
+        assert response.status_code == 401
+
+
+class TestWorkflowList:
+    def test_list_no_auth(self):
+        response = requests.get(f"{WORKFLOW_ROUTES_URL}/list")
+        assert response.status_code == 401
+
+    def test_list_is_slim_by_default(self, authenticated_user, test_workflow):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        response = requests.get(f"{WORKFLOW_ROUTES_URL}/list", headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        item = next(w for w in data["items"] if w["id"] == test_workflow["id"])
+        assert "nodes" not in item
+        assert "_count" in item
+
+    def test_list_with_fields(self, authenticated_user, test_workflow):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        response = requests.get(f"{WORKFLOW_ROUTES_URL}/list?fields=nodes,nodeConnections", headers=headers)
+        assert response.status_code == 200
+        item = next(w for w in response.json()["items"] if w["id"] == test_workflow["id"])
+        assert "nodes" in item
+        assert "nodeConnections" in item
+
+    def test_list_unknown_field(self, authenticated_user):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        response = requests.get(f"{WORKFLOW_ROUTES_URL}/list?fields=password", headers=headers)
+        assert response.status_code == 400
+
+    def test_list_etag_not_modified(self, authenticated_user, test_workflow):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        response = requests.get(f"{WORKFLOW_ROUTES_URL}/list", headers=headers)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        cached = requests.get(f"{WORKFLOW_ROUTES_URL}/list", headers={**headers, "If-None-Match": etag})
+        assert cached.status_code == 304
+
+    def test_list_since_reports_deleted(self, authenticated_user):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        created = requests.post(WORKFLOW_ROUTES_URL, json={"name": "Delta"}, headers=headers)
+        assert created.status_code == 201
+        workflow_id = created.json()["id"]
+        first = requests.get(f"{WORKFLOW_ROUTES_URL}/list", headers=headers).json()
+        requests.delete(f"{WORKFLOW_ROUTES_URL}/{workflow_id}", headers=headers)
+        delta = requests.get(f"{WORKFLOW_ROUTES_URL}/list", headers=headers, params={"since": first["syncedAt"]})
+        assert delta.status_code == 200
+        assert workflow_id in delta.json()["deleted"]
+
+
+class TestWorkflowGraph:
+    def test_save_graph_creates_nodes_and_connections(self, authenticated_user, test_workflow):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        graph = {
+            "nodes": [
+                {"tempId": "if", "logicType": "IF", "conf": {"condition": "value > 1"}},
+                {"tempId": "not", "logicType": "NOT"},
+            ],
+            "connections": [
+                {"sourceTempId": "if", "targetTempId": "not", "channel": "success"},
+            ],
+        }
+        response = requests.put(f"{WORKFLOW_ROUTES_URL}/{test_workflow['id']}/graph", json=graph, headers=headers)
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert len(data["nodes"]) == 2
+        assert len(data["connections"]) == 1
+        assert data["connections"][0]["sourceNodeId"] == data["idMap"]["if"]
+        assert data["connections"][0]["targetNodeId"] == data["idMap"]["not"]
+
+    def test_save_graph_removes_missing_nodes(self, authenticated_user, test_workflow):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        url = f"{WORKFLOW_ROUTES_URL}/{test_workflow['id']}/graph"
+        first = requests.put(url, json={
+            "nodes": [{"tempId": "a", "logicType": "IF"}, {"tempId": "b", "logicType": "NOT"}],
+            "connections": [{"sourceTempId": "a", "targetTempId": "b"}],
+        }, headers=headers).json()
+        kept = first["idMap"]["a"]
+        response = requests.put(url, json={
+            "nodes": [{"id": kept, "logicType": "IF"}],
+            "connections": [],
+        }, headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert [node["id"] for node in data["nodes"]] == [kept]
+        assert data["connections"] == []
+        assert data["summary"]["nodesDeleted"] == 1
+
+    def test_save_graph_rejects_self_connection(self, authenticated_user, test_workflow):
+        headers = {"Authorization": f"Bearer {authenticated_user['token']}"}
+        response = requests.put(f"{WORKFLOW_ROUTES_URL}/{test_workflow['id']}/graph", json={
+            "nodes": [{"tempId": "a", "logicType": "IF"}],
+            "connections": [{"sourceTempId": "a", "targetTempId": "a"}],
+        }, headers=headers)
+        assert response.status_code == 400
+
+    def test_save_graph_wrong_user(self, authenticated_user2, test_workflow):
+        headers = {"Authorization": f"Bearer {authenticated_user2['token']}"}
+        response = requests.put(f"{WORKFLOW_ROUTES_URL}/{test_workflow['id']}/graph", json={"nodes": [], "connections": []}, headers=headers)
+        assert response.status_code == 403
+
+    def test_save_graph_no_auth(self, test_workflow):
+        response = requests.put(f"{WORKFLOW_ROUTES_URL}/{test_workflow['id']}/graph", json={"nodes": [], "connections": []})
+        assert response.status_code == 401